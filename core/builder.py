@@ -10,21 +10,23 @@ import json
 
 from .models import (
     TranslationResult, ExtractionResult, NamespaceInfo,
-    PackSettings, JSON_KEY_VALUE_PATTERN, LANG_KV_PATTERN
+    PackSettings, LANG_KV_PATTERN
 )
+from utils.json_lang_tokenizer import iter_json_lang_entries
 
 class Builder:
 
     def _build_json_file(self, template_content: str, translations: dict[str, str]) -> str:
-        key_info = []
-        for match in JSON_KEY_VALUE_PATTERN.finditer(template_content):
-            key_info.append({
-                'key': match.group(1),
-                'original_value': match.group(2),
-                'start': match.start(),
-                'end': match.end(),
-                'full_match': match.group(0)
-            })
+        key_info = [
+            {
+                'key': entry.key,
+                'original_value': entry.value,
+                'start': entry.start,
+                'end': entry.end,
+                'full_match': template_content[entry.start:entry.end],
+            }
+            for entry in iter_json_lang_entries(template_content, decode=False)
+        ]
         return self._rebuild_file_from_key_info(template_content, key_info, translations, 'json')
 
     def _build_lang_file(self, template_content: str, translations: dict[str, str]) -> str:
@@ -2,9 +2,20 @@
 
 # 线程池大小限制
 EXTRACTOR_SCAN_MAX_WORKERS = 8
+EXTRACTOR_SCAN_PROCESS_MAX_WORKERS = 16
+EXTRACTOR_PROCESS_POOL_MIN_JARS = 32  # auto 模式下待解析 JAR 数达到此值才启用进程池
 EXTRACTOR_FINGERPRINT_MAX_WORKERS = 32
+MOD_METADATA_MAX_WORKERS = 6  # CurseForge 与 Modrinth 元数据请求共用
 TRANSLATOR_MAX_WORKERS = 8
 TRANSLATOR_SERIAL_THRESHOLD = 3  # 命名空间数量低于此值时使用串行处理
+TRANSLATOR_PROCESS_MAX_WORKERS = 16
+TRANSLATOR_PROCESS_POOL_MIN_KEYS = 100000  # auto 模式下待决策条目数达到此值才启用进程池
+TRANSLATOR_PROCESS_CHUNK_SIZE = 20000  # 进程池中每个任务处理的条目数
+TRANSLATOR_CHANGE_LOG_LIMIT = 200  # 增量决策的变化明细在日志面板中最多列出的条数
+DECISION_LEDGER_MAX_PROJECTS = 2  # 进程内保留增量决策记录的项目数
+ORIGIN_CONFLICT_PROCESS_MAX_WORKERS = 8
+ORIGIN_CONFLICT_PROCESS_MIN = 50000  # 需解析冲突的原文数达到此值才启用进程池
+ORIGIN_CONFLICT_CHUNK_SIZE = 20000
 
 # 缓存大小
 TRANSLATOR_VALIDATION_CACHE_SIZE = 131072  # 128K 条
@@ -26,3 +37,6 @@ LAN_BROADCAST_COUNT = 15
 
 # JAR 文件读取缓冲区大小
 JAR_READ_CHUNK_SIZE = 65536  # 64KB
+
+# 模组元数据查询：每个请求携带的最大哈希数
+MOD_METADATA_CHUNK_SIZE = 200
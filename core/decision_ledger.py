@@ -0,0 +1,266 @@
+"""
+翻译决策账本：记录每个项目上一次决策所用的输入版本，重新决策时只评估输入发生变化的条目。
+
+一个条目的决策结果只取决于：
+- 本命名空间中该键的英文原文与模组自带中文；
+- 个人词典 [Key]、第三方汉化包、社区词典 [Key] 中该键的值；
+- 个人词典 [原文]、社区词典 [原文] 中该条英文原文的值；
+- 社区词典 Key / 原文匹配开关。
+账本为每项输入保存版本（快照，社区词典另有数据库文件版本号），重新决策时逐项比较，
+得到变化的键与原文，再经「原文 → 条目」反向索引找出受影响的条目。
+个人词典视图 (LayeredTable) 不可变且带保存计数，直接保存不复制；变化的名称取自词典服务的变更记录，
+记录不完整时才逐项比较两版。
+开关变化或没有上一次记录时，由调用方执行完整决策。
+
+账本是进程级单例，按 Mods 目录区分项目，最多保留 DECISION_LEDGER_MAX_PROJECTS 个项目的记录。
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from .dictionary_service import LayeredTable, dictionary_service
+from .models import LanguageEntry, LanguageTable, ExtractionResult
+from .constants import DECISION_LEDGER_MAX_PROJECTS
+
+
+def _english_column(entries: Mapping) -> Mapping[str, str]:
+    if isinstance(entries, LanguageTable):
+        return entries.columns()[0]
+    return {key: entry.en for key, entry in entries.items()}
+
+
+def _internal_column(entries: Mapping) -> Mapping[str, str | None]:
+    if isinstance(entries, LanguageTable):
+        en_column, zh_column = entries.columns()
+        if len(zh_column) == len(en_column):
+            return zh_column
+        return {key: zh_column.get(key) for key in en_column}
+    return {key: entry.zh for key, entry in entries.items()}
+
+
+def _changed_keys(old: Mapping, new: Mapping) -> set[str]:
+    """返回新增、删除或值发生变化的键。"""
+    if old is new:
+        return set()
+    if len(old) == len(new) and old == new:
+        return set()
+    changed = {key for key, value in new.items() if key not in old or old[key] != value}
+    changed.update(key for key in old if key not in new)
+    return changed
+
+
+def _frozen(mapping: Mapping) -> Mapping:
+    """
+    词典服务给出的个人词典视图不会再变化（修改会产生新版本），直接保存；
+    其他映射可能被调用方原地修改，保存副本。
+    """
+    if isinstance(mapping, LayeredTable):
+        return mapping
+    return dict(mapping)
+
+
+def _user_generation(by_key: Mapping, by_origin: Mapping) -> int | None:
+    """两张表同属词典服务的同一版本时返回其保存计数。"""
+    if isinstance(by_key, LayeredTable) and isinstance(by_origin, LayeredTable) and by_key.generation == by_origin.generation:
+        return by_key.generation
+    return None
+
+
+def _user_changed_names(table: str, old: Mapping, new: Mapping, since: int | None, until: int | None) -> set[str]:
+    """个人词典两版之间增删改过的名称：优先取词典服务的变更记录，记录不完整时逐项比较。"""
+    if old is new:
+        return set()
+    if since is not None and until is not None and since < until:
+        changed = dictionary_service.user_changes(table, since, until)
+        if changed is not None:
+            return changed
+    return _changed_keys(old, new)
+
+
+@dataclass
+class DecisionInputs:
+    """一次决策的全部输入；映射均视为只读快照。"""
+    flags: tuple[bool, bool]
+    user_dict_by_key: Mapping[str, str]
+    user_dict_by_origin: Mapping[str, str]
+    community_dict_by_key: Mapping[str, str]
+    community_dict_by_origin: Mapping[str, list[dict]]
+    community_revision: Any
+    pack_chinese: Mapping[str, str]
+    english: dict[str, Mapping[str, str]]
+    internal: dict[str, Mapping[str, str | None]]
+    user_generation: int | None = None
+
+    @classmethod
+    def collect(
+        cls,
+        extraction_result: ExtractionResult,
+        user_dict_by_key: dict,
+        user_dict_by_origin: dict,
+        community_dict_by_key: dict,
+        community_dict_by_origin: dict,
+        use_community_dict_key: bool,
+        use_community_dict_origin: bool,
+        community_revision: Any = None,
+    ) -> DecisionInputs:
+        english = {ns: _english_column(entries) for ns, entries in extraction_result.master_english.items()}
+        internal = {ns: _internal_column(entries) for ns, entries in extraction_result.internal_chinese.items()}
+        return cls(
+            flags=(bool(use_community_dict_key), bool(use_community_dict_origin)),
+            user_dict_by_key=_frozen(user_dict_by_key),
+            user_dict_by_origin=_frozen(user_dict_by_origin),
+            community_dict_by_key=community_dict_by_key,
+            community_dict_by_origin=community_dict_by_origin,
+            community_revision=community_revision,
+            pack_chinese=extraction_result.pack_chinese,
+            english=english,
+            internal=internal,
+            user_generation=_user_generation(user_dict_by_key, user_dict_by_origin),
+        )
+
+
+@dataclass
+class DecisionRecord:
+    inputs: DecisionInputs
+    workbench_data: dict[str, dict[str, LanguageEntry]]
+    source_counts: dict[str, int]
+    origin_index: dict[str, list[tuple[str, str]]] | None = None
+
+    def get_origin_index(self) -> dict[str, list[tuple[str, str]]]:
+        """英文原文 → [(命名空间, 键)]，首次需要时构建。"""
+        if self.origin_index is None:
+            index: dict[str, list[tuple[str, str]]] = {}
+            for namespace, en_column in self.inputs.english.items():
+                for key, english_value in en_column.items():
+                    index.setdefault(english_value, []).append((namespace, key))
+            self.origin_index = index
+        return self.origin_index
+
+
+@dataclass
+class DecisionPlan:
+    """增量决策计划：full_namespaces 需完整决策，keys 中为各命名空间需重新评估的键。"""
+    record: DecisionRecord
+    full_namespaces: list[str] = field(default_factory=list)
+    keys: dict[str, set[str]] = field(default_factory=dict)
+    removed_namespaces: list[str] = field(default_factory=list)
+    english_changed: bool = False
+
+    @property
+    def key_count(self) -> int:
+        return sum(len(keys) for keys in self.keys.values())
+
+
+class DecisionLedger:
+
+    _instance: DecisionLedger | None = None
+    _creation_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._creation_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._records: OrderedDict[str, DecisionRecord] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def project_key(settings: dict) -> str | None:
+        if not settings.get('translator_incremental', True):
+            return None
+        mods_dir = settings.get('mods_dir')
+        return str(mods_dir) if mods_dir else None
+
+    def plan(self, project_key: str, inputs: DecisionInputs) -> DecisionPlan | None:
+        """与上一次记录比较，返回增量计划；无法增量时返回 None。"""
+        with self._lock:
+            record = self._records.get(project_key)
+        if record is None:
+            return None
+        old = record.inputs
+        if old.flags != inputs.flags:
+            logging.debug("社区词典匹配开关已变化，执行完整决策")
+            return None
+
+        since, until = old.user_generation, inputs.user_generation
+        changed_keys = _user_changed_names('by_key', old.user_dict_by_key, inputs.user_dict_by_key, since, until)
+        changed_keys |= _changed_keys(old.pack_chinese, inputs.pack_chinese)
+        changed_origins = _user_changed_names(
+            'by_origin_name', old.user_dict_by_origin, inputs.user_dict_by_origin, since, until
+        )
+        community_unchanged = (
+            inputs.community_revision is not None and inputs.community_revision == old.community_revision
+        )
+        if not community_unchanged:
+            use_key, use_origin = inputs.flags
+            if use_key:
+                changed_keys |= _changed_keys(old.community_dict_by_key, inputs.community_dict_by_key)
+            if use_origin:
+                changed_origins |= _changed_keys(old.community_dict_by_origin, inputs.community_dict_by_origin)
+
+        plan = DecisionPlan(record=record)
+        plan.removed_namespaces = [ns for ns in old.english if ns not in inputs.english]
+        plan.english_changed = bool(plan.removed_namespaces)
+        empty: dict = {}
+        for namespace, en_column in inputs.english.items():
+            old_column = old.english.get(namespace)
+            if old_column is None:
+                plan.full_namespaces.append(namespace)
+                plan.english_changed = True
+                continue
+            keys = _changed_keys(old_column, en_column)
+            if keys:
+                plan.english_changed = True
+            keys |= _changed_keys(old.internal.get(namespace, empty), inputs.internal.get(namespace, empty))
+            if changed_keys:
+                if len(changed_keys) < len(en_column):
+                    keys.update(key for key in changed_keys if key in en_column)
+                else:
+                    keys.update(en_column.keys() & changed_keys)
+            if keys:
+                plan.keys[namespace] = keys
+
+        if changed_origins:
+            # 索引基于上一次的英文；英文有变化的条目已由上面的逐键比较纳入
+            index = record.get_origin_index()
+            for origin in changed_origins:
+                for namespace, key in index.get(origin, ()):
+                    en_column = inputs.english.get(namespace)
+                    if en_column is not None and key in en_column:
+                        plan.keys.setdefault(namespace, set()).add(key)
+        return plan
+
+    def commit(self, project_key: str, inputs: DecisionInputs, workbench_data: dict, source_counts: dict,
+               previous: DecisionRecord | None = None, english_changed: bool = True) -> None:
+        origin_index = None
+        if previous is not None and not english_changed:
+            origin_index = previous.origin_index
+        record = DecisionRecord(
+            inputs=inputs,
+            workbench_data=dict(workbench_data),
+            source_counts=dict(source_counts),
+            origin_index=origin_index,
+        )
+        with self._lock:
+            self._records[project_key] = record
+            self._records.move_to_end(project_key)
+            while len(self._records) > DECISION_LEDGER_MAX_PROJECTS:
+                self._records.popitem(last=False)
+
+    def discard(self, project_key: str | None = None) -> None:
+        with self._lock:
+            if project_key is None:
+                self._records.clear()
+            else:
+                self._records.pop(project_key, None)
+
+
+decision_ledger = DecisionLedger()
@@ -3,9 +3,23 @@ import logging
 from pathlib import Path
 import sqlite3
 import os
+import threading
+import weakref
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from utils import config_manager
-from core.models import resolve_origin_name_conflict
+from core import dictionary_snapshot
+from core.dictionary_service import dictionary_service, CommunityDictionaries
+from core.models import resolve_origin_name_conflict, resolve_origin_name_conflicts
+from core.constants import (
+    ORIGIN_CONFLICT_PROCESS_MAX_WORKERS, ORIGIN_CONFLICT_PROCESS_MIN, ORIGIN_CONFLICT_CHUNK_SIZE,
+)
+
+_snapshot_build_lock = threading.Lock()
+_snapshot_builds_lock = threading.Lock()
+_snapshot_builds_running: set[str] = set()
+
 
 class DictionaryManager:
 
@@ -13,6 +27,10 @@ class DictionaryManager:
         self.user_dict: dict | None = None
         self.community_dict_by_key: dict[str, str] | None = None
         self.community_dict_by_origin: dict[str, list[dict]] | None = None
+        # 已加载社区词典的版本：(数据库路径, mtime_ns, 大小)，未加载数据库时为 None
+        self.community_revision: tuple | None = None
+        # 原文 → 冲突解析后的社区译名，随社区词典一同加载
+        self.community_origin_table: dict[str, str] | None = None
         self._cache: dict[str, tuple] = {}
         self._community_origin_cache: dict[str, str | None] = {}
         self._lower_key_index: dict[str, str] = {}
@@ -20,15 +38,43 @@ class DictionaryManager:
         self._lower_community_key_index: dict[str, str] = {}
         self._lower_community_origin_index: dict[str, str] = {}
         self._search_index_built = False
+        self._snapshot: dictionary_snapshot.DictionarySnapshot | None = None
+        # 当前持有的进程级共享社区词典（完整加载或快照）；按需加载时为 None
+        self._community_lease: CommunityDictionaries | None = None
+        self._lease_finalizer: weakref.finalize | None = None
+
+    def _hold_community(self, lease: CommunityDictionaries | None) -> None:
+        """改为持有 lease，并归还之前持有的共享社区词典；管理器被回收时自动归还。"""
+        if self._lease_finalizer is not None:
+            self._lease_finalizer()
+            self._lease_finalizer = None
+        self._community_lease = lease
+        self._snapshot = lease.snapshot if lease is not None else None
+        if lease is not None:
+            self._lease_finalizer = weakref.finalize(self, dictionary_service.release_community, lease)
+
+    def release(self) -> None:
+        """归还共享词典引用并丢弃本管理器的词典数据，项目标签页关闭时调用。"""
+        self._hold_community(None)
+        self.user_dict = None
+        self.community_dict_by_key = None
+        self.community_dict_by_origin = None
+        self.community_origin_table = None
+        self.community_revision = None
+        self.clear_cache()
 
     def _build_search_index(self):
         self._lower_key_index = {k.lower(): k for k in self.user_dict.get('by_key', {})} if self.user_dict else {}
         self._lower_origin_index = {k.lower(): k for k in self.user_dict.get('by_origin_name', {})} if self.user_dict else {}
-        self._lower_community_key_index = {k.lower(): k for k in (self.community_dict_by_key or {})}
-        self._lower_community_origin_index = {}
-        if self.community_dict_by_origin:
-            for origin in self.community_dict_by_origin:
-                self._lower_community_origin_index[origin.lower()] = origin
+        if self._community_lease is not None:
+            # 共享社区词典的搜索索引也由所有标签页共用
+            self._lower_community_key_index, self._lower_community_origin_index = self._community_lease.search_indexes()
+        else:
+            self._lower_community_key_index = {k.lower(): k for k in (self.community_dict_by_key or {})}
+            self._lower_community_origin_index = {}
+            if self.community_dict_by_origin:
+                for origin in self.community_dict_by_origin:
+                    self._lower_community_origin_index[origin.lower()] = origin
         self._search_index_built = True
 
     def _ensure_search_index(self):
@@ -37,74 +83,356 @@ class DictionaryManager:
 
     def load_user_dictionary(self) -> dict:
         try:
-            self.user_dict = config_manager.load_user_dict()
+            # 各标签页共用同一版本的只读视图，修改经 config_manager.update_user_dict 提交
+            self.user_dict = dictionary_service.user_dictionary()
             logging.debug("用户词典加载成功")
             return self.user_dict
         except Exception as e:
             logging.error(f"加载用户词典失败: {e}")
             return {'by_key': {}, 'by_origin_name': {}}
 
-    def load_community_dictionary(self, community_dict_dir: str, progress_callback=None) -> tuple[dict[str, str], dict[str, list[dict]]]:
+    @staticmethod
+    def _query_community_rows(cur: sqlite3.Cursor, keys: set[str] | None, origins: set[str] | None) -> int:
+        """
+        执行社区词典查询并返回预计行数。
+
+        keys / origins 为 None 时读取整张表；否则把它们写入临时表，只取键或原文命中的行，
+        按 rowid 排序以保持与整表读取相同的先后顺序（冲突解析依赖该顺序）。
+        """
+        if keys is None and origins is None:
+            cur.execute("SELECT COUNT(*) FROM dict")
+            total_rows = cur.fetchone()[0]
+            cur.execute("SELECT key, origin_name, trans_name, version FROM dict")
+            return total_rows
+
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_origins (origin TEXT PRIMARY KEY) WITHOUT ROWID")
+        cur.execute("DELETE FROM temp.wanted_keys")
+        cur.execute("DELETE FROM temp.wanted_origins")
+        cur.executemany("INSERT OR IGNORE INTO temp.wanted_keys (key) VALUES (?)", ((k,) for k in keys or ()))
+        cur.executemany("INSERT OR IGNORE INTO temp.wanted_origins (origin) VALUES (?)", ((o,) for o in origins or ()))
+        query = (
+            "SELECT key, origin_name, trans_name, version FROM dict"
+            " WHERE key IN (SELECT key FROM temp.wanted_keys)"
+            " OR origin_name IN (SELECT origin FROM temp.wanted_origins)"
+        )
+        try:
+            cur.execute(query + " ORDER BY rowid")
+        except sqlite3.OperationalError:
+            cur.execute(query)
+        return 0
+
+    @staticmethod
+    def _community_db_path(community_dict_dir: str) -> Path | None:
+        return Path(community_dict_dir) / "Dict-Sqlite.db" if community_dict_dir else None
+
+    @staticmethod
+    def _community_db_indexed(dict_file_path: Path | None) -> bool:
+        """dict 表的 key 与 origin_name 是否都有可用索引（索引首列）；两者缺一时按需查询仍会整表扫描。"""
+        if dict_file_path is None or not dict_file_path.is_file():
+            return False
+        try:
+            with sqlite3.connect(f"file:{dict_file_path}?mode=ro", uri=True) as con:
+                indexed = {
+                    con.execute(f"PRAGMA index_info('{name}')").fetchone()[2]
+                    for _, name, *_ in con.execute("PRAGMA index_list('dict')").fetchall()
+                }
+        except (sqlite3.Error, TypeError) as e:
+            logging.debug(f"读取社区词典索引信息失败: {e}")
+            return False
+        return {"key", "origin_name"} <= indexed
+
+    @staticmethod
+    def _community_db_revision(dict_file_path: Path) -> tuple:
+        st = dict_file_path.stat()
+        return (str(dict_file_path), st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def _read_community_db(
+        cls,
+        dict_file_path: Path,
+        progress_callback=None,
+        keys: set[str] | None = None,
+        origins: set[str] | None = None,
+    ) -> tuple[dict[str, str], dict[str, list[dict]]]:
         community_dict_by_key: dict[str, str] = {}
         community_dict_by_origin: dict[str, list[dict]] = defaultdict(list)
 
-        if not community_dict_dir:
+        with sqlite3.connect(f"file:{dict_file_path}?mode=ro", uri=True) as con:
+            cur = con.cursor()
+            total_rows = cls._query_community_rows(cur, keys, origins)
+
+            batch_size = 1000
+            processed_rows = 0
+
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+
+                for key, origin_name, trans_name, version in rows:
+                    if key:
+                        community_dict_by_key[key] = trans_name
+                    if origin_name and trans_name:
+                        community_dict_by_origin[origin_name].append({
+                            "trans": trans_name,
+                            "version": version or "0.0.0"
+                        })
+
+                processed_rows += len(rows)
+
+                if progress_callback and total_rows > 0:
+                    progress = min(int((processed_rows / total_rows) * 100), 100)
+                    progress_callback(f"加载社区词典... {progress}%", progress)
+
+        return community_dict_by_key, community_dict_by_origin
+
+    @classmethod
+    def _load_full_community(cls, dict_file_path: Path, revision: tuple, progress_callback=None) -> CommunityDictionaries:
+        by_key, by_origin = cls._read_community_db(dict_file_path, progress_callback)
+        if progress_callback:
+            progress_callback("解析社区词典译名冲突...", 100)
+        return CommunityDictionaries(
+            kind="full",
+            revision=revision,
+            by_key=by_key,
+            by_origin=by_origin,
+            origin_table=cls.build_origin_table(by_origin),
+        )
+
+    def load_community_dictionary(
+        self,
+        community_dict_dir: str,
+        progress_callback=None,
+        keys: set[str] | None = None,
+        origins: set[str] | None = None,
+    ) -> tuple[dict[str, str], dict[str, list[dict]]]:
+        """
+        加载社区词典。
+
+        给出 keys / origins 时为按需模式：只取与这些键或原文相关的行，
+        内存与耗时随整合包规模而非词典规模增长；两者都为 None 时读取整个词典，
+        完整词典经 dictionary_service 在各标签页间共享。
+        """
+        community_dict_by_key: dict[str, str] = {}
+        community_dict_by_origin: dict[str, list[dict]] = defaultdict(list)
+
+        self.community_revision = None
+        self.community_origin_table = {}
+        self._community_origin_cache.clear()
+        dict_file_path = self._community_db_path(community_dict_dir)
+        if dict_file_path is None:
+            self._hold_community(None)
             self.community_dict_by_key = community_dict_by_key
             self.community_dict_by_origin = community_dict_by_origin
             self._search_index_built = False
             return community_dict_by_key, community_dict_by_origin
 
         try:
-            dict_file_path = Path(community_dict_dir) / "Dict-Sqlite.db"
-
             if not dict_file_path.is_file():
                 logging.info(f"社区词典文件不存在: {dict_file_path}")
+                self._hold_community(None)
                 self.community_dict_by_key = community_dict_by_key
                 self.community_dict_by_origin = community_dict_by_origin
                 self._search_index_built = False
                 return community_dict_by_key, community_dict_by_origin
 
-            with sqlite3.connect(f"file:{dict_file_path}?mode=ro", uri=True) as con:
-                cur = con.cursor()
-
-                cur.execute("SELECT COUNT(*) FROM dict")
-                total_rows = cur.fetchone()[0]
-
-                cur.execute("SELECT key, origin_name, trans_name, version FROM dict")
-
-                batch_size = 1000
-                processed_rows = 0
-
-                while True:
-                    rows = cur.fetchmany(batch_size)
-                    if not rows:
-                        break
-
-                    for key, origin_name, trans_name, version in rows:
-                        if key:
-                            community_dict_by_key[key] = trans_name
-                        if origin_name and trans_name:
-                            community_dict_by_origin[origin_name].append({
-                                "trans": trans_name,
-                                "version": version or "0.0.0"
-                            })
-
-                    processed_rows += len(rows)
-
-                    if progress_callback and total_rows > 0:
-                        progress = min(int((processed_rows / total_rows) * 100), 100)
-                        progress_callback(f"加载社区词典... {progress}%", progress)
-
-            logging.debug(f"社区词典加载成功: {len(community_dict_by_key)}条按键, {len(community_dict_by_origin)}条按原文")
+            revision = self._community_db_revision(dict_file_path)
+            if keys is None and origins is None:
+                lease = dictionary_service.acquire_community(
+                    "full", revision, lambda: self._load_full_community(dict_file_path, revision, progress_callback)
+                )
+                self._hold_community(lease)
+                community_dict_by_key, community_dict_by_origin = lease.by_key, lease.by_origin
+                self.community_origin_table = lease.origin_table
+            else:
+                self._hold_community(None)
+                community_dict_by_key, community_dict_by_origin = self._read_community_db(
+                    dict_file_path, progress_callback, keys, origins
+                )
+                if progress_callback:
+                    progress_callback("解析社区词典译名冲突...", 100)
+                self.community_origin_table = self.build_origin_table(community_dict_by_origin)
+            self.community_revision = revision
+            scope = "按需" if keys is not None or origins is not None else "完整"
+            logging.debug(f"社区词典加载成功（{scope}）: {len(community_dict_by_key)}条按键, {len(community_dict_by_origin)}条按原文")
         except Exception as e:
             logging.error(f"读取社区词典数据库时发生错误: {e}")
+            self._hold_community(None)
 
         self.community_dict_by_key = community_dict_by_key
         self.community_dict_by_origin = community_dict_by_origin
         self._search_index_built = False
         return community_dict_by_key, community_dict_by_origin
 
-    def get_all_dictionaries(self, community_dict_dir: str, progress_callback=None) -> tuple[dict, dict[str, str], dict[str, list[dict]]]:
+    def load_community_snapshot(self, community_dict_dir: str, build: bool = True, progress_callback=None) -> bool:
+        """
+        从内存映射快照加载社区词典，成功返回 True。
+
+        快照与数据库版本不符或不存在时：build=True 则当场重建，否则返回 False。
+        """
+        dict_file_path = self._community_db_path(community_dict_dir)
+        if dict_file_path is None or not dict_file_path.is_file():
+            return False
+        try:
+            revision = self._community_db_revision(dict_file_path)
+        except OSError:
+            return False
+        path = dictionary_snapshot.snapshot_path(revision)
+
+        def _open_snapshot() -> CommunityDictionaries | None:
+            snapshot = dictionary_snapshot.DictionarySnapshot.open(path)
+            if snapshot is None:
+                if not build:
+                    return None
+                if progress_callback:
+                    progress_callback("正在生成社区词典快照...", 0)
+                if not self.build_community_snapshot(community_dict_dir):
+                    return None
+                snapshot = dictionary_snapshot.DictionarySnapshot.open(path)
+                if snapshot is None:
+                    return None
+            return CommunityDictionaries(
+                kind="snapshot",
+                revision=revision,
+                by_key=snapshot.by_key,
+                by_origin=snapshot.by_origin,
+                origin_table=snapshot.origin_table,
+                snapshot=snapshot,
+            )
+
+        lease = dictionary_service.acquire_community("snapshot", revision, _open_snapshot)
+        if lease is None:
+            return False
+        self._hold_community(lease)
+        snapshot = lease.snapshot
+        self.community_dict_by_key = snapshot.by_key
+        self.community_dict_by_origin = snapshot.by_origin
+        self.community_origin_table = snapshot.origin_table
+        self.community_revision = revision
+        self._community_origin_cache.clear()
+        self._search_index_built = False
+        logging.debug(f"社区词典快照已映射: {path.name}（{len(snapshot.by_key)}条按键, {len(snapshot.origin_table)}条按原文）")
+        return True
+
+    @classmethod
+    def build_community_snapshot(cls, community_dict_dir: str) -> bool:
+        """读取整个社区词典并写出对应当前数据库版本的快照；同一快照不会被并发重复生成。"""
+        dict_file_path = cls._community_db_path(community_dict_dir)
+        if dict_file_path is None or not dict_file_path.is_file():
+            return False
+        try:
+            revision = cls._community_db_revision(dict_file_path)
+            path = dictionary_snapshot.snapshot_path(revision)
+            with _snapshot_build_lock:
+                if path.is_file():
+                    return True
+                by_key, by_origin = cls._read_community_db(dict_file_path)
+                dictionary_snapshot.write_snapshot(path, by_key, cls.build_origin_table(by_origin))
+            if cls._community_db_revision(dict_file_path) != revision:
+                logging.info("生成快照期间社区词典已变化，快照将在下次使用时重新生成")
+                return False
+            dictionary_snapshot.remove_stale_snapshots(keep=path)
+            logging.info(f"社区词典快照已生成: {path}")
+            return True
+        except (sqlite3.Error, OSError, ValueError, OverflowError, TypeError, AttributeError) as e:
+            logging.warning(f"生成社区词典快照失败: {e}")
+            return False
+
+    @classmethod
+    def _build_community_snapshot_once(cls, community_dict_dir: str) -> None:
+        """生成快照；同一目录已有生成任务在进行时直接返回。"""
+        with _snapshot_builds_lock:
+            if community_dict_dir in _snapshot_builds_running:
+                return
+            _snapshot_builds_running.add(community_dict_dir)
+        try:
+            cls.build_community_snapshot(community_dict_dir)
+        finally:
+            with _snapshot_builds_lock:
+                _snapshot_builds_running.discard(community_dict_dir)
+
+    @classmethod
+    def build_community_snapshot_in_background(cls, community_dict_dir: str) -> None:
+        with _snapshot_builds_lock:
+            if community_dict_dir in _snapshot_builds_running:
+                return
+        threading.Thread(
+            target=cls._build_community_snapshot_once, args=(community_dict_dir,),
+            name="community-dict-snapshot", daemon=True,
+        ).start()
+
+    @classmethod
+    def prefetch(cls, community_dict_dir: str, load_mode: str = "auto") -> None:
+        """
+        用一个临时管理器预先准备 get_all_dictionaries 需要的数据，结果留在 dictionary_service 中：
+        个人词典；auto / snapshot 模式下校验（缺失时生成）并映射快照，full 模式下完整读取社区词典，
+        两者都包含原文冲突解析表。on_demand 模式的查询范围取决于提取结果，只预加载个人词典。
+
+        共享缓存按版本加锁加载，随后的正式加载若与预加载撞车会等待并复用其结果；
+        auto 模式的快照在锁外生成，正式加载时尚未生成完毕则照常改为按需加载。
+        """
+        manager = cls()
+        try:
+            manager.load_user_dictionary()
+            dict_file_path = cls._community_db_path(community_dict_dir)
+            if dict_file_path is None or not dict_file_path.is_file():
+                return
+            if load_mode == "auto":
+                cls._build_community_snapshot_once(community_dict_dir)
+                manager.load_community_snapshot(community_dict_dir, build=False)
+            elif load_mode == "snapshot":
+                manager.load_community_snapshot(community_dict_dir, build=True)
+            elif load_mode == "full":
+                manager.load_community_dictionary(community_dict_dir)
+            logging.debug(f"词典预加载完成（{load_mode}）")
+        finally:
+            # 共享缓存会保留最近版本，归还引用后随后的加载仍可直接命中
+            manager.release()
+
+    def get_all_dictionaries(
+        self,
+        community_dict_dir: str,
+        progress_callback=None,
+        keys: set[str] | None = None,
+        origins: set[str] | None = None,
+        load_mode: str = "auto",
+    ) -> tuple[dict, dict[str, str], dict[str, list[dict]]]:
+        """
+        加载用户词典与社区词典。load_mode：
+        - snapshot：使用内存映射快照，快照过期时当场重建；
+        - auto：快照可用时直接使用；否则在后台生成快照供下次使用，本次在词典的 key 与 origin_name
+          都有索引时按需加载，没有索引时按需查询同样要扫描整表，仍完整加载（结果可缓存复用）；
+        - on_demand：给出 keys / origins 时只查询相关行；
+        - full：读取整个社区词典。
+        """
+        if load_mode in ("auto", "snapshot") and community_dict_dir:
+            if self.load_community_snapshot(community_dict_dir, build=(load_mode == "snapshot"), progress_callback=progress_callback):
+                user_dict = self.load_user_dictionary()
+                if progress_callback:
+                    progress_callback("加载社区词典快照...", 100)
+                logging.info(f"词典加载完成: 社区词典快照 {len(self.community_dict_by_key)}条按键, {len(self.community_dict_by_origin)}条按原文")
+                return user_dict, self.community_dict_by_key, self.community_dict_by_origin
+            if load_mode == "auto" and self._community_db_path(community_dict_dir).is_file():
+                self.build_community_snapshot_in_background(community_dict_dir)
+
+        if load_mode == "auto" and (keys is not None or origins is not None):
+            if not self._community_db_indexed(self._community_db_path(community_dict_dir)):
+                logging.debug("社区词典没有 key / origin_name 索引，本次完整加载")
+                keys = origins = None
+
+        if load_mode != "full" and (keys is not None or origins is not None):
+            # 按需结果只对应本次的键与原文集合，不写入缓存
+            user_dict = self.load_user_dictionary()
+            community_dict_by_key, community_dict_by_origin = self.load_community_dictionary(
+                community_dict_dir, progress_callback, keys, origins
+            )
+            logging.info(
+                f"词典按需加载完成: 查询 {len(keys or ())} 个键、{len(origins or ())} 条原文，"
+                f"命中社区词典 {len(community_dict_by_key)} 条按键、{len(community_dict_by_origin)} 条按原文"
+            )
+            return user_dict, community_dict_by_key, community_dict_by_origin
+
         cache_key = f"all_dicts_{community_dict_dir or 'none'}"
 
         # 基于文件 mtime 检查缓存是否仍然有效
@@ -147,7 +475,42 @@ class DictionaryManager:
 
         return result
 
+    @staticmethod
+    def build_origin_table(community_dict_by_origin: dict[str, list[dict]]) -> dict[str, str]:
+        """为每个原文预先解析出最终译名；冲突较多时分块交给进程池并行解析。"""
+        table: dict[str, str] = {}
+        conflicts: list[tuple[str, list[dict]]] = []
+        for origin, candidates in community_dict_by_origin.items():
+            if len(candidates) == 1:
+                table[origin] = candidates[0]["trans"]
+            elif candidates:
+                conflicts.append((origin, candidates))
+        if not conflicts:
+            return table
+
+        max_workers = min(ORIGIN_CONFLICT_PROCESS_MAX_WORKERS, os.cpu_count() or 1)
+        if len(conflicts) >= ORIGIN_CONFLICT_PROCESS_MIN and max_workers >= 2:
+            chunks = [
+                conflicts[start:start + ORIGIN_CONFLICT_CHUNK_SIZE]
+                for start in range(0, len(conflicts), ORIGIN_CONFLICT_CHUNK_SIZE)
+            ]
+            try:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                    resolved_chunks = list(executor.map(resolve_origin_name_conflicts, chunks))
+                for resolved in resolved_chunks:
+                    table.update(resolved)
+                logging.debug(f"社区词典译名冲突已并行解析: {len(conflicts)} 条，进程数 {max_workers}")
+                return table
+            except (BrokenProcessPool, OSError) as e:
+                logging.warning(f"进程池不可用，改为在当前进程解析译名冲突: {e}")
+
+        table.update(resolve_origin_name_conflicts(conflicts))
+        logging.debug(f"社区词典译名冲突已解析: {len(conflicts)} 条")
+        return table
+
     def get_community_origin_translation(self, origin_name: str) -> str | None:
+        if self.community_origin_table:
+            return self.community_origin_table.get(origin_name)
         if origin_name in self._community_origin_cache:
             return self._community_origin_cache[origin_name]
 
@@ -0,0 +1,391 @@
+"""
+进程级共享词典服务：所有项目标签页共用同一份社区词典与个人词典数据。
+
+- 社区词典（完整加载或内存映射快照）按 (加载方式, 数据库版本) 缓存。DictionaryManager 通过
+  acquire_community 取得并持有引用，release_community 或管理器被回收时归还。
+  数据库更新后，旧版本在最后一个引用归还时释放；每个数据库保留最近一个版本，即使暂时无人引用，
+  下一次运行也可以直接复用。
+- 个人词典常驻内存，调用方拿到的是只读视图，读取不访问磁盘。
+  修改经 config_manager.update_user_dict 提交；服务收到个人词典存储的变更通知后，
+  只把该批变更记入增量层（删除记为墓碑）形成新版本，不复制整个词典，已发出的旧视图内容保持不变。
+  增量层超过 _USER_DELTA_LIMIT 条时在后台线程中并入基础字典。
+  个人词典原文的术语匹配 (match_user_terms) 使用 Aho-Corasick 自动机，变更先记入小覆盖层，不必每次重建。
+
+按需加载的社区词典只对应某个项目的键集合，不经过本服务。
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from core.term_matcher import TermMatcher
+from utils.user_dict_store import UserDictChange, user_dict_store
+
+# 个人词典术语自动机的增量覆盖层上限，超过后下一次匹配时整体重建
+_USER_OVERLAY_LIMIT = 2000
+# 个人词典视图增量层的上限，超过后在后台并入基础字典
+_USER_DELTA_LIMIT = 2000
+# 保留最近多少个批次的变更记录，供外部缓存与决策账本判断哪些结果需要重新计算
+_USER_CHANGE_LOG_LIMIT = 256
+
+# 增量层中的删除标记
+_DELETED = object()
+
+
+class LayeredTable(Mapping[str, str]):
+    """
+    个人词典的一张只读表：基础字典加一层增量（名称 → 译文或删除标记）。
+
+    两者创建后都不再修改，应用变更时复制增量层得到新表，旧表内容保持不变。
+    generation 为该表对应的个人词典保存计数，可与 DictionaryService.user_changes 配合得到两版之间的差异。
+    """
+
+    __slots__ = ("_base", "_delta", "_len", "generation")
+
+    def __init__(
+        self,
+        base: dict[str, str],
+        delta: dict[str, Any] | None = None,
+        length: int | None = None,
+        generation: int | None = None,
+    ):
+        self._base = base
+        self._delta = delta or {}
+        self._len = len(base) if length is None else length
+        self.generation = generation
+
+    def __getitem__(self, name: str) -> str:
+        value = self._delta.get(name)
+        if value is None:
+            return self._base[name]
+        if value is _DELETED:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        value = self._delta.get(name)
+        if value is None:
+            return name in self._base
+        return value is not _DELETED
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = self._delta.get(name)
+        if value is None:
+            return self._base.get(name, default)
+        return default if value is _DELETED else value
+
+    def __iter__(self) -> Iterator[str]:
+        delta = self._delta
+        for name in self._base:
+            if name not in delta:
+                yield name
+        for name, value in delta.items():
+            if value is not _DELETED:
+                yield name
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"LayeredTable({len(self)} 条, 增量 {len(self._delta)} 条)"
+
+    def __reduce__(self):
+        # 传给子进程时展开为普通字典，删除标记不跨进程
+        return dict, (dict(self),)
+
+    @property
+    def delta_size(self) -> int:
+        return len(self._delta)
+
+    def apply(self, upserts: Mapping[str, str], deletes: Iterable[str], generation: int | None = None) -> LayeredTable:
+        """返回应用一批变更后的新表；先删后写，开销只与本批与增量层的大小有关。"""
+        base, delta, length = self._base, dict(self._delta), self._len
+        for name in deletes:
+            value = delta.get(name)
+            if (name in base) if value is None else (value is not _DELETED):
+                length -= 1
+            delta[name] = _DELETED
+        for name, translation in upserts.items():
+            value = delta.get(name)
+            if not ((name in base) if value is None else (value is not _DELETED)):
+                length += 1
+            delta[name] = translation
+        return LayeredTable(base, delta, length, generation)
+
+    def rebase(self, merged: dict[str, str], compacted: LayeredTable) -> LayeredTable:
+        """
+        以 compacted 展开得到的 merged 作为新的基础字典；compacted 之后新增的变更保留在增量层中。
+
+        本表与 compacted 不共用基础字典时（期间整体重新载入过）原样返回。
+        """
+        if self._base is not compacted._base:
+            return self
+        old_delta, missing = compacted._delta, object()
+        delta = {name: value for name, value in self._delta.items() if old_delta.get(name, missing) is not value}
+        return LayeredTable(merged, delta, self._len, self.generation)
+
+
+@dataclass(eq=False)
+class CommunityDictionaries:
+    """一份共享的社区词典；各映射只读，由所有持有者共用。"""
+    kind: str
+    revision: tuple
+    by_key: Mapping[str, str]
+    by_origin: Mapping[str, list[dict]]
+    origin_table: Mapping[str, str]
+    snapshot: Any = None
+    refs: int = 0
+    _lower_key_index: dict[str, str] | None = field(default=None, repr=False)
+    _lower_origin_index: dict[str, str] | None = field(default=None, repr=False)
+    _index_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def search_indexes(self) -> tuple[dict[str, str], dict[str, str]]:
+        """小写键 → 原键、小写原文 → 原文，首次搜索时构建，各标签页共用。"""
+        with self._index_lock:
+            if self._lower_key_index is None:
+                self._lower_key_index = {k.lower(): k for k in self.by_key}
+                self._lower_origin_index = {k.lower(): k for k in self.by_origin}
+            return self._lower_key_index, self._lower_origin_index
+
+
+class DictionaryService:
+
+    _instance: DictionaryService | None = None
+    _creation_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._creation_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._lock = threading.Lock()
+        self._community: dict[tuple[str, tuple], CommunityDictionaries] = {}
+        # (加载方式, 数据库路径) → 最近加载的版本
+        self._latest: dict[tuple[str, str], tuple] = {}
+        self._load_locks: dict[tuple[str, tuple], threading.Lock] = {}
+        self._user_version: int | None = None
+        self._user_view: dict[str, LayeredTable] | None = None
+        self._user_compacting = False
+        # 保存计数 → {表名: 该批次增删改的名称}
+        self._user_change_log: dict[int, dict[str, tuple[str, ...]]] = {}
+        # 最近一次强制重新载入时的保存计数；重新载入前后的内容可能不同，跨过它的区间没有可靠记录
+        self._user_change_floor = -1
+        # 个人词典原文的术语自动机，以及其后增量变更的覆盖层（原文 → 译文，None 表示已删除）
+        self._user_matcher: TermMatcher[tuple[str, str]] | None = None
+        self._user_overlay: dict[str, str | None] = {}
+        self._user_overlay_matcher: TermMatcher[tuple[str, str]] | None = None
+        self._user_lock = threading.Lock()
+        user_dict_store.subscribe(self._on_user_dict_change)
+
+    def acquire_community(
+        self,
+        kind: str,
+        revision: tuple,
+        loader: Callable[[], CommunityDictionaries | None],
+    ) -> CommunityDictionaries | None:
+        """
+        取得 (kind, revision) 对应的共享社区词典并增加引用计数。
+
+        尚未加载时调用 loader 生成（同一版本只会加载一次，其他调用方等待结果）；
+        loader 返回 None 表示不可用，此时不缓存、也不计引用。
+        """
+        cache_key = (kind, revision)
+        with self._lock:
+            entry = self._community.get(cache_key)
+            if entry is not None:
+                entry.refs += 1
+                logging.debug(f"复用共享社区词典（{kind}），引用数 {entry.refs}")
+                return entry
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._community.get(cache_key)
+                if entry is not None:
+                    entry.refs += 1
+                    return entry
+            entry = None
+            try:
+                entry = loader()
+            finally:
+                with self._lock:
+                    self._load_locks.pop(cache_key, None)
+                    if entry is not None:
+                        entry.refs += 1
+                        self._community[cache_key] = entry
+                        self._set_latest(kind, revision)
+            return entry
+
+    def _set_latest(self, kind: str, revision: tuple) -> None:
+        path_key = (kind, revision[0])
+        previous = self._latest.get(path_key)
+        self._latest[path_key] = revision
+        if previous is not None and previous != revision:
+            stale = self._community.get((kind, previous))
+            if stale is not None and stale.refs <= 0:
+                del self._community[(kind, previous)]
+
+    def release_community(self, entry: CommunityDictionaries) -> None:
+        """归还一个引用；不再被引用的旧版本随即释放。"""
+        with self._lock:
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            cache_key = (entry.kind, entry.revision)
+            if self._latest.get((entry.kind, entry.revision[0])) != entry.revision and self._community.get(cache_key) is entry:
+                del self._community[cache_key]
+                logging.debug(f"旧版本社区词典已释放（{entry.kind}）")
+
+    def user_dictionary(self) -> dict:
+        """
+        返回当前版本个人词典的只读视图 {'by_key': LayeredTable, 'by_origin_name': LayeredTable}。
+
+        版本即个人词典存储的保存计数，版本不变时所有调用方拿到同一份数据。
+        """
+        with self._user_lock:
+            return dict(self._current_user_view())
+
+    def match_user_terms(self, text: str) -> list[tuple[str, str]]:
+        """
+        找出文本中出现的个人词典原文（整词、不区分大小写，含多词原文），返回 [(原文, 译文), ...]。
+
+        自动机在首次匹配时构建；之后的变更记入覆盖层，下一次匹配时为覆盖层单独建一个小自动机，
+        覆盖层超过 _USER_OVERLAY_LIMIT 条时才整体重建。
+        """
+        with self._user_lock:
+            view = self._current_user_view()
+            if self._user_matcher is None:
+                self._user_matcher = TermMatcher((origin, (origin, translation)) for origin, translation in view['by_origin_name'].items())
+                self._user_overlay = {}
+                self._user_overlay_matcher = None
+                logging.debug(f"个人词典术语自动机已构建，共 {len(self._user_matcher)} 条")
+            elif self._user_overlay and self._user_overlay_matcher is None:
+                self._user_overlay_matcher = TermMatcher(
+                    (origin, (origin, translation)) for origin, translation in self._user_overlay.items() if translation is not None
+                )
+            matcher, overlay, overlay_matcher = self._user_matcher, self._user_overlay, self._user_overlay_matcher
+        matches = [pair for pair in matcher.find(text) if pair[0] not in overlay]
+        if overlay_matcher is not None:
+            matches.extend(overlay_matcher.find(text))
+        return matches
+
+    def user_changes(self, table: str, since: int, until: int) -> set[str] | None:
+        """
+        返回保存计数 since 之后到 until 为止各批次在个人词典表 table 中增删改过的名称。
+
+        其间任一批次没有记录（过早、已被淘汰或通知尚未到达）时返回 None，调用方应按全部失效处理。
+        """
+        if since > until or until - since > _USER_CHANGE_LOG_LIMIT:
+            return None
+        changed: set[str] = set()
+        with self._user_lock:
+            if since <= self._user_change_floor:
+                return None
+            for generation in range(since + 1, until + 1):
+                tables = self._user_change_log.get(generation)
+                if tables is None:
+                    return None
+                changed.update(tables.get(table, ()))
+        return changed
+
+    def user_origin_changes(self, since: int, until: int) -> set[str] | None:
+        """user_changes 的原文表版本。"""
+        return self.user_changes('by_origin_name', since, until)
+
+    def _current_user_view(self) -> dict:
+        # 调用方需持有 self._user_lock。先取版本再读取：读取期间若有写入，通知到达时会重新应用
+        version = user_dict_store.generation
+        if self._user_view is None or version != self._user_version:
+            data = user_dict_store.load_all()
+            self._set_user_view(data['by_key'], data['by_origin_name'], version)
+            self._user_matcher = None
+            logging.debug("个人词典已载入共享缓存")
+        return self._user_view
+
+    def _set_user_view(self, by_key: dict, by_origin_name: dict, version: int) -> None:
+        self._user_view = {
+            'by_key': LayeredTable(by_key, generation=version),
+            'by_origin_name': LayeredTable(by_origin_name, generation=version),
+        }
+        self._user_version = version
+
+    def _on_user_dict_change(self, change: UserDictChange) -> None:
+        with self._user_lock:
+            log = self._user_change_log
+            log[change.generation] = {
+                table: (*change.deletes.get(table, ()), *change.upserts.get(table, {}))
+                for table in {*change.upserts, *change.deletes}
+            }
+            while len(log) > _USER_CHANGE_LOG_LIMIT:
+                del log[next(iter(log))]
+            if self._user_view is None or self._user_version is None or self._user_version >= change.generation:
+                return
+            if self._user_version != change.generation - 1:
+                # 漏掉了中间批次，下次读取时整体重新载入
+                self._user_view = None
+                self._user_version = None
+                self._user_matcher = None
+                return
+            # 通知在提交线程中同步执行，这里只记增量，不复制整张表，也不建自动机
+            self._user_view = {
+                name: table.apply(change.upserts.get(name, {}), change.deletes.get(name, ()), change.generation)
+                for name, table in self._user_view.items()
+            }
+            self._user_version = change.generation
+            origin_changes = dict.fromkeys(change.deletes.get('by_origin_name', ()))
+            origin_changes.update(change.upserts.get('by_origin_name', {}))
+            if self._user_matcher is not None and origin_changes:
+                overlay = {**self._user_overlay, **origin_changes}
+                if len(overlay) > _USER_OVERLAY_LIMIT:
+                    self._user_matcher = None
+                else:
+                    # 覆盖层整体替换而不是原地修改，正在匹配的线程仍使用旧的一份；小自动机在下一次匹配时再建
+                    self._user_overlay = overlay
+                    self._user_overlay_matcher = None
+            if not self._user_compacting and any(table.delta_size > _USER_DELTA_LIMIT for table in self._user_view.values()):
+                self._user_compacting = True
+                threading.Thread(target=self._compact_user_view, daemon=True, name="UserDictCompaction").start()
+
+    def _compact_user_view(self) -> None:
+        """在后台把增量层并入基础字典；合并期间到达的变更留在新的增量层中。"""
+        try:
+            with self._user_lock:
+                view = self._user_view
+            if view is None:
+                return
+            merged = {name: dict(table) for name, table in view.items()}
+            with self._user_lock:
+                if self._user_view is not None:
+                    self._user_view = {
+                        name: table.rebase(merged[name], view[name]) for name, table in self._user_view.items()
+                    }
+            logging.debug("个人词典增量层已并入基础字典")
+        except Exception as e:
+            logging.warning(f"合并个人词典增量层失败: {e}")
+        finally:
+            with self._user_lock:
+                self._user_compacting = False
+
+    def invalidate_user_dictionary(self) -> None:
+        with self._user_lock:
+            self._user_change_log.clear()
+            self._user_change_floor = user_dict_store.generation
+            self._user_view = None
+            self._user_version = None
+            self._user_matcher = None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'community_entries': len(self._community),
+                'community_refs': sum(entry.refs for entry in self._community.values()),
+            }
+
+
+dictionary_service = DictionaryService()
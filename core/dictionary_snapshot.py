@@ -0,0 +1,249 @@
+"""
+社区词典的只读快照：由 Dict-Sqlite.db 派生、可直接内存映射的二进制文件。
+
+快照中有两张按 UTF-8 字节序排好的字符串表：
+- keys：键 → 社区译名（与整表读取时「后出现者覆盖」的结果一致）；
+- origins：原文 → 冲突解析后的译名（与 DictionaryManager.build_origin_table 一致）。
+每张表由「键偏移数组 + 键数据 + 值偏移数组 + 值数据」组成，查找时在映射内存上二分，
+不构造任何 Python dict，打开快照只需读取文件头。
+
+文件名包含源数据库版本 (路径, mtime_ns, 大小) 与格式版本的摘要，数据库变化后自然对应新文件；
+旧文件在新快照写成后尽力清理（Windows 上仍被映射的文件会在下次清理）。
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from utils import config_manager
+
+SNAPSHOT_DIRNAME = "dict_snapshots"
+SNAPSHOT_FORMAT_VERSION = 1
+_MAGIC = b"MLCDSNAP"
+# magic, 格式版本, 字节序标记, 表数量
+_HEADER = struct.Struct("<8sIII")
+# 条目数, 键偏移位置, 键数据位置, 值偏移位置, 值数据位置
+_TABLE = struct.Struct("<QQQQQ")
+_BYTE_ORDER_MARK = 1 if sys.byteorder == "little" else 2
+
+
+def snapshot_dir() -> Path:
+    return config_manager.APP_DATA_PATH / SNAPSHOT_DIRNAME
+
+
+def snapshot_path(revision: tuple) -> Path:
+    digest = hashlib.sha1(f"{SNAPSHOT_FORMAT_VERSION}|{revision!r}".encode("utf-8")).hexdigest()[:16]
+    return snapshot_dir() / f"community_dict_{digest}.snap"
+
+
+class SnapshotTable(Mapping):
+    """映射内存上的只读 str → str 表；查找为二分，遍历按键的 UTF-8 字节序。"""
+
+    __slots__ = ("_buf", "_count", "_key_offsets", "_key_base", "_value_offsets", "_value_base")
+
+    def __init__(self, buf, count: int, key_offsets_pos: int, key_base: int, value_offsets_pos: int, value_base: int):
+        view = memoryview(buf)
+        self._buf = buf
+        self._count = count
+        self._key_offsets = view[key_offsets_pos:key_offsets_pos + 4 * (count + 1)].cast("I")
+        self._key_base = key_base
+        self._value_offsets = view[value_offsets_pos:value_offsets_pos + 4 * (count + 1)].cast("I")
+        self._value_base = value_base
+
+    def _key_bytes(self, index: int) -> bytes:
+        offsets = self._key_offsets
+        return self._buf[self._key_base + offsets[index]:self._key_base + offsets[index + 1]]
+
+    def _value(self, index: int) -> str:
+        offsets = self._value_offsets
+        return self._buf[self._value_base + offsets[index]:self._value_base + offsets[index + 1]].decode("utf-8", "surrogatepass")
+
+    def _find(self, key) -> int:
+        if not isinstance(key, str):
+            return -1
+        target = key.encode("utf-8", "surrogatepass")
+        buf, offsets, base = self._buf, self._key_offsets, self._key_base
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = buf[base + offsets[mid]:base + offsets[mid + 1]]
+            if current < target:
+                lo = mid + 1
+            elif current > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def __getitem__(self, key: str) -> str:
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._value(index)
+
+    def get(self, key: str, default=None):
+        index = self._find(key)
+        return self._value(index) if index >= 0 else default
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key_bytes(index).decode("utf-8", "surrogatepass")
+
+    def items(self):
+        return [(self._key_bytes(i).decode("utf-8", "surrogatepass"), self._value(i)) for i in range(self._count)]
+
+    def release(self) -> None:
+        self._key_offsets.release()
+        self._value_offsets.release()
+
+    def __repr__(self) -> str:
+        return f"SnapshotTable({self._count} 条)"
+
+
+class OriginCandidates(Mapping):
+    """
+    以 community_dict_by_origin 的形式（原文 → 候选列表）呈现快照中的原文表。
+
+    快照只保存冲突解析后的译名，这里把它包装成单一候选；对单一候选做冲突解析得到的仍是该译名。
+    """
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: SnapshotTable):
+        self._table = table
+
+    def __getitem__(self, origin: str) -> list[dict]:
+        return [{"trans": self._table[origin], "version": "0.0.0"}]
+
+    def __contains__(self, origin: object) -> bool:
+        return origin in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+
+
+class DictionarySnapshot:
+    """打开的快照文件；by_key / origin_table 在 close() 之前有效。"""
+
+    def __init__(self, path: Path, file, buf, by_key: SnapshotTable, origin_table: SnapshotTable):
+        self.path = path
+        self._file = file
+        self._buf = buf
+        self.by_key = by_key
+        self.origin_table = origin_table
+        self.by_origin = OriginCandidates(origin_table)
+
+    @classmethod
+    def open(cls, path: Path) -> DictionarySnapshot | None:
+        """打开并校验快照；文件不存在或格式不符时返回 None。"""
+        try:
+            file = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError("文件过短")
+            buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, byte_order, table_count = _HEADER.unpack_from(buf, 0)
+            if magic != _MAGIC or version != SNAPSHOT_FORMAT_VERSION or byte_order != _BYTE_ORDER_MARK or table_count != 2:
+                buf.close()
+                raise ValueError("格式版本不匹配")
+            tables = []
+            for i in range(table_count):
+                fields = _TABLE.unpack_from(buf, _HEADER.size + i * _TABLE.size)
+                if any(pos > size for pos in fields[1:]):
+                    buf.close()
+                    raise ValueError("表位置越界")
+                tables.append(SnapshotTable(buf, *fields))
+            return cls(path, file, buf, tables[0], tables[1])
+        except (ValueError, OSError, struct.error) as e:
+            logging.debug(f"社区词典快照不可用: {path} - {e}")
+            file.close()
+            return None
+
+    def close(self) -> None:
+        try:
+            self.by_key.release()
+            self.origin_table.release()
+            self._buf.close()
+        except (BufferError, ValueError):
+            # 仍有调用方持有表中的视图，交由垃圾回收处理
+            return
+        finally:
+            self._file.close()
+
+
+def _table_arrays(mapping: Mapping[str, str | None]) -> tuple[int, array, bytes, array, bytes]:
+    # 偏移为 32 位无符号数（相对各自数据段起点），单段超过 4 GiB 时 append 抛出 OverflowError
+    # 社区词典中 trans_name 为 NULL 的行没有可用译名，与查不到等价，不写入快照
+    encoded = sorted(
+        (key.encode("utf-8", "surrogatepass"), value.encode("utf-8", "surrogatepass"))
+        for key, value in mapping.items()
+        if key is not None and value is not None
+    )
+    key_offsets, value_offsets = array("I", [0]), array("I", [0])
+    key_parts, value_parts = [], []
+    key_total = value_total = 0
+    for key, value in encoded:
+        key_total += len(key)
+        value_total += len(value)
+        key_parts.append(key)
+        value_parts.append(value)
+        key_offsets.append(key_total)
+        value_offsets.append(value_total)
+    return len(encoded), key_offsets, b"".join(key_parts), value_offsets, b"".join(value_parts)
+
+
+def write_snapshot(path: Path, by_key: Mapping[str, str], origin_table: Mapping[str, str]) -> None:
+    """写入快照：先写临时文件再改名，读者不会看到半成品。"""
+    tables = [_table_arrays(by_key), _table_arrays(origin_table)]
+    position = _HEADER.size + len(tables) * _TABLE.size
+    directory, sections = [], []
+    for count, key_offsets, key_blob, value_offsets, value_blob in tables:
+        fields = [count]
+        for part in (key_offsets.tobytes(), key_blob, value_offsets.tobytes(), value_blob):
+            padding = -position % 8
+            sections.append(b"\0" * padding)
+            position += padding
+            fields.append(position)
+            sections.append(part)
+            position += len(part)
+        directory.append(_TABLE.pack(*fields))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, SNAPSHOT_FORMAT_VERSION, _BYTE_ORDER_MARK, len(tables)))
+        for entry in directory:
+            f.write(entry)
+        for part in sections:
+            f.write(part)
+    os.replace(tmp_path, path)
+
+
+def remove_stale_snapshots(keep: Path) -> None:
+    for candidate in snapshot_dir().glob("community_dict_*"):
+        if candidate == keep:
+            continue
+        try:
+            candidate.unlink()
+        except OSError:
+            # Windows 上仍被映射的旧快照无法删除，下次再清理
+            pass
@@ -1,43 +1,47 @@
 from __future__ import annotations
 import zipfile
 import logging
-import hashlib
 import threading
 import os
 from pathlib import Path
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
-from utils import file_utils, config_manager, mod_scan_cache
+from utils import file_utils, config_manager, mod_scan_cache, lang_scan_cache, mod_metadata_cache
 from core.models import (
-    LanguageEntry, NamespaceInfo, ExtractionResult, ZipFileResult,
-    JSON_KEY_VALUE_PATTERN, LANG_KV_PATTERN
+    LanguageEntry, LanguageTable, NamespaceInfo, ExtractionResult, ZipFileResult, LANG_KV_PATTERN
 )
-from core.mod_fingerprint import jar_mod_fingerprints_and_meta
+from core.mod_fingerprint import JarFileFingerprinter
 from core.mod_repository import ModrinthClient, CurseForgeClient
-from core.constants import EXTRACTOR_SCAN_MAX_WORKERS, EXTRACTOR_FINGERPRINT_MAX_WORKERS, JAR_READ_CHUNK_SIZE
-from utils.file_utils import decode_json_value_with_unicode
+from core.constants import (
+    EXTRACTOR_SCAN_MAX_WORKERS, EXTRACTOR_SCAN_PROCESS_MAX_WORKERS, EXTRACTOR_PROCESS_POOL_MIN_JARS,
+    EXTRACTOR_FINGERPRINT_MAX_WORKERS, JAR_READ_CHUNK_SIZE,
+    MOD_METADATA_MAX_WORKERS, MOD_METADATA_CHUNK_SIZE,
+)
+from utils.json_lang_tokenizer import iter_json_lang_entries
 
 
 class Extractor:
 
-    def __init__(self):
-        self._modrinth_client = ModrinthClient()
-        self._curseforge_client = CurseForgeClient()
-
-    def _extract_from_text(self, content: str, file_format: str, file_path_for_log: str) -> dict[str, str]:
+    def __init__(
+        self,
+        modrinth_client: ModrinthClient | None = None,
+        curseforge_client: CurseForgeClient | None = None,
+    ):
+        self._modrinth_client = modrinth_client or ModrinthClient()
+        self._curseforge_client = curseforge_client or CurseForgeClient()
+
+    @staticmethod
+    def _extract_from_text(content: str, file_format: str, file_path_for_log: str) -> dict[str, str]:
         data: dict[str, str] = {}
         comment_counter = 0
         if file_format == 'json':
-            for match in JSON_KEY_VALUE_PATTERN.finditer(content):
-                key = match.group(1)
-                value = match.group(2)
-                temp_value = decode_json_value_with_unicode(value)
+            for key, value, _, _ in iter_json_lang_entries(content):
                 if key == '_comment':
                     comment_counter += 1
-                    data[f'_comment_{comment_counter}'] = temp_value
+                    data[f'_comment_{comment_counter}'] = value
                 else:
-                    data[key] = temp_value
+                    data[key] = value
         elif file_format == 'lang':
             for match in LANG_KV_PATTERN.finditer(content):
                 key = match.group(1)
@@ -49,7 +53,8 @@ class Extractor:
                     data[key] = value
         return data
 
-    def _get_namespace_from_path(self, path_str: str) -> str:
+    @staticmethod
+    def _get_namespace_from_path(path_str: str) -> str:
         parts = Path(path_str).parts
         if 'assets' in parts:
             try:
@@ -58,7 +63,8 @@ class Extractor:
                 pass
         return 'minecraft'
 
-    def _process_zip_file(self, zf: zipfile.ZipFile, file_info: zipfile.ZipInfo, source_zip_name: str) -> ZipFileResult:
+    @staticmethod
+    def _process_zip_file(zf: zipfile.ZipFile, file_info: zipfile.ZipInfo, source_zip_name: str) -> ZipFileResult:
         path_str_lower = file_info.filename.lower()
         is_english = 'lang/en_us' in path_str_lower
         is_chinese = 'lang/zh_cn' in path_str_lower
@@ -66,7 +72,7 @@ class Extractor:
         if not (is_english or is_chinese):
             return ZipFileResult.empty()
 
-        base_namespace = self._get_namespace_from_path(file_info.filename)
+        base_namespace = Extractor._get_namespace_from_path(file_info.filename)
         file_format = 'lang' if path_str_lower.endswith('.lang') else 'json'
 
         namespace = base_namespace
@@ -82,7 +88,7 @@ class Extractor:
             logging.warning(f"读取zip内文件失败: {log_path} - {e}")
             return ZipFileResult.empty()
 
-        extracted_data = self._extract_from_text(content, file_format, log_path)
+        extracted_data = Extractor._extract_from_text(content, file_format, log_path)
 
         return ZipFileResult(
             namespace=namespace,
@@ -93,6 +99,91 @@ class Extractor:
             is_chinese=is_chinese,
         )
 
+    @staticmethod
+    def _resolve_scan_mode(pending_count: int) -> str:
+        mode = config_manager.load_config().get('extractor_scan_mode', 'auto')
+        if mode not in ('auto', 'thread', 'process'):
+            logging.warning(f"未知的扫描模式 '{mode}'，将使用 auto")
+            mode = 'auto'
+        cpu_count = os.cpu_count() or 1
+        if mode == 'auto':
+            if pending_count >= EXTRACTOR_PROCESS_POOL_MIN_JARS and cpu_count >= 4:
+                mode = 'process'
+            else:
+                mode = 'thread'
+        if mode == 'process' and (pending_count < 2 or cpu_count < 2):
+            mode = 'thread'
+        logging.debug(f"语言文件扫描模式: {mode}（待解析 {pending_count} 个JAR，CPU {cpu_count} 核）")
+        return mode
+
+    def _scan_lang_with_processes(
+        self,
+        pending: list[tuple[Path, os.stat_result]],
+        lang_cache: lang_scan_cache.LangScanCache,
+        all_results: list[tuple[str, list[ZipFileResult]]],
+        report_progress,
+        stop_event,
+    ) -> list[tuple[Path, os.stat_result]]:
+        """
+        在进程池中解析 JAR，子进程只回传紧凑的行元组；返回未能完成的 JAR，由调用方改用线程池处理。
+
+        子进程不持有 lang_cache：提交前先在本进程读取中央目录、按内容摘要查缓存，命中的 JAR 不再提交。
+        """
+        remaining = {jf: st for jf, st in pending}
+        to_scan: list[Path] = []
+        for jar_file, st in pending:
+            if stop_event and stop_event.is_set():
+                raise KeyboardInterrupt("用户取消了操作")
+            try:
+                with zipfile.ZipFile(jar_file, 'r') as zf:
+                    digest = lang_scan_cache.archive_digest(zf)
+            except (zipfile.BadZipFile, OSError) as e:
+                logging.error(f"无法读取JAR文件: {jar_file.name} - 错误: {e}")
+                remaining.pop(jar_file)
+                all_results.append((jar_file.name, []))
+                report_progress()
+                continue
+            cached_rows = lang_cache.get_by_digest(digest)
+            if cached_rows is None:
+                to_scan.append(jar_file)
+                continue
+            remaining.pop(jar_file)
+            lang_cache.put(jar_file, st, digest, cached_rows)
+            all_results.append((jar_file.name, [ZipFileResult.from_row(row) for row in cached_rows]))
+            report_progress()
+        if not to_scan:
+            return []
+
+        max_workers = min(EXTRACTOR_SCAN_PROCESS_MAX_WORKERS, len(to_scan), max(1, (os.cpu_count() or 1)))
+        logging.info(f"使用进程池扫描 {len(to_scan)} 个JAR，进程数: {max_workers}")
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(scan_jar_language_rows, jf): jf for jf in to_scan}
+                for future in as_completed(futures):
+                    if stop_event and stop_event.is_set():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise KeyboardInterrupt("用户取消了操作")
+                    jar_file = futures[future]
+                    st = remaining.pop(jar_file)
+                    report_progress()
+                    try:
+                        digest, rows = future.result()
+                    except (zipfile.BadZipFile, OSError) as e:
+                        logging.error(f"无法读取JAR文件: {jar_file.name} - 错误: {e}")
+                        all_results.append((jar_file.name, []))
+                        continue
+                    except BrokenProcessPool:
+                        remaining[jar_file] = st
+                        raise
+                    except Exception as e:
+                        logging.error(f"处理JAR文件时发生错误: {e}")
+                        continue
+                    lang_cache.put(jar_file, st, digest, rows)
+                    all_results.append((jar_file.name, [ZipFileResult.from_row(row) for row in rows]))
+        except (BrokenProcessPool, OSError) as e:
+            logging.warning(f"进程池不可用: {e}")
+        return list(remaining.items())
+
     def extract_from_mods(self, mods_dir: Path, extraction_progress_callback=None, stop_event=None) -> ExtractionResult:
         logging.debug(f"正在扫描Mods文件夹: {mods_dir}")
 
@@ -103,43 +194,81 @@ class Extractor:
         if not jar_files:
             return result
 
-        def _process_one_jar_lang(jar_file: Path) -> tuple[str, list[ZipFileResult]]:
-            local_lang_files: list[ZipFileResult] = []
+        lang_cache = lang_scan_cache.LangScanCache()
+        lang_cache.load()
+
+        total_jars = len(jar_files)
+        completed = 0
+        all_results: list[tuple[str, list[ZipFileResult]]] = []
+
+        def _report_progress():
+            nonlocal completed
+            completed += 1
+            if extraction_progress_callback:
+                extraction_progress_callback("scan_lang", completed, total_jars)
+
+        def _process_one_jar_lang(jar_file: Path, st: os.stat_result) -> tuple[str, list[ZipFileResult]]:
             try:
-                with zipfile.ZipFile(jar_file, 'r') as zf:
-                    for file_info in zf.infolist():
-                        if file_info.is_dir() or 'lang' not in file_info.filename or not file_info.filename.startswith('assets/'):
-                            continue
-                        result = self._process_zip_file(zf, file_info, jar_file.name)
-                        if result.is_valid:
-                            local_lang_files.append(result)
+                digest, rows = scan_jar_language_rows(jar_file, lang_cache)
+                lang_cache.put(jar_file, st, digest, rows)
             except (zipfile.BadZipFile, OSError) as e:
                 logging.error(f"无法读取JAR文件: {jar_file.name} - 错误: {e}")
-            return jar_file.name, local_lang_files
+                return jar_file.name, []
+            return jar_file.name, [ZipFileResult.from_row(row) for row in rows]
 
-        max_workers = min(EXTRACTOR_SCAN_MAX_WORKERS, len(jar_files), max(1, (os.cpu_count() or 1)))
-        all_results: list[tuple[str, list[ZipFileResult]]] = []
+        try:
+            # stat 预检：命中缓存的 JAR 不进入任何线程/进程池
+            pending: list[tuple[Path, os.stat_result]] = []
+            for jar_file in jar_files:
+                try:
+                    st = jar_file.stat()
+                except OSError as e:
+                    logging.error(f"无法读取JAR文件: {jar_file.name} - 错误: {e}")
+                    _report_progress()
+                    continue
+                cached_rows = lang_cache.get_by_stat(jar_file, st)
+                if cached_rows is None:
+                    pending.append((jar_file, st))
+                else:
+                    all_results.append((jar_file.name, [ZipFileResult.from_row(row) for row in cached_rows]))
+                    _report_progress()
 
-        if len(jar_files) <= 4:
-            for i, jar_file in enumerate(jar_files):
-                if extraction_progress_callback:
-                    extraction_progress_callback("scan_lang", i + 1, len(jar_files))
-                all_results.append(_process_one_jar_lang(jar_file))
-        else:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {executor.submit(_process_one_jar_lang, jf): jf for jf in jar_files}
-                completed = 0
-                for future in as_completed(futures):
+            scan_mode = self._resolve_scan_mode(len(pending))
+            if scan_mode == "process":
+                pending = self._scan_lang_with_processes(pending, lang_cache, all_results, _report_progress, stop_event)
+                if pending:
+                    logging.warning(f"进程池扫描未完成，剩余 {len(pending)} 个JAR改用线程池扫描")
+
+            if len(pending) <= 4:
+                for jar_file, st in pending:
                     if stop_event and stop_event.is_set():
-                        executor.shutdown(wait=False, cancel_futures=True)
                         raise KeyboardInterrupt("用户取消了操作")
-                    completed += 1
-                    if extraction_progress_callback:
-                        extraction_progress_callback("scan_lang", completed, len(jar_files))
-                    try:
-                        all_results.append(future.result())
-                    except Exception as e:
-                        logging.error(f"处理JAR文件时发生错误: {e}")
+                    all_results.append(_process_one_jar_lang(jar_file, st))
+                    _report_progress()
+            else:
+                max_workers = min(EXTRACTOR_SCAN_MAX_WORKERS, len(pending), max(1, (os.cpu_count() or 1)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(_process_one_jar_lang, jf, st): jf for jf, st in pending}
+                    for future in as_completed(futures):
+                        if stop_event and stop_event.is_set():
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            raise KeyboardInterrupt("用户取消了操作")
+                        _report_progress()
+                        try:
+                            all_results.append(future.result())
+                        except Exception as e:
+                            logging.error(f"处理JAR文件时发生错误: {e}")
+            lang_cache.prune(mods_dir, jar_files)
+        finally:
+            lang_cache.close()
+
+        logging.info(
+            "语言扫描缓存命中 %d / %d（内容摘要命中 %d）；未命中项已解析并写入 %s",
+            lang_cache.hits + lang_cache.digest_hits,
+            len(jar_files),
+            lang_cache.digest_hits,
+            lang_scan_cache.cache_path(),
+        )
 
         formats_by_namespace: dict[str, set[str]] = {}
         for jar_name, language_files in all_results:
@@ -168,22 +297,19 @@ class Extractor:
 
                 if r.is_english:
                     result.raw_english_files[final_namespace] = r.content
-                    result.namespace_info[final_namespace].raw_content = r.content
+                    table = result.master_english.get(final_namespace)
+                    if table is None:
+                        table = result.master_english[final_namespace] = LanguageTable(final_namespace)
                     for key, value in r.extracted_data.items():
-                        result.master_english[final_namespace][key] = LanguageEntry(
-                            key=key,
-                            en=value,
-                            namespace=final_namespace
-                        )
+                        table.add(key, value)
                 elif r.is_chinese:
+                    english = result.master_english.get(final_namespace)
+                    table = result.internal_chinese.get(final_namespace)
+                    if table is None:
+                        table = result.internal_chinese[final_namespace] = LanguageTable(final_namespace)
                     for key, value in r.extracted_data.items():
-                        en_value = result.master_english[final_namespace][key].en if final_namespace in result.master_english and key in result.master_english[final_namespace] else ""
-                        result.internal_chinese[final_namespace][key] = LanguageEntry(
-                            key=key,
-                            en=en_value,
-                            zh=value,
-                            namespace=final_namespace
-                        )
+                        en_value = english.get_en(key, "") if english is not None else ""
+                        table.add(key, en_value, value)
 
         logging.info(f"扫描完成: {len(jar_files)}个JAR, {len(result.master_english)}个命名空间")
         return result
@@ -207,39 +333,54 @@ class Extractor:
                 namespace_map[base_namespace] = []
             namespace_map[base_namespace].append(full_namespace)
 
-        for zip_path in reversed(zip_paths):
+        pack_cache = lang_scan_cache.LangScanCache(lang_scan_cache.PACK_CACHE_FILENAME)
+        pack_cache.load()
+
+        def _read_pack(zip_path: Path) -> list[tuple] | None:
             if not zip_path.exists() or not zip_path.is_file() or not zipfile.is_zipfile(zip_path):
                 logging.warning(f"  - 无效的ZIP文件，已跳过: {zip_path}")
-                continue
-
-            current_zip_chinese_dict: dict[str, dict] = defaultdict(dict)
-
+                return None
             try:
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    for file_info in zf.infolist():
-                        if file_info.is_dir() or 'lang/zh_cn' not in file_info.filename.lower() or not file_info.filename.startswith('assets/'):
-                            continue
-
-                        r = self._process_zip_file(zf, file_info, zip_path.name)
-                        if not r.is_valid:
-                            continue
-
-                        for key, zh_value in r.extracted_data.items():
-                            if key == '_comment':
-                                continue
-
-                            en_value = master_english.get(r.namespace, {}).get(key, None)
-                            if en_value and en_value.en != zh_value:
-                                final_pack_chinese_dict[key] = zh_value
-                            else:
-                                if r.namespace in namespace_map:
-                                    for full_namespace in namespace_map[r.namespace]:
-                                        en_value = master_english.get(full_namespace, {}).get(key, None)
-                                        if en_value and en_value.en != zh_value:
-                                            final_pack_chinese_dict[key] = zh_value
-                                            break
+                st = zip_path.stat()
+                rows = pack_cache.get_by_stat(zip_path, st)
+                if rows is None:
+                    digest, rows = scan_pack_chinese_rows(zip_path, pack_cache)
+                    pack_cache.put(zip_path, st, digest, rows)
+                return rows
             except (zipfile.BadZipFile, OSError) as e:
                 logging.error(f"无法读取汉化包: {zip_path.name} - 错误: {e}")
+                return None
+
+        # 各汉化包并行读取（或直接取自索引），合并时仍按原顺序：列表靠前的汉化包优先级更高
+        try:
+            if len(zip_paths) == 1:
+                pack_rows = [_read_pack(zip_paths[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(EXTRACTOR_SCAN_MAX_WORKERS, len(zip_paths))) as executor:
+                    pack_rows = list(executor.map(_read_pack, zip_paths))
+            pack_cache.prune_missing()
+        finally:
+            pack_cache.close()
+        logging.debug(f"  - 汉化包索引命中 {pack_cache.hits + pack_cache.digest_hits}/{len(zip_paths)}")
+
+        for rows in reversed(pack_rows):
+            if rows is None:
+                continue
+            for namespace, extracted_data in rows:
+                for key, zh_value in extracted_data.items():
+                    if key == '_comment':
+                        continue
+
+                    en_value = master_english.get(namespace, {}).get(key, None)
+                    if en_value and en_value.en != zh_value:
+                        final_pack_chinese_dict[key] = zh_value
+                    else:
+                        if namespace in namespace_map:
+                            for full_namespace in namespace_map[namespace]:
+                                en_value = master_english.get(full_namespace, {}).get(key, None)
+                                if en_value and en_value.en != zh_value:
+                                    final_pack_chinese_dict[key] = zh_value
+                                    break
 
         logging.info(f"  - {len(zip_paths)} 个第三方汉化包处理完毕，共聚合 {len(final_pack_chinese_dict)} 条有效汉化。")
         return final_pack_chinese_dict
@@ -287,21 +428,12 @@ class Extractor:
 
         def _process_one_jar(jf: Path):
             try:
-                # 流式计算 SHA1，避免大文件一次性读入内存
-                sha1 = hashlib.sha1()
-                with open(jf, 'rb') as f:
-                    while True:
-                        chunk = f.read(JAR_READ_CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        sha1.update(chunk)
-                data = None  # 不保留完整数据
+                st = jf.stat()
             except OSError as e:
                 logging.warning("无法读取 JAR: %s — %s", jf, e)
                 return None
-            modrinth_hash = sha1.hexdigest()
             with data_lock:
-                rec = fingerprint_cache.get(modrinth_hash)
+                rec = fingerprint_cache.get_by_stat(jf, st)
             if rec is not None:
                 return (
                     True,
@@ -310,25 +442,34 @@ class Extractor:
                     rec["curseforge_hash"],
                     rec["modrinth_hash"],
                 )
-            # 缓存未命中，需要读取完整数据计算 MurmurHash
             try:
-                with open(jf, 'rb') as f:
-                    data = f.read()
+                # 同一映射上先算 SHA1，缓存未命中时再按块计算 MurmurHash，不整包读入内存
+                with JarFileFingerprinter(jf, JAR_READ_CHUNK_SIZE) as fingerprinter:
+                    modrinth_hash = fingerprinter.modrinth_hash()
+                    with data_lock:
+                        rec = fingerprint_cache.get(modrinth_hash)
+                        fingerprint_cache.put_stat(jf, st, modrinth_hash)
+                    if rec is not None:
+                        return (
+                            True,
+                            jf,
+                            jf.name,
+                            rec["curseforge_hash"],
+                            rec["modrinth_hash"],
+                        )
+                    curseforge_hash = fingerprinter.curseforge_hash()
             except OSError as e:
                 logging.warning("无法读取 JAR: %s — %s", jf, e)
                 return None
-            jar_name, curseforge_hash, mr = jar_mod_fingerprints_and_meta(
-                jf, data, modrinth_hash
-            )
             with data_lock:
                 fingerprint_cache.put(modrinth_hash, {
                     'curseforge_hash': curseforge_hash,
                 })
-            return (False, jf, jar_name, curseforge_hash, mr)
+            return (False, jf, jf.name, curseforge_hash, modrinth_hash)
 
         max_workers = min(EXTRACTOR_FINGERPRINT_MAX_WORKERS, len(jars_to_process), max(1, (os.cpu_count() or 1) * 4))
         logging.debug(
-            "模组指纹：%d 个线程；键为整包 SHA1，命中则跳过 MurmurHash 计算",
+            "模组指纹：%d 个线程；先按 (路径, 大小, mtime) 查 stat 索引，再按整包 SHA1 查表，命中则跳过 MurmurHash 计算",
             max_workers,
         )
 
@@ -357,7 +498,7 @@ class Extractor:
 
         if jars_to_process:
             logging.info(
-                "模组指纹缓存（SHA1）命中 %d / %d；未命中项已解析并写入 %s",
+                "模组指纹缓存（stat/SHA1）命中 %d / %d；未命中项已解析并写入 %s",
                 cache_hits,
                 len(jars_to_process),
                 mod_scan_cache.cache_path(),
@@ -365,6 +506,49 @@ class Extractor:
 
         return (mod_info_by_jar, cache_hits, hash_to_jar, curseforge_hashes, modrinth_hashes, completed)
 
+    @staticmethod
+    def _submit_mod_info_lookup(
+        executor: ThreadPoolExecutor,
+        metadata_cache: mod_metadata_cache.ModMetadataCache,
+        provider: str,
+        client: ModrinthClient | CurseForgeClient,
+        hashes: list[str],
+    ) -> tuple[dict[str, dict], list[tuple[list[str], Future]]]:
+        """先查元数据缓存，其余哈希按 MOD_METADATA_CHUNK_SIZE 分块提交到线程池并行查询。"""
+        cached, negative = metadata_cache.lookup(provider, hashes)
+        missing = [h for h in dict.fromkeys(hashes) if h not in cached and h not in negative]
+        chunks = [missing[i:i + MOD_METADATA_CHUNK_SIZE] for i in range(0, len(missing), MOD_METADATA_CHUNK_SIZE)]
+        logging.info(
+            "%s 元数据缓存：命中 %d 个，已知未收录 %d 个，需联网查询 %d 个（%d 个请求）",
+            provider, len(cached), len(negative), len(missing), len(chunks),
+        )
+        return cached, [(chunk, executor.submit(client.query_mod_info, chunk)) for chunk in chunks]
+
+    @staticmethod
+    def _collect_mod_info_lookup(
+        metadata_cache: mod_metadata_cache.ModMetadataCache,
+        provider: str,
+        cached: dict[str, dict],
+        jobs: list[tuple[list[str], Future]],
+    ) -> dict[str, dict]:
+        result = dict(cached)
+        failed = 0
+        for chunk, future in jobs:
+            try:
+                fetched = future.result()
+            except Exception as e:
+                logging.error("%s 元数据查询失败: %s", provider, e)
+                fetched = None
+            if fetched is None:
+                # 请求失败（或未配置密钥），不写入负向结果，下次扫描重试
+                failed += 1
+                continue
+            metadata_cache.store(provider, chunk, fetched)
+            result.update(fetched)
+        if failed:
+            logging.warning("%s 元数据查询有 %d/%d 个请求失败，相应模组将在下次扫描时重试", provider, failed, len(jobs))
+        return result
+
     def _resolve_mod_names(
         self,
         mod_info_by_jar: dict[str, dict],
@@ -379,22 +563,46 @@ class Extractor:
         if extraction_progress_callback:
             extraction_progress_callback("repo_metadata", 0, 2)
 
-        curseforge_info = self._curseforge_client.get_mod_info(curseforge_hashes)
-
-        unmatched_modrinth_hashes: list[str] = []
-        for jar_name, info in mod_info_by_jar.items():
-            if info['curseforge_hash'] not in curseforge_info and info['modrinth_hash']:
-                unmatched_modrinth_hashes.append(info['modrinth_hash'])
+        metadata_cache = mod_metadata_cache.ModMetadataCache.from_config()
+        metadata_cache.load()
+        try:
+            with ThreadPoolExecutor(max_workers=MOD_METADATA_MAX_WORKERS) as executor:
+                curseforge_cached, curseforge_jobs = self._submit_mod_info_lookup(
+                    executor, metadata_cache, mod_metadata_cache.PROVIDER_CURSEFORGE,
+                    self._curseforge_client, curseforge_hashes,
+                )
+                # Modrinth 与 CurseForge 同时查询：凡 CurseForge 缓存中尚无结果的模组都预先查 Modrinth，
+                # 不再等待 CurseForge 返回后才得知哪些未匹配
+                speculative_modrinth_hashes = [
+                    info['modrinth_hash'] for info in mod_info_by_jar.values()
+                    if info['modrinth_hash'] and info['curseforge_hash'] not in curseforge_cached
+                ]
+                modrinth_cached, modrinth_jobs = self._submit_mod_info_lookup(
+                    executor, metadata_cache, mod_metadata_cache.PROVIDER_MODRINTH,
+                    self._modrinth_client, speculative_modrinth_hashes,
+                )
 
-        modrinth_info: dict[str, dict] = {}
+                curseforge_info = self._collect_mod_info_lookup(
+                    metadata_cache, mod_metadata_cache.PROVIDER_CURSEFORGE, curseforge_cached, curseforge_jobs
+                )
+                if extraction_progress_callback:
+                    extraction_progress_callback("repo_metadata", 1, 2)
+                all_modrinth_info = self._collect_mod_info_lookup(
+                    metadata_cache, mod_metadata_cache.PROVIDER_MODRINTH, modrinth_cached, modrinth_jobs
+                )
+        finally:
+            metadata_cache.close()
+
+        # 仅 CurseForge 未匹配的模组采用 Modrinth 结果，与逐级查询时的取舍一致
+        unmatched_modrinth_hashes = {
+            info['modrinth_hash'] for info in mod_info_by_jar.values()
+            if info['curseforge_hash'] not in curseforge_info and info['modrinth_hash']
+        }
+        modrinth_info = {h: v for h, v in all_modrinth_info.items() if h in unmatched_modrinth_hashes}
         if unmatched_modrinth_hashes:
-            if extraction_progress_callback:
-                extraction_progress_callback("repo_metadata", 1, 2)
-
-            logging.info(f"CurseForge未匹配 {len(unmatched_modrinth_hashes)} 个模组，尝试从Modrinth获取...")
-            modrinth_info = self._modrinth_client.get_mod_info(unmatched_modrinth_hashes)
+            logging.info(f"CurseForge未匹配 {len(unmatched_modrinth_hashes)} 个模组，其中 {len(modrinth_info)} 个由Modrinth匹配")
         else:
-            logging.info("所有模组已通过CurseForge匹配，无需调用Modrinth")
+            logging.info("所有模组已通过CurseForge匹配")
 
         if extraction_progress_callback:
             extraction_progress_callback("repo_metadata", 2, 2)
@@ -490,6 +698,7 @@ class Extractor:
 
             fingerprint_cache = mod_scan_cache.ModFingerprintDiskCache()
             fingerprint_cache.load()
+            fingerprint_cache.prune(mods_dir, jar_files)
 
             mod_info_by_jar, cache_hits, hash_to_jar, curseforge_hashes, modrinth_hashes, _ = \
                 self._collect_mod_fingerprints(jars_to_process, fingerprint_cache, extraction_progress_callback, stop_event)
@@ -507,3 +716,51 @@ class Extractor:
         logging.info(f"数据聚合完成: {len(result.master_english)}个命名空间, {total_en}条英文, {total_zh_internal}条自带中文, {len(result.module_names)}个模组")
 
         return result
+
+
+def scan_jar_language_rows(
+    jar_file: Path,
+    lang_cache: lang_scan_cache.LangScanCache | None = None,
+) -> tuple[str, list[tuple]]:
+    """打开 JAR 并解析其中的语言文件，返回 (中央目录摘要, ZipFileResult 行列表)。
+
+    为模块级函数，可直接提交到进程池；进程池中不传 lang_cache。
+    原始文件内容只有英文文件会用到（raw_english_files），中文行不带原文，减少回传与缓存的数据量。
+    """
+    with zipfile.ZipFile(jar_file, 'r') as zf:
+        digest = lang_scan_cache.archive_digest(zf)
+        if lang_cache is not None:
+            cached_rows = lang_cache.get_by_digest(digest)
+            if cached_rows is not None:
+                return digest, cached_rows
+        rows: list[tuple] = []
+        for file_info in zf.infolist():
+            if file_info.is_dir() or 'lang' not in file_info.filename or not file_info.filename.startswith('assets/'):
+                continue
+            result = Extractor._process_zip_file(zf, file_info, jar_file.name)
+            if result.is_valid:
+                if not result.is_english:
+                    result.content = ""
+                rows.append(result.to_row())
+    return digest, rows
+
+
+def scan_pack_chinese_rows(
+    zip_path: Path,
+    pack_cache: lang_scan_cache.LangScanCache | None = None,
+) -> tuple[str, list[tuple]]:
+    """打开第三方汉化包并解析其中的 zh_cn 语言文件，返回 (中央目录摘要, [(命名空间, 键值字典), ...])。"""
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        digest = lang_scan_cache.archive_digest(zf)
+        if pack_cache is not None:
+            cached_rows = pack_cache.get_by_digest(digest)
+            if cached_rows is not None:
+                return digest, cached_rows
+        rows: list[tuple] = []
+        for file_info in zf.infolist():
+            if file_info.is_dir() or 'lang/zh_cn' not in file_info.filename.lower() or not file_info.filename.startswith('assets/'):
+                continue
+            result = Extractor._process_zip_file(zf, file_info, zip_path.name)
+            if result.is_valid:
+                rows.append((result.namespace, result.extracted_data))
+    return digest, rows
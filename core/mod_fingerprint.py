@@ -1,46 +1,130 @@
 from __future__ import annotations
 import hashlib
 import logging
+import mmap
+import os
 import re
+import sys
+from array import array
 from pathlib import Path
 
 _VERSION_PATTERN = re.compile(r'^\d+\.\d+(\.\d+)?$')
 _WHITESPACE_BYTES = frozenset({9, 10, 13, 32})
+_WHITESPACE_DELETE = bytes(sorted(_WHITESPACE_BYTES))
 
+_MURMUR_M = 0x5BD1E995
+_MURMUR_M_INV = pow(_MURMUR_M, -1, 1 << 32)
+_MURMUR_BLOCK_BYTES = 1 << 20  # 纯 Python 实现每次解码的字节数，需为 4 的倍数
 
-def curseforge_fingerprint_from_jar_bytes(file_data: bytes) -> str:
-    filtered_data = bytes(b for b in file_data if b not in _WHITESPACE_BYTES)
-    length = len(filtered_data)
-    if length == 0:
-        return "0"
+try:
+    # 可选的 C 扩展（标准 MurmurHash2），缺失时退回纯 Python 实现
+    from murmurhash2 import murmurhash2 as _native_murmurhash2
+except ImportError:
+    _native_murmurhash2 = None
 
-    m = 0x5BD1E995
-    r = 24
-    h = 1 ^ length
 
-    for i in range(0, length - (length % 4), 4):
-        k = filtered_data[i] | (filtered_data[i + 1] << 8) | (filtered_data[i + 2] << 16) | (filtered_data[i + 3] << 24)
-        k = (k * m) & 0xFFFFFFFF
-        k = (k ^ (k >> r)) & 0xFFFFFFFF
-        k = (k * m) & 0xFFFFFFFF
-        h = (h * m) & 0xFFFFFFFF
-        h = (h ^ k) & 0xFFFFFFFF
-
-    remaining = length % 4
-    if remaining > 0:
-        pos = length - remaining
-        if remaining >= 3:
-            h = (h ^ (filtered_data[pos + 2] << 16)) & 0xFFFFFFFF
-        if remaining >= 2:
-            h = (h ^ (filtered_data[pos + 1] << 8)) & 0xFFFFFFFF
-        if remaining >= 1:
-            h = (h ^ filtered_data[pos]) & 0xFFFFFFFF
+def _murmur2_unshift_xor(h: int, shift: int) -> int:
+    """求 h ^= h >> shift 的逆。"""
+    result = h
+    for _ in range(32 // shift):
+        result = h ^ (result >> shift)
+    return result
+
+
+def _murmur2_unfinalize(h: int) -> int:
+    """撤销 MurmurHash2 末尾的雪崩混合（各步均可逆），还原出中间状态。"""
+    h = _murmur2_unshift_xor(h, 15)
+    h = (h * _MURMUR_M_INV) & 0xFFFFFFFF
+    return _murmur2_unshift_xor(h, 13)
+
+
+def _murmur2_mix_python(h: int, data: bytes) -> int:
+    m = _MURMUR_M
+    for offset in range(0, len(data), _MURMUR_BLOCK_BYTES):
+        # 按块批量解码为小端 uint32，避免逐字节拼接
+        words = array('I')
+        words.frombytes(data[offset:offset + _MURMUR_BLOCK_BYTES])
+        if sys.byteorder == 'big':
+            words.byteswap()
+        for k in words:
+            k = (k * m) & 0xFFFFFFFF
+            k = ((k ^ (k >> 24)) * m) & 0xFFFFFFFF
+            h = ((h * m) & 0xFFFFFFFF) ^ k
+    return h
+
+
+def _murmur2_mix_native(h: int, data: bytes) -> int:
+    # C 实现以 seed ^ len 作为初值；传入 h ^ len 即从状态 h 继续，再撤销其末尾混合
+    # data 长度须为 4 的倍数，此时 C 实现不会处理尾部字节
+    return _murmur2_unfinalize(_native_murmurhash2(data, h ^ len(data)))
+
+
+class Murmur2Stream:
+    """
+    可分块输入的 MurmurHash2，结果与一次性计算完全一致。
+
+    MurmurHash2 的初始状态为 seed ^ 总长度，因此必须在开始前给出输入总字节数。
+    """
+
+    def __init__(self, length: int, seed: int):
+        self._length = length
+        self._fed = 0
+        self._h = (seed ^ length) & 0xFFFFFFFF
+        self._tail = b''
+        self._mix = _murmur2_mix_native if _native_murmurhash2 is not None else _murmur2_mix_python
+
+    def update(self, data: bytes) -> None:
+        self._fed += len(data)
+        if self._tail:
+            data = self._tail + data
+        body = len(data) - (len(data) % 4)
+        if body:
+            self._h = self._mix(self._h, data[:body] if body != len(data) else data)
+        self._tail = data[body:]
+
+    def digest(self) -> int:
+        if self._fed != self._length:
+            raise ValueError(f"MurmurHash2 输入长度不符：声明 {self._length}，实际 {self._fed}")
+        m = _MURMUR_M
+        h = self._h
+        tail = self._tail
+        if tail:
+            if len(tail) >= 3:
+                h ^= tail[2] << 16
+            if len(tail) >= 2:
+                h ^= tail[1] << 8
+            h ^= tail[0]
             h = (h * m) & 0xFFFFFFFF
 
-    h = (h ^ (h >> 13)) & 0xFFFFFFFF
-    h = (h * m) & 0xFFFFFFFF
-    h = (h ^ (h >> 15)) & 0xFFFFFFFF
-    return str(h)
+        h ^= h >> 13
+        h = (h * m) & 0xFFFFFFFF
+        h ^= h >> 15
+        return h
+
+
+def _murmurhash2_python(data: bytes, seed: int) -> int:
+    stream = Murmur2Stream(len(data), seed)
+    stream._mix = _murmur2_mix_python
+    stream.update(data)
+    return stream.digest()
+
+
+def murmurhash2(data: bytes, seed: int) -> int:
+    if _native_murmurhash2 is not None:
+        return _native_murmurhash2(data, seed)
+    return _murmurhash2_python(data, seed)
+
+
+def strip_fingerprint_whitespace(data: bytes) -> bytes:
+    """去除 CurseForge 指纹不计入的空白字节（制表符、换行、回车、空格）。"""
+    return data.translate(None, _WHITESPACE_DELETE)
+
+
+def curseforge_fingerprint_from_jar_bytes(file_data: bytes) -> str:
+    filtered_data = strip_fingerprint_whitespace(file_data)
+    if not filtered_data:
+        return "0"
+    return str(murmurhash2(filtered_data, 1))
 
 
 def jar_mod_fingerprints_and_meta(
@@ -52,6 +136,80 @@ def jar_mod_fingerprints_and_meta(
     return jar_file.name, curseforge_hash, modrinth_hash
 
 
+class JarFileFingerprinter:
+    """
+    对单个 JAR 计算 Modrinth SHA1 与 CurseForge 指纹，不把整个文件读入进程内存。
+
+    文件以只读 mmap 映射（映射失败时退回分块 read），按块遍历：
+    - modrinth_hash()：一趟遍历同时更新 SHA1 并统计去空白后的长度；
+    - curseforge_hash()：按块去空白后送入 Murmur2Stream。
+    MurmurHash2 的初值依赖去空白后的总长度，所以 CurseForge 指纹只能在第一趟之后计算；
+    第二趟读的是同一映射，页面通常仍在系统缓存中，不会再次读盘。
+    调用方可在两趟之间查缓存，命中时完全跳过第二趟。
+    """
+
+    def __init__(self, jar_file: Path, chunk_size: int = 1 << 16):
+        self.jar_file = jar_file
+        self._chunk_size = max(4, chunk_size - (chunk_size % 4))
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._size = 0
+        self._modrinth_hash: str | None = None
+        self._filtered_length: int | None = None
+
+    def __enter__(self) -> JarFileFingerprinter:
+        self._file = open(self.jar_file, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self._size:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                logging.debug("无法映射 JAR，改为分块读取: %s — %s", self.jar_file, e)
+                self._map = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _iter_chunks(self):
+        size, step = self._size, self._chunk_size
+        if self._map is not None:
+            for offset in range(0, size, step):
+                yield self._map[offset:offset + step]
+            return
+        self._file.seek(0)
+        while True:
+            chunk = self._file.read(step)
+            if not chunk:
+                break
+            yield chunk
+
+    def modrinth_hash(self) -> str:
+        if self._modrinth_hash is None:
+            sha1 = hashlib.sha1()
+            filtered_length = 0
+            for chunk in self._iter_chunks():
+                sha1.update(chunk)
+                filtered_length += len(chunk.translate(None, _WHITESPACE_DELETE))
+            self._modrinth_hash = sha1.hexdigest()
+            self._filtered_length = filtered_length
+        return self._modrinth_hash
+
+    def curseforge_hash(self) -> str:
+        self.modrinth_hash()
+        if not self._filtered_length:
+            return "0"
+        stream = Murmur2Stream(self._filtered_length, 1)
+        for chunk in self._iter_chunks():
+            stream.update(chunk.translate(None, _WHITESPACE_DELETE))
+        return str(stream.digest())
+
+
 def is_version_string(value: str) -> bool:
     return bool(_VERSION_PATTERN.match(value.strip()))
 
@@ -4,6 +4,7 @@ import re
 import requests
 
 from utils import config_manager
+from utils.http_client import http_client
 from utils.retry_logic import api_retry
 from utils.api_urls import MODRINTH_API_BASE, CURSEFORGE_API_BASE
 
@@ -37,25 +38,32 @@ def _extract_loaders(game_versions: list) -> str:
 
 class ModrinthClient:
 
+    def __init__(self, base_url: str = MODRINTH_API_BASE):
+        self.base_url = base_url.rstrip('/')
+
     @api_retry(max_retries=3, initial_delay=1.0, max_delay=30.0)
     def fetch_version_files(self, modrinth_hashes: list[str]) -> dict:
-        url = f"{MODRINTH_API_BASE}/version_files"
+        url = f"{self.base_url}/version_files"
         headers = {"Content-Type": "application/json"}
         data = {"hashes": modrinth_hashes, "algorithm": "sha1"}
         logging.info(f"从Modrinth API获取 {len(modrinth_hashes)} 个模组的信息...")
-        response = requests.post(url, json=data, headers=headers, timeout=30)
+        response = http_client.post(url, json=data, headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()
 
     @api_retry(max_retries=3, initial_delay=1.0, max_delay=30.0)
     def fetch_projects(self, project_ids: list[str]) -> list[dict]:
         ids_str = ','.join([f'"{pid}"' for pid in project_ids])
-        url = f"{MODRINTH_API_BASE}/projects?ids=[{ids_str}]"
-        response = requests.get(url, timeout=30)
+        url = f"{self.base_url}/projects?ids=[{ids_str}]"
+        response = http_client.get(url, timeout=30)
         response.raise_for_status()
         return response.json()
 
     def get_mod_info(self, modrinth_hashes: list[str]) -> dict[str, dict]:
+        return self.query_mod_info(modrinth_hashes) or {}
+
+    def query_mod_info(self, modrinth_hashes: list[str]) -> dict[str, dict] | None:
+        """与 get_mod_info 相同，但请求失败时返回 None，以便与「确实无匹配」区分。"""
         if not modrinth_hashes:
             return {}
 
@@ -111,11 +119,15 @@ class ModrinthClient:
             return result
         except Exception as e:
             logging.error(f"从Modrinth获取模组信息失败: {e}")
-            return {}
+            return None
 
 
 class CurseForgeClient:
 
+    def __init__(self, base_url: str = CURSEFORGE_API_BASE, api_key: str | None = None):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+
     @api_retry(max_retries=3, initial_delay=1.0, max_delay=30.0)
     def fetch_fingerprints(self, base_url: str, curseforge_hashes: list[str], api_key: str) -> dict:
         headers = {
@@ -125,7 +137,7 @@ class CurseForgeClient:
         fingerprint_url = f"{base_url}/v1/fingerprints/432"
         data = {"fingerprints": [int(h) for h in curseforge_hashes]}
         logging.info(f"从CurseForge API ({base_url})获取 {len(curseforge_hashes)} 个模组的信息...")
-        response = requests.post(fingerprint_url, json=data, headers=headers, timeout=30)
+        response = http_client.post(fingerprint_url, json=data, headers=headers, timeout=30)
 
         if response.status_code == 403:
             logging.error("CurseForge API密钥无效或已过期，请在设置中更新API密钥")
@@ -145,7 +157,7 @@ class CurseForgeClient:
         }
         url = f"{base_url}/v1/mods"
         data = {"modIds": project_ids}
-        response = requests.post(url, json=data, headers=headers, timeout=30)
+        response = http_client.post(url, json=data, headers=headers, timeout=30)
         response.raise_for_status()
         response_data = response.json()
         return response_data.get("data", [])
@@ -177,18 +189,25 @@ class CurseForgeClient:
         return hash_to_project_id, hash_to_game_version, hash_to_loaders
 
     def get_mod_info(self, curseforge_hashes: list[str]) -> dict[str, dict]:
+        return self.query_mod_info(curseforge_hashes) or {}
+
+    def query_mod_info(self, curseforge_hashes: list[str]) -> dict[str, dict] | None:
+        """与 get_mod_info 相同，但未配置密钥或请求失败时返回 None，以便与「确实无匹配」区分。"""
         if not curseforge_hashes:
             return {}
 
         try:
-            config = config_manager.load_config()
-            api_key = config.get('curseforge_api_key', '')
+            api_key = self.api_key
+            if api_key is None:
+                config = config_manager.load_config()
+                api_key = config.get('curseforge_api_key', '')
 
             if not api_key:
                 logging.warning("CurseForge API密钥未配置，请在设置中配置")
-                return {}
+                return None
 
-            base_urls = [CURSEFORGE_API_BASE]
+            base_urls = [self.base_url]
+            succeeded = False
 
             exact_matches: list[dict] = []
             hash_to_project_id: dict[str, int] = {}
@@ -226,16 +245,20 @@ class CurseForgeClient:
                                         "slug": project.get("slug"),
                                         "url": f"https://www.curseforge.com/minecraft/mc-mods/{project.get('slug')}"
                                     }
-                        break
+                    succeeded = True
+                    break
                 except requests.exceptions.HTTPError as e:
                     if "API密钥无效" in str(e) or "请求频率超限" in str(e):
-                        return {}
+                        return None
                     logging.error(f"从CurseForge API ({base_url})获取模组信息失败: {e}")
                     continue
                 except Exception as e:
                     logging.error(f"从CurseForge API ({base_url})获取模组信息失败: {e}")
                     continue
 
+            if not succeeded:
+                return None
+
             if not exact_matches:
                 return {}
 
@@ -250,4 +273,4 @@ class CurseForgeClient:
             return result
         except Exception as e:
             logging.error(f"从CurseForge获取模组信息失败: {e}")
-            return {}
+            return None
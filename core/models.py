@@ -1,9 +1,13 @@
 from __future__ import annotations
 import re
+import sys
 import threading
+import zlib
+from collections.abc import Iterator, Mapping
 from typing import Any, Callable
 from dataclasses import dataclass, field
-from collections import defaultdict, Counter
+from collections import defaultdict
+from functools import lru_cache
 from packaging.version import parse as parse_version
 
 JSON_KEY_VALUE_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL)
@@ -22,32 +26,60 @@ class TranslationSource:
     AI_TRANSLATION = "AI翻译"
 
 
+_VERSION_ZERO = parse_version("0.0.0")
+
+
+@lru_cache(maxsize=4096)
+def _parse_candidate_version(version: str):
+    # 社区词典中不同的版本号只有数百个，缓存解析结果
+    try:
+        return parse_version(version)
+    except Exception:
+        return _VERSION_ZERO
+
+
+def _candidate_version_key(candidate: dict):
+    try:
+        return _parse_candidate_version(candidate["version"])
+    except Exception:
+        return _VERSION_ZERO
+
+
 def resolve_origin_name_conflict(candidates: list[dict]) -> str | None:
+    """同一原文有多个译名时：取出现次数最多者；并列时取版本最高者，版本相同取先出现者。"""
     if not candidates:
         return None
     if len(candidates) == 1:
         return candidates[0]["trans"]
 
-    trans_counts = Counter(c["trans"] for c in candidates)
+    trans_counts: dict[str, int] = {}
+    for c in candidates:
+        trans = c["trans"]
+        trans_counts[trans] = trans_counts.get(trans, 0) + 1
+    if len(trans_counts) == 1:
+        return candidates[0]["trans"]
     max_freq = max(trans_counts.values())
     top_candidates = [c for c in candidates if trans_counts[c["trans"]] == max_freq]
 
     if len(top_candidates) == 1:
         return top_candidates[0]["trans"]
 
-    def get_version_key(candidate):
-        try:
-            return parse_version(candidate["version"])
-        except Exception:
-            return parse_version("0.0.0")
-
     try:
-        sorted_by_version = sorted(top_candidates, key=get_version_key, reverse=True)
-        return sorted_by_version[0]["trans"]
+        return max(top_candidates, key=_candidate_version_key)["trans"]
     except Exception:
         return top_candidates[0]["trans"]
 
-@dataclass
+
+def resolve_origin_name_conflicts(items: list[tuple[str, list[dict]]]) -> list[tuple[str, str]]:
+    """批量解析 (原文, 候选译名) ，只返回有结果的 (原文, 译名)；可在子进程中执行。"""
+    resolved = []
+    for origin, candidates in items:
+        translation = resolve_origin_name_conflict(candidates)
+        if translation is not None:
+            resolved.append((origin, translation))
+    return resolved
+
+@dataclass(slots=True)
 class LanguageEntry:
     key: str
     en: str
@@ -55,12 +87,144 @@ class LanguageEntry:
     source: str | None = None
     namespace: str = "minecraft"
 
+
+class LanguageTable(Mapping):
+    """
+    单个命名空间的紧凑条目表，可当作只读的 dict[str, LanguageEntry] 使用。
+
+    只按列保存 键 → 英文 / 键 → 中文，命名空间在表上保存一次；键经 sys.intern 去重，
+    使英文表、自带中文表与后续工作台数据共用同一个键对象。LanguageEntry 在访问时才构造。
+    """
+    __slots__ = ('namespace', '_en', '_zh')
+
+    def __init__(self, namespace: str):
+        self.namespace = sys.intern(namespace)
+        self._en: dict[str, str] = {}
+        self._zh: dict[str, str] = {}
+
+    def add(self, key: str, en: str, zh: str | None = None) -> None:
+        key = sys.intern(key)
+        self._en[key] = en
+        if zh is not None:
+            self._zh[key] = zh
+        else:
+            self._zh.pop(key, None)
+
+    def __setitem__(self, key: str, entry: LanguageEntry) -> None:
+        self.add(key, entry.en, entry.zh)
+
+    def get_en(self, key: str, default: str | None = None) -> str | None:
+        return self._en.get(key, default)
+
+    def en_items(self):
+        """(键, 英文) 视图，不构造 LanguageEntry。"""
+        return self._en.items()
+
+    def columns(self) -> tuple[dict[str, str], dict[str, str]]:
+        """返回内部的 (键 → 英文, 键 → 中文) 两列，调用方只读不写。"""
+        return self._en, self._zh
+
+    def __getitem__(self, key: str) -> LanguageEntry:
+        return LanguageEntry(key=key, en=self._en[key], zh=self._zh.get(key), namespace=self.namespace)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._en
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._en)
+
+    def __len__(self) -> int:
+        return len(self._en)
+
+    def items(self):
+        namespace, zh = self.namespace, self._zh
+        return [
+            (key, LanguageEntry(key=key, en=en, zh=zh.get(key), namespace=namespace))
+            for key, en in self._en.items()
+        ]
+
+    def values(self):
+        return [entry for _, entry in self.items()]
+
+    def __repr__(self) -> str:
+        return f"LanguageTable({self.namespace!r}, {len(self._en)} 条)"
+
+
+class CompressedTextDict(dict):
+    """
+    值为长文本（原始语言文件内容）的 dict：内部以 zlib 压缩保存，读取时才解压。
+
+    行为与 dict[str, str] 一致（取值、items/values、json 序列化、拷贝、pickle 均得到原文），
+    用于 ExtractionResult.raw_english_files，避免整个会话期间常驻全部原文。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, zlib.compress(value.encode('utf-8'), 1))
+
+    def __getitem__(self, key: str) -> str:
+        return zlib.decompress(super().__getitem__(key)).decode('utf-8')
+
+    def __iter__(self):
+        # 覆盖 __iter__ 使 dict(x) / {**x} 走 keys() + __getitem__，而不是直接复制压缩数据
+        return super().__iter__()
+
+    def get(self, key: str, default=None):
+        if super().__contains__(key):
+            return self[key]
+        return default
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: str = '') -> str:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default):
+        if super().__contains__(key):
+            value = self[key]
+            super().__delitem__(key)
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def items(self):
+        return [(key, self[key]) for key in super().__iter__()]
+
+    def values(self):
+        return [self[key] for key in super().__iter__()]
+
+    def copy(self) -> CompressedTextDict:
+        clone = CompressedTextDict()
+        for key in super().__iter__():
+            dict.__setitem__(clone, key, super().__getitem__(key))
+        return clone
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, dict):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CompressedTextDict({len(self)} 个文件)"
+
+    def __reduce__(self):
+        return (CompressedTextDict, (self.items(),))
+
 @dataclass
 class NamespaceInfo:
     name: str
     jar_name: str = "Unknown"
     file_format: str = "json"
-    raw_content: str = ""
 
 @dataclass
 class DictionaryEntry:
@@ -76,7 +240,7 @@ class ExtractionResult:
     internal_chinese: dict[str, dict[str, LanguageEntry]] = field(default_factory=lambda: defaultdict(dict))
     pack_chinese: dict[str, str] = field(default_factory=dict)
     namespace_info: dict[str, NamespaceInfo] = field(default_factory=dict)
-    raw_english_files: dict[str, str] = field(default_factory=dict)
+    raw_english_files: dict[str, str] = field(default_factory=CompressedTextDict)
     module_names: list[dict[str, str]] = field(default_factory=list)
     curseforge_names: list[dict[str, str]] = field(default_factory=list)
     modrinth_names: list[dict[str, str]] = field(default_factory=list)
@@ -86,6 +250,18 @@ class TranslationResult:
     workbench_data: dict[str, dict[str, LanguageEntry]] = field(default_factory=lambda: defaultdict(dict))
     source_counts: dict[str, int] = field(default_factory=dict)
     total_entries: int = 0
+    incremental: bool = False
+    changes: list[DecisionChange] = field(default_factory=list)
+    # 增量决策的变化报告：先按命名空间汇总，再逐条列出变化，每行一条
+    change_report: list[str] = field(default_factory=list)
+
+@dataclass(slots=True)
+class DecisionChange:
+    """增量决策中结果发生变化的条目；before 为 None 表示新增，after 为 None 表示已移除。"""
+    namespace: str
+    key: str
+    before: LanguageEntry | None
+    after: LanguageEntry | None
 
 @dataclass
 class PackSettings:
@@ -122,6 +298,21 @@ class ZipFileResult:
     def empty() -> ZipFileResult:
         return ZipFileResult()
 
+    def to_row(self) -> tuple:
+        return (self.namespace, self.file_format, self.content, self.extracted_data, self.is_english, self.is_chinese)
+
+    @staticmethod
+    def from_row(row) -> ZipFileResult:
+        namespace, file_format, content, extracted_data, is_english, is_chinese = row
+        return ZipFileResult(
+            namespace=namespace,
+            file_format=file_format,
+            content=content,
+            extracted_data=extracted_data,
+            is_english=is_english,
+            is_chinese=is_chinese,
+        )
+
 @dataclass
 class TranslationContext:
     user_dict_by_key: dict[str, str] = field(default_factory=dict)
@@ -3,7 +3,7 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from core.workflow import Workflow
-from core.models import PackSettings, ExtractionResult, NamespaceInfo, TranslationResult, LanguageEntry, TranslationSource
+from core.models import PackSettings, ExtractionResult, NamespaceInfo, TranslationResult, LanguageEntry, TranslationSource, CompressedTextDict
 from core.exceptions import ConfigurationError, ExtractionError, TranslationError, BuildError
 from core.data_transformer import build_workbench_data, build_name_lookup, resolve_mod_metadata
 
@@ -140,6 +140,8 @@ class Orchestrator:
             self.log("阶段 1/3: 开始聚合语言数据...", "INFO")
             self.update_progress("正在聚合数据...", 10)
             self._validate_translation_config()
+            # 词典加载与数据提取重叠进行
+            self.workflow.prefetch_dictionaries(self.settings)
 
             extraction_progress = self._create_extraction_progress_callback()
             context = self._create_workflow_context(extraction_progress)
@@ -256,8 +258,7 @@ class Orchestrator:
             for ns, fmt in self.namespace_formats.items():
                 extraction_result.namespace_info[ns] = NamespaceInfo(
                     name=ns,
-                    file_format=fmt,
-                    raw_content=self.raw_english_files.get(ns, '')
+                    file_format=fmt
                 )
 
             translation_result = TranslationResult()
@@ -300,7 +301,7 @@ class Orchestrator:
                 return
             self.log("从存档文件加载数据并启动工作台...", "INFO")
             self.update_progress("正在加载项目...", 10)
-            self.raw_english_files = self.save_data.get('raw_english_files', {})
+            self.raw_english_files = CompressedTextDict(self.save_data.get('raw_english_files', {}))
             self.namespace_formats = self.save_data.get('namespace_formats', {})
             self.module_names = self.save_data.get('module_names', [])
             self.curseforge_names = self.save_data.get('curseforge_names', [])
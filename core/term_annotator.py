@@ -0,0 +1,177 @@
+"""
+项目级术语标注：在后台一次性为项目的全部英文条目计算术语命中（个人词典 + 术语库）。
+
+个人词典命中与术语库命中分开缓存：
+- 术语库命中按术语库修订号缓存，术语库变化后整体失效；
+- 个人词典命中记录计算时的保存计数。保存计数前进后，只有文本中出现了其间增删改过的原文的条目
+  才重新匹配，其余条目沿用原结果；添加一个词条不会让整个项目重新标注。
+工作台术语提示与其他需要术语命中的地方通过 hits_for 读取，不必逐条重新扫描。
+
+术语匹配是纯 Python 计算，标注在单个后台线程中依次进行，只是不阻塞界面线程。
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterable, Mapping
+
+from core.dictionary_service import dictionary_service
+from core.term_database import TermDatabase
+from core.term_matcher import TermMatcher
+from utils import config_manager
+
+TermHits = list[dict[str, Any]]
+
+
+def entry_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=12).hexdigest()
+
+
+class TermAnnotator:
+
+    def __init__(self, term_db: TermDatabase | None = None):
+        self.term_db = term_db or TermDatabase()
+        self._lock = threading.Lock()
+        # 条目摘要 → (计算时的个人词典保存计数, 个人词典命中)
+        self._user_hits: dict[str, tuple[int, TermHits]] = {}
+        # 条目摘要 → 术语库命中；只保留 _glossary_revision 这一版术语库的结果
+        self._glossary_hits: dict[str, TermHits] = {}
+        self._glossary_revision: int | None = None
+        # (起始保存计数, 目标保存计数, 其间变更原文的自动机)；变更记录不完整时自动机为 None
+        self._changes_matcher: tuple[int, int, TermMatcher[str] | None] | None = None
+        # 当前后台标注的取消标志；每次标注使用新的标志，取消时不必等待旧线程结束
+        self._cancel_event = threading.Event()
+
+    def revision(self) -> tuple[int, int]:
+        return self.term_db.revision, config_manager.user_dict_generation()
+
+    def _matcher_for_changes(self, since: int, until: int) -> TermMatcher[str] | None:
+        with self._lock:
+            cached = self._changes_matcher
+            if cached is not None and cached[:2] == (since, until):
+                return cached[2]
+        origins = dictionary_service.user_origin_changes(since, until)
+        matcher = None if origins is None else TermMatcher((origin, origin) for origin in origins)
+        with self._lock:
+            self._changes_matcher = (since, until, matcher)
+        return matcher
+
+    def _user_part(self, text: str, digest: str, generation: int, compute: bool = True) -> tuple[TermHits | None, bool]:
+        """返回 (个人词典命中, 是否重新计算)；compute 为 False 且需要重新计算时命中为 None。"""
+        with self._lock:
+            cached = self._user_hits.get(digest)
+        if cached is not None:
+            cached_generation, hits = cached
+            if cached_generation == generation:
+                return hits, False
+            if cached_generation < generation:
+                matcher = self._matcher_for_changes(cached_generation, generation)
+                if matcher is not None and not matcher.find(text):
+                    # 其间变更的原文都不在文本中，命中不变
+                    with self._lock:
+                        self._user_hits[digest] = (generation, hits)
+                    return hits, False
+        if not compute:
+            return None, False
+        hits = self.term_db.find_user_dict_terms(text)
+        with self._lock:
+            current = self._user_hits.get(digest)
+            if current is None or current[0] <= generation:
+                self._user_hits[digest] = (generation, hits)
+        return hits, True
+
+    def _glossary_part(self, text: str, digest: str, revision: int, compute: bool = True) -> tuple[TermHits | None, bool]:
+        """返回 (术语库命中, 是否重新计算)；compute 为 False 且未缓存时命中为 None。"""
+        with self._lock:
+            if self._glossary_revision is None or revision > self._glossary_revision:
+                self._glossary_hits = {}
+                self._glossary_revision = revision
+            hits = self._glossary_hits.get(digest) if revision == self._glossary_revision else None
+        if hits is not None or not compute:
+            return hits, False
+        hits = self.term_db.find_glossary_terms(text)
+        with self._lock:
+            # 计算期间术语又有变化时结果已过期，不写入缓存
+            if revision == self._glossary_revision == self.term_db.revision:
+                self._glossary_hits[digest] = hits
+        return hits, True
+
+    def cached_hits(self, text: str) -> TermHits | None:
+        """已标注时返回命中列表，尚未标注（或相关术语已变化）时返回 None。"""
+        if not text:
+            return []
+        revision, generation = self.revision()
+        digest = entry_hash(text)
+        glossary_hits, _ = self._glossary_part(text, digest, revision, compute=False)
+        if glossary_hits is None:
+            return None
+        user_hits, _ = self._user_part(text, digest, generation, compute=False)
+        if user_hits is None:
+            return None
+        return TermDatabase.merge_term_hits(user_hits, glossary_hits)
+
+    def hits_for(self, text: str) -> TermHits:
+        """返回文本的术语命中；未命中缓存时当场计算并写入缓存。"""
+        return self._refresh(text)[0]
+
+    def _refresh(self, text: str) -> tuple[TermHits, bool]:
+        if not text:
+            return [], False
+        revision, generation = self.revision()
+        digest = entry_hash(text)
+        glossary_hits, glossary_computed = self._glossary_part(text, digest, revision)
+        user_hits, user_computed = self._user_part(text, digest, generation)
+        return TermDatabase.merge_term_hits(user_hits, glossary_hits), glossary_computed or user_computed
+
+    def annotate(self, texts_by_namespace: Mapping[str, Iterable[str]], cancel_event: threading.Event | None = None) -> int:
+        """
+        为各命名空间的全部英文条目计算术语命中，返回重新计算的条目数。
+
+        结果仍有效的条目跳过；cancel_event 被设置时提前结束。
+        """
+        cancel_event = cancel_event or threading.Event()
+        texts = [text for group in texts_by_namespace.values() for text in group if text]
+        if not texts:
+            return 0
+        # 自动机在这里先建好，首次匹配不必单独计时
+        self.term_db.warm_up()
+
+        start = time.perf_counter()
+        computed = 0
+        for text in texts:
+            if cancel_event.is_set():
+                break
+            computed += self._refresh(text)[1]
+        state = "已取消" if cancel_event.is_set() else "完成"
+        logging.info(f"项目术语标注{state}：共 {len(texts)} 条，重新标注 {computed} 条，用时 {time.perf_counter() - start:.2f} 秒")
+        return computed
+
+    def annotate_in_background(
+        self,
+        texts_by_namespace: Mapping[str, Iterable[str]],
+        on_complete: Callable[[int], None] | None = None,
+    ) -> threading.Thread:
+        """在后台线程中运行 annotate；已有标注在运行时先取消它。"""
+        self.cancel()
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+        # 先复制条目文本，后台线程不再访问调用方的数据结构
+        snapshot = {ns: [text for text in texts if text] for ns, texts in texts_by_namespace.items()}
+
+        def run():
+            try:
+                computed = self.annotate(snapshot, cancel_event=cancel_event)
+                if on_complete is not None:
+                    on_complete(computed)
+            except Exception as e:
+                logging.warning(f"项目术语标注失败: {e}")
+
+        thread = threading.Thread(target=run, daemon=True, name="TermAnnotation")
+        thread.start()
+        return thread
+
+    def cancel(self) -> None:
+        """请求停止后台标注；正在匹配的条目完成后线程即退出。"""
+        self._cancel_event.set()
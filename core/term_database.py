@@ -1,18 +1,41 @@
 from __future__ import annotations
 import json
 import logging
-import time
+import sqlite3
 import uuid
 import threading
 from pathlib import Path
 from datetime import datetime
-import re
 import csv
 from typing import Any
 
+from core.dictionary_service import dictionary_service
+from core.term_matcher import TermMatcher
+
+TERM_DATABASE_DB_PATH = Path("term_database.db")
+# 旧版 JSON 术语库，首次创建数据库时迁移
 TERM_DATABASE_PATH = Path("term_database.json")
+TERM_DATABASE_SCHEMA_VERSION = 1
+
+_UPSERT_SQL = (
+    "INSERT INTO terms (id, original, original_lower, translation, comment, created_at, updated_at)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(id) DO UPDATE SET original = excluded.original, original_lower = excluded.original_lower,"
+    " translation = excluded.translation, comment = excluded.comment,"
+    " created_at = excluded.created_at, updated_at = excluded.updated_at"
+)
+
 
-_WORD_RE = re.compile(r'\b[a-zA-Z0-9_]+\b')
+def _term_row(term: dict[str, Any]) -> tuple:
+    return (
+        term["id"],
+        term["original"],
+        term["original"].lower(),
+        json.dumps(term.get("translation", []), ensure_ascii=False),
+        term.get("comment", ""),
+        term.get("created_at", ""),
+        term.get("updated_at", ""),
+    )
 
 
 class ImportMode:
@@ -141,6 +164,14 @@ class FormatProcessorRegistry:
 
 
 class TermDatabase:
+    """
+    术语库：持久化在 SQLite (term_database.db)，每个术语一行。
+
+    - 启动时只打开连接，术语与索引在首次使用时一次性载入；
+    - 增删改直接维护内存索引，改动的行记入待写集合，由 save_terms 在一个事务中批量写入；
+      批量添加与导入只提交一次；
+    - 首次创建数据库时自动迁移旧版 term_database.json。
+    """
     _instance: TermDatabase | None = None
     _init_lock = threading.Lock()
 
@@ -156,151 +187,257 @@ class TermDatabase:
         if self._initialized:
             return
 
-        self.terms: list[dict[str, Any]] = []
-        self.terms_by_length: dict[int, list[dict[str, Any]]] = {}
-        self.term_regex_cache: dict[str, re.Pattern] = {}
-        self.term_set: set[str] = set()
-        self._original_index: dict[str, dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._loaded = False
+        # id → 术语，按写入顺序排列，同时作为术语列表
         self._id_index: dict[str, dict[str, Any]] = {}
-        self._user_dict_cache: dict[str, str] | None = None
-        self._user_dict_cache_time: float = 0.0
-        self._user_dict_cache_ttl: float = 30.0
+        # 小写原文 → 同名术语（旧数据中可能有多个），按写入顺序排列，查找时取最后一个
+        self._original_index: dict[str, list[dict[str, Any]]] = {}
+        # 尚未写入数据库的改动
+        self._dirty: dict[str, dict[str, Any]] = {}
+        self._deleted: set[str] = set()
+        self._clear_pending = False
+        # 术语库的 Aho-Corasick 自动机，术语变化后置空，首次匹配时按当前术语构建
+        self._term_matcher: TermMatcher[dict[str, Any]] | None = None
+        self._matcher_lock = threading.Lock()
+        # 术语修订号：术语每次变化加一，供自动机与外部缓存判断术语库是否已变化
+        self._revision = 0
 
         self.validator = TermValidator()
         self.format_registry = FormatProcessorRegistry()
 
-        self.load_terms()
         self._initialized = True
 
-    def _build_indexes(self):
-        self.terms_by_length.clear()
-        self.term_regex_cache.clear()
-        self.term_set.clear()
-        self._original_index.clear()
-        self._id_index.clear()
-
-        for term in self.terms:
-            original = term["original"]
-            length = len(original)
-            if length not in self.terms_by_length:
-                self.terms_by_length[length] = []
-            self.terms_by_length[length].append(term)
-            self.term_set.add(original)
-            self._original_index[original.lower()] = term
-            self._id_index[term["id"]] = term
-
-        for length in self.terms_by_length:
-            self.terms_by_length[length].sort(key=lambda x: (-len(x["original"]), x["original"]))
-
-        logging.debug(f"术语索引构建完成，共 {len(self.terms)} 个术语，{len(self.terms_by_length)} 个长度分组")
-
-    def _get_user_dict_origin_terms(self) -> dict[str, str]:
-        current_time = time.time()
-        if self._user_dict_cache is not None and (current_time - self._user_dict_cache_time) < self._user_dict_cache_ttl:
-            return self._user_dict_cache
-        from utils import config_manager
-        user_dict = config_manager.load_user_dict()
-        self._user_dict_cache = user_dict.get("by_origin_name", {})
-        self._user_dict_cache_time = current_time
-        return self._user_dict_cache
-
-    def invalidate_user_dict_cache(self):
-        self._user_dict_cache = None
-        self._user_dict_cache_time = 0.0
-
-    def load_terms(self):
+    @property
+    def terms(self) -> list[dict[str, Any]]:
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._id_index.values())
+
+    def _connection(self) -> sqlite3.Connection:
+        # 调用方需持有 self._lock
+        if self._conn is not None:
+            return self._conn
+        conn = sqlite3.connect(TERM_DATABASE_DB_PATH, check_same_thread=False)
         try:
-            if TERM_DATABASE_PATH.exists():
-                with open(TERM_DATABASE_PATH, 'r', encoding='utf-8') as f:
-                    self.terms = json.load(f)
-
-                migrated = False
-                for term in self.terms:
-                    if isinstance(term.get("translation"), str):
-                        term["translation"] = [term["translation"]]
-                        migrated = True
-
-                if migrated:
-                    if self.terms:
-                        self.save_terms()
-                    logging.debug("术语库数据格式已迁移到多译文格式")
-
-                logging.debug(f"成功加载术语库，共 {len(self.terms)} 个术语")
-                self._build_indexes()
-            else:
-                self.terms = []
-                self._build_indexes()
-        except Exception as e:
-            logging.error(f"加载术语库失败: {e}")
-            self.terms = []
-
-    def save_terms(self):
-        if not self.terms:
-            if TERM_DATABASE_PATH.exists():
-                try:
-                    TERM_DATABASE_PATH.unlink()
-                    logging.debug("术语库文件已删除，因为术语列表为空")
-                except Exception as e:
-                    logging.error(f"删除空术语库文件失败: {e}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS terms ("
+                    " id TEXT PRIMARY KEY,"
+                    " original TEXT NOT NULL,"
+                    " original_lower TEXT NOT NULL,"
+                    " translation TEXT NOT NULL,"
+                    " comment TEXT NOT NULL DEFAULT '',"
+                    " created_at TEXT NOT NULL DEFAULT '',"
+                    " updated_at TEXT NOT NULL DEFAULT '')"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_terms_original_lower ON terms(original_lower)")
+                if version < TERM_DATABASE_SCHEMA_VERSION:
+                    self._migrate_json(conn)
+                    conn.execute(f"PRAGMA user_version = {TERM_DATABASE_SCHEMA_VERSION}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate_json(conn: sqlite3.Connection) -> None:
+        if not TERM_DATABASE_PATH.exists():
             return
-
         try:
-            with open(TERM_DATABASE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.terms, f, ensure_ascii=False, indent=4)
-            logging.debug(f"成功保存术语库，共 {len(self.terms)} 个术语")
+            with open(TERM_DATABASE_PATH, 'r', encoding='utf-8') as f:
+                legacy_terms = json.load(f)
         except Exception as e:
-            logging.error(f"保存术语库失败: {e}")
+            logging.error(f"读取旧版术语库失败，跳过迁移: {e}")
+            return
+        rows = []
+        for term in legacy_terms:
+            if not isinstance(term, dict) or not term.get("original"):
+                continue
+            if isinstance(term.get("translation"), str):
+                term["translation"] = [term["translation"]]
+            term.setdefault("id", str(uuid.uuid4())[:8])
+            rows.append(_term_row(term))
+        conn.executemany(_UPSERT_SQL, rows)
+        logging.info(f"已将旧版术语库 {TERM_DATABASE_PATH} 迁移到 {TERM_DATABASE_DB_PATH}，共 {len(rows)} 个术语")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self.load_terms()
+
+    def _index_term(self, term: dict[str, Any]) -> None:
+        self._id_index[term["id"]] = term
+        self._original_index.setdefault(term["original"].lower(), []).append(term)
+        self._terms_changed()
+
+    def _unindex_term(self, term: dict[str, Any]) -> None:
+        self._id_index.pop(term["id"], None)
+        original_lower = term["original"].lower()
+        same_original = self._original_index.get(original_lower)
+        if same_original is not None:
+            remaining = [t for t in same_original if t is not term]
+            if remaining:
+                self._original_index[original_lower] = remaining
+            else:
+                del self._original_index[original_lower]
+        self._terms_changed()
+
+    def _lookup_original(self, original: str) -> dict[str, Any] | None:
+        # 调用方需已载入术语
+        same_original = self._original_index.get(original.lower())
+        return same_original[-1] if same_original else None
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def _terms_changed(self) -> None:
+        self._revision += 1
+        self._term_matcher = None
+
+    def _mark_dirty(self, term: dict[str, Any]) -> None:
+        self._dirty[term["id"]] = term
+        self._deleted.discard(term["id"])
+
+    def _get_term_matcher(self) -> TermMatcher[dict[str, Any]]:
+        self._ensure_loaded()
+        with self._matcher_lock:
+            matcher = self._term_matcher
+            if matcher is None:
+                revision = self._revision
+                matcher = TermMatcher((term["original"], term) for term in self.terms)
+                # 构建期间术语又有变化时不缓存，下次按新术语重建
+                if revision == self._revision:
+                    self._term_matcher = matcher
+            return matcher
+
+    def warm_up(self) -> None:
+        """预先载入术语并构建个人词典与术语库的自动机，供后台批量匹配前调用。"""
+        dictionary_service.match_user_terms("")
+        self._get_term_matcher()
+
+    def invalidate_user_dict_cache(self):
+        # 个人词典由共享服务常驻内存，收到变更通知后自动更新；这里只在需要时强制重新载入
+        dictionary_service.invalidate_user_dictionary()
+
+    def load_terms(self):
+        with self._lock:
+            self._id_index.clear()
+            self._original_index.clear()
+            self._dirty.clear()
+            self._deleted.clear()
+            self._clear_pending = False
+            self._terms_changed()
+            try:
+                rows = self._connection().execute(
+                    "SELECT id, original, translation, comment, created_at, updated_at FROM terms ORDER BY rowid"
+                ).fetchall()
+                for term_id, original, translation, comment, created_at, updated_at in rows:
+                    self._index_term({
+                        "id": term_id,
+                        "original": original,
+                        "translation": json.loads(translation),
+                        "comment": comment,
+                        "created_at": created_at,
+                        "updated_at": updated_at
+                    })
+                logging.debug(f"成功加载术语库，共 {len(self._id_index)} 个术语")
+            except Exception as e:
+                logging.error(f"加载术语库失败: {e}")
+                self._id_index.clear()
+                self._original_index.clear()
+            self._loaded = True
+
+    def save_terms(self) -> bool:
+        """
+        把待写的改动在一个事务中写入数据库，返回是否已全部写入。
+
+        写入失败时事务整体回滚，待写集合原样保留，下一次保存时连同新的改动一起重试。
+        """
+        with self._lock:
+            if not (self._dirty or self._deleted or self._clear_pending):
+                return True
+            try:
+                conn = self._connection()
+                with conn:
+                    if self._clear_pending:
+                        conn.execute("DELETE FROM terms")
+                    if self._deleted:
+                        conn.executemany("DELETE FROM terms WHERE id = ?", ((term_id,) for term_id in self._deleted))
+                    if self._dirty:
+                        conn.executemany(_UPSERT_SQL, (_term_row(term) for term in self._dirty.values()))
+                logging.debug(f"成功保存术语库，写入 {len(self._dirty)} 个、删除 {len(self._deleted)} 个术语")
+                self._dirty.clear()
+                self._deleted.clear()
+                self._clear_pending = False
+                return True
+            except Exception as e:
+                logging.error(f"保存术语库失败，改动保留在内存中，下次保存时重试: {e}")
+                return False
 
     def add_term(self, original: str, translation: str, comment: str = "", save_now: bool = True) -> dict[str, Any]:
+        self._ensure_loaded()
         original = original.strip()
         translation = translation.strip()
         comment = comment.strip()
 
-        existing_term = self._original_index.get(original.lower())
-
-        if existing_term:
-            if translation not in existing_term["translation"]:
-                existing_term["translation"].append(translation)
-                existing_term["updated_at"] = datetime.now().isoformat()
-                if save_now:
-                    self.save_terms()
-                    self._build_indexes()
-                logging.debug(f"向现有术语添加译文: {original} -> {translation}")
-            return existing_term
-
-        term = {
-            "id": self._generate_term_id(),
-            "original": original,
-            "translation": [translation],
-            "comment": comment,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-        self.terms.append(term)
-        if save_now:
-            self.save_terms()
-            self._build_indexes()
+        with self._lock:
+            existing_term = self._lookup_original(original)
+
+            if existing_term:
+                if translation not in existing_term["translation"]:
+                    existing_term["translation"].append(translation)
+                    existing_term["updated_at"] = datetime.now().isoformat()
+                    self._mark_dirty(existing_term)
+                    self._terms_changed()
+                    if save_now:
+                        self.save_terms()
+                    logging.debug(f"向现有术语添加译文: {original} -> {translation}")
+                return existing_term
+
+            now = datetime.now().isoformat()
+            term = {
+                "id": self._generate_term_id(),
+                "original": original,
+                "translation": [translation],
+                "comment": comment,
+                "created_at": now,
+                "updated_at": now
+            }
+            self._index_term(term)
+            self._mark_dirty(term)
+            if save_now:
+                self.save_terms()
         logging.debug(f"添加新术语: {original} -> {translation}")
         return term
 
     def add_terms_batch(self, terms_data: list[dict[str, str | list[str]]]) -> int:
         count = 0
-        for term_data in terms_data:
-            original = term_data.get("original", "")
-            translation = term_data.get("translation", "")
-            comment = term_data.get("comment", "")
-
-            if original and translation:
-                if isinstance(translation, list):
-                    for trans in translation:
-                        if trans.strip():
-                            self.add_term(original, trans, comment, save_now=False)
-                            count += 1
-                else:
-                    self.add_term(original, translation, comment, save_now=False)
-                    count += 1
-        self.save_terms()
-        self._build_indexes()
+        with self._lock:
+            for term_data in terms_data:
+                original = term_data.get("original", "")
+                translation = term_data.get("translation", "")
+                comment = term_data.get("comment", "")
+
+                if original and translation:
+                    if isinstance(translation, list):
+                        for trans in translation:
+                            if trans.strip():
+                                self.add_term(original, trans, comment, save_now=False)
+                                count += 1
+                    else:
+                        self.add_term(original, translation, comment, save_now=False)
+                        count += 1
+            self.save_terms()
         logging.info(f"批量添加术语完成，共添加 {count} 个术语")
         return count
 
@@ -311,31 +448,39 @@ class TermDatabase:
         translation: str | list[str] | None = None,
         comment: str | None = None,
     ) -> dict[str, Any] | None:
-        term = self._id_index.get(term_id)
-        if term is None:
-            return None
-        if original is not None:
-            term["original"] = original.strip()
-        if translation is not None:
-            if isinstance(translation, str):
-                term["translation"] = [translation.strip()]
-            else:
-                term["translation"] = [t.strip() for t in translation if t.strip()]
-        if comment is not None:
-            term["comment"] = comment.strip()
-        term["updated_at"] = datetime.now().isoformat()
-        self.save_terms()
-        self._build_indexes()
+        self._ensure_loaded()
+        with self._lock:
+            term = self._id_index.get(term_id)
+            if term is None:
+                return None
+            if original is not None:
+                self._unindex_term(term)
+                term["original"] = original.strip()
+                self._index_term(term)
+            if translation is not None:
+                if isinstance(translation, str):
+                    term["translation"] = [translation.strip()]
+                else:
+                    term["translation"] = [t.strip() for t in translation if t.strip()]
+                self._terms_changed()
+            if comment is not None:
+                term["comment"] = comment.strip()
+            term["updated_at"] = datetime.now().isoformat()
+            self._mark_dirty(term)
+            self.save_terms()
         logging.info(f"更新术语: {term['original']} -> {', '.join(term['translation'])}")
         return term
 
     def delete_term(self, term_id: str) -> bool:
-        term = self._id_index.get(term_id)
-        if term is None:
-            return False
-        self.terms.remove(term)
-        self.save_terms()
-        self._build_indexes()
+        self._ensure_loaded()
+        with self._lock:
+            term = self._id_index.get(term_id)
+            if term is None:
+                return False
+            self._unindex_term(term)
+            self._dirty.pop(term_id, None)
+            self._deleted.add(term_id)
+            self.save_terms()
         logging.info(f"删除术语: {term['original']}")
         return True
 
@@ -349,54 +494,48 @@ class TermDatabase:
     def find_matching_terms(self, text: str) -> list[dict[str, Any]]:
         if not text:
             return []
+        # 个人词典与术语库各有一个按词元匹配的自动机，一次线性扫描找出全部整词命中（含多词术语）
+        return self.merge_term_hits(self.find_user_dict_terms(text), self.find_glossary_terms(text))
 
-        matching_terms: list[dict[str, Any]] = []
-        matched_terms_set: set[str] = set()
-        text_words = set(_WORD_RE.findall(text.lower()))
-
-        user_dict_origin_terms = self._get_user_dict_origin_terms()
-
-        for original, translation in user_dict_origin_terms.items():
-            original_lower = original.lower()
-            if original_lower in text_words:
-                if re.search(rf'\b{re.escape(original)}\b', text, re.IGNORECASE):
-                    matching_terms.append({
-                        "id": f"user_dict_{original_lower}",
-                        "original": original,
-                        "translation": [translation],
-                        "comment": "来自个人词典",
-                        "created_at": "",
-                        "updated_at": ""
-                    })
-                    matched_terms_set.add(original)
-
-        for length in sorted(self.terms_by_length.keys(), reverse=True):
-            if length > len(text):
-                continue
-
-            for term in self.terms_by_length[length]:
-                original = term["original"]
-
-                if original in matched_terms_set:
-                    continue
-
-                original_lower = original.lower()
-                if original_lower not in text_words:
-                    continue
-
-                if original not in self.term_regex_cache:
-                    self.term_regex_cache[original] = re.compile(rf'\b{re.escape(original)}\b', re.IGNORECASE)
+    @staticmethod
+    def find_user_dict_terms(text: str) -> list[dict[str, Any]]:
+        """文本中出现的个人词典原文，按术语格式返回。"""
+        if not text:
+            return []
+        return [
+            {
+                "id": f"user_dict_{original.lower()}",
+                "original": original,
+                "translation": [translation],
+                "comment": "来自个人词典",
+                "created_at": "",
+                "updated_at": ""
+            }
+            for original, translation in dictionary_service.match_user_terms(text)
+        ]
 
-                if self.term_regex_cache[original].search(text):
-                    matching_terms.append(term)
-                    matched_terms_set.add(original)
+    def find_glossary_terms(self, text: str) -> list[dict[str, Any]]:
+        """文本中出现的术语库术语，较长的术语排在前面。"""
+        if not text:
+            return []
+        return sorted(self._get_term_matcher().find(text), key=lambda x: (-len(x["original"]), x["original"]))
 
+    @staticmethod
+    def merge_term_hits(user_terms: list[dict[str, Any]], glossary_terms: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """合并个人词典与术语库的命中；同一原文只保留一个，个人词典优先。"""
+        matching_terms: list[dict[str, Any]] = []
+        matched_terms_set: set[str] = set()
+        for term in (*user_terms, *glossary_terms):
+            if term["original"] not in matched_terms_set:
+                matching_terms.append(term)
+                matched_terms_set.add(term["original"])
         return matching_terms
 
     def get_all_terms(self) -> list[dict[str, Any]]:
-        return self.terms.copy()
+        return self.terms
 
     def get_term_by_id(self, term_id: str) -> dict[str, Any] | None:
+        self._ensure_loaded()
         return self._id_index.get(term_id)
 
     def import_terms(self, file_path: str, mode: str = ImportMode.INCREMENTAL) -> ImportResult:
@@ -418,13 +557,21 @@ class TermDatabase:
             logging.error(error_msg)
             return result
 
+        self._ensure_loaded()
         try:
             logging.info(f"开始导入术语，文件: {file_path}，模式: {mode}")
             raw_terms = processor.process(file_path)
             logging.info(f"成功解析文件，共 {len(raw_terms)} 个术语")
+        except Exception as e:
+            error_msg = f"导入过程中发生错误: {str(e)}"
+            result.errors.append(error_msg)
+            result.failure_count += 1
+            logging.error(error_msg, exc_info=True)
+            return result
 
+        with self._lock:
             if mode == ImportMode.FULL:
-                self.terms.clear()
+                self._clear_in_memory()
                 logging.info("全量导入模式：已清空现有术语库")
 
             for term_data in raw_terms:
@@ -454,6 +601,8 @@ class TermDatabase:
                             existing_term["updated_at"] = datetime.now().isoformat()
                             if comment:
                                 existing_term["comment"] = comment
+                            self._mark_dirty(existing_term)
+                            self._terms_changed()
                             result.updated_count += 1
                             logging.debug(f"更新术语: {original}，新增译文: {', '.join(added_translations)}")
                         else:
@@ -463,6 +612,8 @@ class TermDatabase:
                         existing_term["translation"] = translations
                         existing_term["comment"] = comment
                         existing_term["updated_at"] = datetime.now().isoformat()
+                        self._mark_dirty(existing_term)
+                        self._terms_changed()
                         result.updated_count += 1
                         logging.debug(f"替换术语: {original}")
                 else:
@@ -474,25 +625,20 @@ class TermDatabase:
                         "created_at": datetime.now().isoformat(),
                         "updated_at": datetime.now().isoformat()
                     }
-                    self.terms.append(new_term)
+                    self._index_term(new_term)
+                    self._mark_dirty(new_term)
                     result.success_count += 1
                     logging.debug(f"添加新术语: {original} -> {', '.join(translations)}")
 
+            # 全部改动在一个事务中提交
             self.save_terms()
-            self._build_indexes()
-
-            logging.info(f"导入完成，成功: {result.success_count}，失败: {result.failure_count}，更新: {result.updated_count}，跳过: {result.skipped_count}")
-
-        except Exception as e:
-            error_msg = f"导入过程中发生错误: {str(e)}"
-            result.errors.append(error_msg)
-            result.failure_count += 1
-            logging.error(error_msg, exc_info=True)
 
+        logging.info(f"导入完成，成功: {result.success_count}，失败: {result.failure_count}，更新: {result.updated_count}，跳过: {result.skipped_count}")
         return result
 
     def _find_term_by_original(self, original: str) -> dict[str, Any] | None:
-        return self._original_index.get(original.lower())
+        self._ensure_loaded()
+        return self._lookup_original(original)
 
     def import_terms_from_csv(self, file_path: str) -> int:
         result = self.import_terms(file_path, ImportMode.INCREMENTAL)
@@ -513,11 +659,20 @@ class TermDatabase:
             return False
 
     def _generate_term_id(self) -> str:
-        return str(uuid.uuid4())[:8]
+        # 8 位短 ID 在数万条术语时可能重复，重复时重新生成
+        while True:
+            term_id = str(uuid.uuid4())[:8]
+            if term_id not in self._id_index and term_id not in self._deleted:
+                return term_id
 
     def reload(self) -> None:
-        self.load_terms()
-        logging.info(f"术语库已重新加载，共 {len(self.terms)} 个术语")
+        with self._lock:
+            if not self.save_terms():
+                # 重新载入会丢弃尚未写入的改动，保留内存中的术语
+                logging.warning("术语库有未能写入的改动，暂不重新加载")
+                return
+            self.load_terms()
+        logging.info(f"术语库已重新加载，共 {len(self._id_index)} 个术语")
 
     @classmethod
     def notify_all_instances(cls) -> None:
@@ -525,9 +680,20 @@ class TermDatabase:
             logging.info("通知TermDatabase单例实例重新加载术语库")
             cls._instance.reload()
 
+    def _clear_in_memory(self) -> None:
+        # 调用方需持有 self._lock；数据库中的行在下一次 save_terms 时一并删除
+        self._id_index.clear()
+        self._original_index.clear()
+        self._dirty.clear()
+        self._deleted.clear()
+        self._clear_pending = True
+        self._terms_changed()
+
     def clear_terms(self) -> int:
-        count = len(self.terms)
-        self.terms = []
-        self.save_terms()
+        self._ensure_loaded()
+        with self._lock:
+            count = len(self._id_index)
+            self._clear_in_memory()
+            self.save_terms()
         logging.info(f"清空术语库，共删除 {count} 个术语")
         return count
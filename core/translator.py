@@ -1,18 +1,25 @@
 from __future__ import annotations
+import os
 import re
 import logging
-import threading
-from collections import defaultdict
+from collections import Counter, defaultdict
+from dataclasses import replace
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
+from .decision_ledger import decision_ledger, DecisionInputs, DecisionPlan
 from .models import (
-    LanguageEntry, TranslationResult, NamespaceInfo,
+    LanguageEntry, LanguageTable, TranslationResult, NamespaceInfo, DecisionChange,
     ExtractionResult, TranslationContext, TranslationSource,
     resolve_origin_name_conflict,
     JSON_KEY_VALUE_PATTERN, LANG_KV_PATTERN
 )
-from .constants import TRANSLATOR_VALIDATION_CACHE_SIZE, TRANSLATOR_MAX_WORKERS, TRANSLATOR_SERIAL_THRESHOLD
+from .constants import (
+    TRANSLATOR_VALIDATION_CACHE_SIZE, TRANSLATOR_MAX_WORKERS, TRANSLATOR_SERIAL_THRESHOLD,
+    TRANSLATOR_PROCESS_MAX_WORKERS, TRANSLATOR_PROCESS_POOL_MIN_KEYS, TRANSLATOR_PROCESS_CHUNK_SIZE,
+    TRANSLATOR_CHANGE_LOG_LIMIT,
+)
 
 class Translator:
 
@@ -206,6 +213,123 @@ class Translator:
 
         return namespace, ns_result
 
+    @staticmethod
+    def _resolve_decision_mode(settings: dict, key_count: int) -> str:
+        mode = settings.get('translator_decision_mode', 'auto')
+        if mode not in ('auto', 'thread', 'process'):
+            logging.warning(f"未知的翻译决策模式 '{mode}'，将使用 auto")
+            mode = 'auto'
+        cpu_count = os.cpu_count() or 1
+        if mode == 'auto':
+            if key_count >= TRANSLATOR_PROCESS_POOL_MIN_KEYS and cpu_count >= 4:
+                mode = 'process'
+            else:
+                mode = 'thread'
+        if mode == 'process' and (key_count == 0 or cpu_count < 2):
+            mode = 'thread'
+        logging.debug(f"翻译决策模式: {mode}（待决策 {key_count} 条，CPU {cpu_count} 核）")
+        return mode
+
+    def _decide_with_processes(
+        self,
+        namespaces: list[tuple[str, dict[str, LanguageEntry]]],
+        extraction_result: ExtractionResult,
+        shared_context: TranslationContext,
+        workbench_data: dict[str, dict[str, LanguageEntry]],
+        source_counts: dict[str, int],
+    ) -> list[tuple[str, dict[str, LanguageEntry]]]:
+        """
+        在进程池中执行决策链，返回未能完成的命名空间，由调用方改用线程池处理。
+
+        词典只按本项目实际出现的键与原文裁剪后，经进程池 initializer 向每个子进程传递一次，
+        DictionaryManager 已解析好的原文译名表也一并传递；
+        任务只携带 (键, 英文) 行与命名空间自带中文，子进程回传与行对齐的 (译文, 来源) 和来源计数。
+        """
+        rows_by_namespace: dict[str, list[tuple[str, str]]] = {}
+        keys: set[str] = set()
+        origins: set[str] = set()
+        for namespace, english_entries in namespaces:
+            rows = list(_english_rows(english_entries))
+            rows_by_namespace[namespace] = rows
+            for key, english_value in rows:
+                keys.add(key)
+                origins.add(english_value)
+
+        use_key = shared_context.use_community_dict_key
+        use_origin = shared_context.use_community_dict_origin
+        worker_context = replace(
+            shared_context,
+            user_dict_by_key=_subset(shared_context.user_dict_by_key, keys),
+            user_dict_by_origin=_subset(shared_context.user_dict_by_origin, origins),
+            community_dict_by_key=_subset(shared_context.community_dict_by_key, keys) if use_key else {},
+            community_dict_by_origin=_subset(shared_context.community_dict_by_origin, origins) if use_origin else {},
+            pack_chinese_dict=_subset(shared_context.pack_chinese_dict, keys),
+            internal_chinese={},
+            dictionary_manager=None,
+        )
+        origin_table = getattr(shared_context.dictionary_manager, 'community_origin_table', None)
+        origin_translations = _subset(origin_table, origins) if origin_table and use_origin else None
+
+        remaining = dict(namespaces)
+        chunk_results: dict[str, list] = {}
+        chunk_counts: dict[str, Counter] = {}
+        key_count = sum(len(rows) for rows in rows_by_namespace.values())
+        max_workers = min(TRANSLATOR_PROCESS_MAX_WORKERS, max(1, os.cpu_count() or 1))
+        logging.info(f"使用进程池执行翻译决策: {len(namespaces)} 个命名空间, {key_count} 条, 进程数: {max_workers}")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_decision_worker,
+                initargs=(worker_context, origin_translations),
+            ) as executor:
+                futures = {}
+                for namespace, rows in rows_by_namespace.items():
+                    internal_chinese = extraction_result.internal_chinese.get(namespace, {})
+                    starts = range(0, len(rows), TRANSLATOR_PROCESS_CHUNK_SIZE) if rows else [0]
+                    chunk_results[namespace] = [None] * len(starts)
+                    chunk_counts[namespace] = Counter()
+                    for index, start in enumerate(starts):
+                        chunk = rows[start:start + TRANSLATOR_PROCESS_CHUNK_SIZE]
+                        internal_zh = {key: internal_chinese[key].zh for key, _ in chunk if key in internal_chinese}
+                        future = executor.submit(_decide_chunk, namespace, chunk, internal_zh)
+                        futures[future] = (namespace, index)
+
+                failed: set[str] = set()
+                for future in as_completed(futures):
+                    namespace, index = futures[future]
+                    if namespace in failed:
+                        continue
+                    try:
+                        decisions, counts = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        # 单个分块失败（如工作进程中的异常、结果无法反序列化）只影响该命名空间，留给线程池重新决策
+                        logging.warning(f"命名空间 {namespace} 的进程池决策失败: {e}")
+                        failed.add(namespace)
+                        continue
+                    parts = chunk_results[namespace]
+                    parts[index] = decisions
+                    chunk_counts[namespace].update(counts)
+                    if any(part is None for part in parts):
+                        continue
+                    ns_result: dict[str, LanguageEntry] = {}
+                    decision_iter = (decision for part in parts for decision in part)
+                    for (key, english_value), (translation, source) in zip(rows_by_namespace[namespace], decision_iter):
+                        ns_result[key] = LanguageEntry(
+                            key=key,
+                            en=english_value,
+                            zh=translation,
+                            source=source,
+                            namespace=namespace
+                        )
+                    workbench_data[namespace] = ns_result
+                    _merge_source_counts(source_counts, chunk_counts[namespace])
+                    del remaining[namespace]
+        except (BrokenProcessPool, OSError) as e:
+            logging.warning(f"进程池不可用: {e}")
+        return list(remaining.items())
+
     def run(
         self,
         extraction_result: ExtractionResult,
@@ -222,7 +346,6 @@ class Translator:
         result = TranslationResult()
         workbench_data = result.workbench_data
         source_counts = result.source_counts
-        source_counts_lock = threading.Lock()
 
         user_dict_by_key = user_dictionary.get('by_key', {})
         user_dict_by_origin = user_dictionary.get('by_origin_name', {})
@@ -230,7 +353,60 @@ class Translator:
         use_community_dict_key = settings.get('use_community_dict_key', True)
         use_community_dict_origin = settings.get('use_community_dict_origin', True)
 
+        project_key = decision_ledger.project_key(settings) if existing_translations is None else None
+        if project_key:
+            inputs = DecisionInputs.collect(
+                extraction_result,
+                user_dict_by_key, user_dict_by_origin,
+                community_dict_by_key, community_dict_by_origin,
+                use_community_dict_key, use_community_dict_origin,
+                community_revision=getattr(dictionary_manager, 'community_revision', None),
+            )
+            plan = decision_ledger.plan(project_key, inputs)
+            if plan is not None:
+                result = self._run_incremental(
+                    plan,
+                    extraction_result,
+                    user_dict_by_key=user_dict_by_key,
+                    user_dict_by_origin=user_dict_by_origin,
+                    community_dict_by_key=community_dict_by_key,
+                    community_dict_by_origin=community_dict_by_origin,
+                    use_community_dict_key=use_community_dict_key,
+                    use_community_dict_origin=use_community_dict_origin,
+                    dictionary_manager=dictionary_manager,
+                )
+                decision_ledger.commit(
+                    project_key, inputs, result.workbench_data, result.source_counts,
+                    previous=plan.record, english_changed=plan.english_changed,
+                )
+                self._log_source_summary(result)
+                return result
+
         namespaces = list(extraction_result.master_english.items())
+
+        # 沿用已有译文的命名空间无需决策；其余命名空间的条目数决定是否启用进程池
+        to_decide = [
+            (namespace, english_entries) for namespace, english_entries in namespaces
+            if update_existing or not (existing_translations or {}).get(namespace)
+        ]
+        decision_mode = self._resolve_decision_mode(settings, sum(len(entries) for _, entries in to_decide))
+        if decision_mode == "process":
+            shared_context = TranslationContext(
+                user_dict_by_key=user_dict_by_key,
+                user_dict_by_origin=user_dict_by_origin,
+                community_dict_by_key=community_dict_by_key,
+                community_dict_by_origin=community_dict_by_origin,
+                pack_chinese_dict=extraction_result.pack_chinese,
+                use_community_dict_key=use_community_dict_key,
+                use_community_dict_origin=use_community_dict_origin,
+                dictionary_manager=dictionary_manager,
+            )
+            unfinished = self._decide_with_processes(
+                to_decide, extraction_result, shared_context, workbench_data, source_counts
+            )
+            if unfinished:
+                logging.warning(f"进程池决策未完成，剩余 {len(unfinished)} 个命名空间改用线程池处理")
+            namespaces = [item for item in namespaces if item[0] not in workbench_data]
         namespace_count = len(namespaces)
 
         common_kwargs = dict(
@@ -247,12 +423,14 @@ class Translator:
         )
 
         def _accumulate_source_counts(ns_result: dict[str, LanguageEntry]):
-            for entry in ns_result.values():
-                source = entry.source or TranslationSource.PENDING
-                with source_counts_lock:
-                    source_counts[source] = source_counts.get(source, 0) + 1
+            _merge_source_counts(
+                source_counts,
+                Counter(entry.source or TranslationSource.PENDING for entry in ns_result.values()),
+            )
 
-        if namespace_count <= TRANSLATOR_SERIAL_THRESHOLD:
+        if namespace_count == 0:
+            pass
+        elif namespace_count <= TRANSLATOR_SERIAL_THRESHOLD:
             logging.info(f"使用串行方式处理 {namespace_count} 个命名空间")
             for namespace, english_entries in namespaces:
                 _, ns_result = self._process_namespace_task(
@@ -284,13 +462,205 @@ class Translator:
                     _accumulate_source_counts(ns_result)
 
         result.total_entries = sum(len(entries) for entries in workbench_data.values())
+        if project_key:
+            decision_ledger.commit(project_key, inputs, workbench_data, source_counts)
+
+        self._log_source_summary(result)
+        return result
+
+    def _run_incremental(
+        self,
+        plan: DecisionPlan,
+        extraction_result: ExtractionResult,
+        **context_kwargs,
+    ) -> TranslationResult:
+        """按增量计划只重新评估受影响的条目，其余条目沿用上一次的结果。"""
+        previous = plan.record
+        result = TranslationResult(incremental=True)
+        workbench_data = result.workbench_data
+        source_counts = dict(previous.source_counts)
+        changes = result.changes
+
+        def _count(entry: LanguageEntry, delta: int):
+            source = entry.source or TranslationSource.PENDING
+            source_counts[source] = source_counts.get(source, 0) + delta
+
+        for namespace in plan.removed_namespaces:
+            for key, entry in previous.workbench_data.get(namespace, {}).items():
+                _count(entry, -1)
+                changes.append(DecisionChange(namespace, key, entry, None))
+
+        full_namespaces = set(plan.full_namespaces)
+        for namespace, english_entries in extraction_result.master_english.items():
+            previous_ns = previous.workbench_data.get(namespace)
+            if namespace in full_namespaces or previous_ns is None:
+                _, ns_result = self._process_namespace_task(
+                    namespace=namespace,
+                    english_entries=english_entries,
+                    extraction_result=extraction_result,
+                    existing_translations=None,
+                    update_existing=False,
+                    **context_kwargs
+                )
+                for key, entry in ns_result.items():
+                    _count(entry, 1)
+                    changes.append(DecisionChange(namespace, key, None, entry))
+                workbench_data[namespace] = ns_result
+                continue
 
+            keys = plan.keys.get(namespace)
+            if not keys:
+                workbench_data[namespace] = previous_ns
+                continue
+
+            ctx = self._build_translation_context(namespace, extraction_result, **context_kwargs)
+            updated: dict[str, LanguageEntry | None] = {}
+            for key in keys:
+                before = previous_ns.get(key)
+                english_entry = english_entries.get(key)
+                after = None
+                if english_entry is not None:
+                    translation, source = self._decide_translation_for_key(key, english_entry.en, ctx)
+                    translation, source = self._normalize_translation_result(translation, source)
+                    after = LanguageEntry(
+                        key=key,
+                        en=english_entry.en,
+                        zh=translation,
+                        source=source,
+                        namespace=namespace
+                    )
+                    if before is not None and (before.en, before.zh, before.source) == (after.en, after.zh, after.source):
+                        continue
+                elif before is None:
+                    continue
+                updated[key] = after
+                if before is not None:
+                    _count(before, -1)
+                if after is not None:
+                    _count(after, 1)
+                changes.append(DecisionChange(namespace, key, before, after))
+
+            if not updated:
+                workbench_data[namespace] = previous_ns
+            elif all(entry is not None and key in previous_ns for key, entry in updated.items()):
+                ns_result = dict(previous_ns)
+                ns_result.update(updated)
+                workbench_data[namespace] = ns_result
+            else:
+                # 键集合有增删，按本次提取的键顺序重建
+                workbench_data[namespace] = {
+                    key: updated[key] if key in updated else previous_ns[key]
+                    for key in english_entries
+                }
+
+        result.source_counts = {source: count for source, count in source_counts.items() if count}
+        result.total_entries = sum(len(entries) for entries in workbench_data.values())
+        logging.info(
+            f"增量翻译决策: 重新评估 {plan.key_count} 条、完整决策 {len(full_namespaces)} 个新命名空间，"
+            f"{len(changes)} 条结果发生变化"
+        )
+        summary, details = self._build_change_report(changes)
+        result.change_report = summary + details
+        for line in summary + details[:TRANSLATOR_CHANGE_LOG_LIMIT]:
+            logging.info(line)
+        if len(details) > TRANSLATOR_CHANGE_LOG_LIMIT:
+            logging.info(f"  …… 另有 {len(details) - TRANSLATOR_CHANGE_LOG_LIMIT} 条变化未列出")
+        return result
+
+    @staticmethod
+    def _build_change_report(changes: list[DecisionChange]) -> tuple[list[str], list[str]]:
+        """返回 (按命名空间的汇总行, 逐条变化行)。"""
+        per_namespace: dict[str, Counter] = defaultdict(Counter)
+        details: list[str] = []
+        for change in changes:
+            if change.before is None:
+                per_namespace[change.namespace]["新增"] += 1
+            elif change.after is None:
+                per_namespace[change.namespace]["移除"] += 1
+            else:
+                per_namespace[change.namespace]["改变"] += 1
+            before = f"{change.before.zh!r} ({change.before.source})" if change.before else "(无)"
+            after = f"{change.after.zh!r} ({change.after.source})" if change.after else "(已移除)"
+            details.append(f"  {change.namespace}:{change.key}: {before} -> {after}")
+        summary = [
+            f"  [{namespace}] " + "，".join(f"{kind} {count} 条" for kind, count in counts.items())
+            for namespace, counts in per_namespace.items()
+        ]
+        return summary, details
+
+    @staticmethod
+    def _log_source_summary(result: TranslationResult):
         logging.info("--- 翻译决策贡献分析 ---")
         logging.info(f"总条目数: {result.total_entries}")
-        for source, count in sorted(source_counts.items()):
+        for source, count in sorted(result.source_counts.items()):
             percentage = (count / result.total_entries) * 100 if result.total_entries > 0 else 0
             logging.info(f"  ▷ {source}: {count} 条 ({percentage:.2f}%)")
         logging.info("--------------------------")
 
         logging.info("翻译决策引擎运行完毕。")
-        return result
+
+
+def _english_rows(english_entries: dict[str, LanguageEntry]):
+    if isinstance(english_entries, LanguageTable):
+        return english_entries.en_items()
+    return ((key, entry.en) for key, entry in english_entries.items() if entry)
+
+
+def _subset(source: dict, wanted: set[str]) -> dict:
+    if not source:
+        return {}
+    return {key: source[key] for key in wanted if key in source}
+
+
+def _merge_source_counts(source_counts: dict[str, int], counts: Counter) -> None:
+    for source, count in counts.items():
+        source_counts[source] = source_counts.get(source, 0) + count
+
+
+class _OriginResolver:
+    """子进程中代替 DictionaryManager：解析社区词典原文冲突并缓存结果。"""
+
+    def __init__(self, community_dict_by_origin: dict[str, list[dict]], resolved: dict[str, str] | None = None):
+        self._community_dict_by_origin = community_dict_by_origin
+        self._cache: dict[str, str | None] = dict(resolved) if resolved else {}
+
+    def get_community_origin_translation(self, origin_name: str) -> str | None:
+        if origin_name in self._cache:
+            return self._cache[origin_name]
+        candidates = self._community_dict_by_origin.get(origin_name)
+        translation = resolve_origin_name_conflict(candidates) if candidates else None
+        self._cache[origin_name] = translation
+        return translation
+
+
+_worker_translator: Translator | None = None
+_worker_context: TranslationContext | None = None
+
+
+def _init_decision_worker(context: TranslationContext, origin_translations: dict[str, str] | None = None) -> None:
+    global _worker_translator, _worker_context
+    context.dictionary_manager = _OriginResolver(context.community_dict_by_origin, origin_translations)
+    _worker_translator = Translator()
+    _worker_context = context
+
+
+def _decide_chunk(
+    namespace: str,
+    rows: list[tuple[str, str]],
+    internal_zh: dict[str, str | None],
+) -> tuple[list[tuple[str, str]], Counter]:
+    """子进程任务：对 (键, 英文) 行执行决策链，返回与行对齐的 (译文, 来源) 及来源计数。"""
+    internal_chinese = LanguageTable(namespace)
+    for key, zh in internal_zh.items():
+        internal_chinese.add(key, "", zh)
+    ctx = replace(_worker_context, internal_chinese=internal_chinese)
+
+    translator = _worker_translator
+    decisions: list[tuple[str, str]] = []
+    counts: Counter = Counter()
+    for key, english_value in rows:
+        translation, source = translator._decide_translation_for_key(key, english_value, ctx)
+        translation, source = translator._normalize_translation_result(translation, source)
+        decisions.append((translation, source))
+        counts[source or TranslationSource.PENDING] += 1
+    return decisions, counts
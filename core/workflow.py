@@ -1,11 +1,12 @@
 from __future__ import annotations
 import logging
+import threading
 from pathlib import Path
 from typing import Callable
 
 from .models import (
     ExtractionResult, TranslationResult, PackSettings,
-    WorkflowContext
+    WorkflowContext, LanguageTable
 )
 from .extractor import Extractor
 from .translator import Translator
@@ -19,9 +20,68 @@ class Workflow:
         self.translator = Translator()
         self.builder = Builder()
         self.dictionary_manager = DictionaryManager()
+        self._dictionary_prefetch: threading.Thread | None = None
+
+    @staticmethod
+    def _resolve_load_mode(load_mode: str) -> str:
+        if load_mode not in ("auto", "snapshot", "on_demand", "full"):
+            logging.warning(f"未知的社区词典加载模式 '{load_mode}'，将使用 auto")
+            return "auto"
+        return load_mode
+
+    def prefetch_dictionaries(self, settings: dict) -> None:
+        """
+        在后台预加载词典，与数据提取同时进行（见 DictionaryManager.prefetch）。
+
+        预加载的结果放在进程级共享缓存中，run_translation 照常加载词典即可直接命中，
+        整体耗时由「提取 + 加载」变为两者中较长的一个。
+        """
+        if not settings.get('dictionary_prefetch', True):
+            return
+        if self._dictionary_prefetch is not None and self._dictionary_prefetch.is_alive():
+            return
+        community_dict_dir = settings.get('community_dict_dir', '')
+        load_mode = self._resolve_load_mode(settings.get('community_dict_load_mode', 'auto'))
+
+        def _prefetch():
+            try:
+                DictionaryManager.prefetch(community_dict_dir, load_mode)
+            except Exception as e:
+                logging.warning(f"词典预加载失败，将在翻译决策阶段重新加载: {e}")
+
+        self._dictionary_prefetch = threading.Thread(target=_prefetch, name="dictionary-prefetch", daemon=True)
+        self._dictionary_prefetch.start()
+
+    def _load_dictionaries(
+        self,
+        community_dict_dir: str,
+        progress_callback: Callable | None = None,
+        extraction_result: ExtractionResult | None = None,
+        load_mode: str = "auto",
+    ) -> tuple[dict, dict, dict]:
+        load_mode = self._resolve_load_mode(load_mode)
+        keys = origins = None
+        if load_mode in ("auto", "on_demand") and extraction_result is not None:
+            keys, origins = self._community_lookup_scope(extraction_result)
+        return self.dictionary_manager.get_all_dictionaries(
+            community_dict_dir, progress_callback, keys, origins, load_mode=load_mode
+        )
 
-    def _load_dictionaries(self, community_dict_dir: str, progress_callback: Callable | None = None) -> tuple[dict, dict, dict]:
-        return self.dictionary_manager.get_all_dictionaries(community_dict_dir, progress_callback)
+    @staticmethod
+    def _community_lookup_scope(extraction_result: ExtractionResult) -> tuple[set[str], set[str]]:
+        """翻译决策只会用到本项目的键与英文原文，按需加载社区词典时以此为查询范围。"""
+        keys: set[str] = set()
+        origins: set[str] = set()
+        for entries in extraction_result.master_english.values():
+            if isinstance(entries, LanguageTable):
+                en_column = entries.columns()[0]
+                keys.update(en_column)
+                origins.update(en_column.values())
+            else:
+                for key, entry in entries.items():
+                    keys.add(key)
+                    origins.add(entry.en)
+        return keys, origins
 
     def run_extraction(self, context: WorkflowContext) -> ExtractionResult:
         logging.info("数据提取开始")
@@ -74,7 +134,9 @@ class Workflow:
                 context.progress_callback("正在加载翻译词典...", 52)
             user_dict, community_dict_by_key, community_dict_by_origin = self._load_dictionaries(
                 context.settings['community_dict_dir'],
-                lambda msg, progress: context.progress_callback(msg, 50 + progress // 2) if context.progress_callback else None
+                lambda msg, progress: context.progress_callback(msg, 50 + progress // 2) if context.progress_callback else None,
+                extraction_result=context.extraction_result,
+                load_mode=context.settings.get('community_dict_load_mode', 'auto'),
             )
             logging.info(f"词典加载完成: 用户词典条目数={len(user_dict.get('by_key', {}))+len(user_dict.get('by_origin_name', {}))}, 社区词典Key条目数={len(community_dict_by_key)}, 社区词典原文条目数={len(community_dict_by_origin)}")
 
@@ -0,0 +1,86 @@
+import logging
+import random
+import sqlite3
+import sys
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config_manager
+from utils import dictionary_search_index
+from utils.dictionary_searcher import DictionarySearcher
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def make_community_db(path, entries, seed=0):
+    """生成与 Dict-Sqlite.db 结构相同的社区词典：多词英文原文、较长的 Key 与中文译名。"""
+    rng = random.Random(seed)
+    syllables = ["ar", "en", "or", "ium", "ite", "gal", "ver", "stone", "iron", "gold", "cop", "per", "dra",
+                 "gon", "ste", "el", "cry", "stal", "ma", "na", "flux", "gear", "pipe", "core", "ox", "ide"]
+    words = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))).capitalize() for _ in range(4000)]
+    cjk = [chr(code) for code in range(0x4e00, 0x4e00 + 3000)]
+    rows = []
+    for i in range(entries):
+        mod = f"mod{rng.randint(0, 3000)}"
+        origin = " ".join(rng.choice(words) for _ in range(rng.choice([1, 1, 2, 2, 2, 3, 3, 4, 6])))
+        trans = "".join(rng.choice(cjk) for _ in range(rng.randint(2, 10)))
+        key = f"item.{mod}.{origin.lower().replace(' ', '_')[:40]}_{i}"
+        rows.append((key, origin, trans, f"1.{rng.randint(0, 20)}.{rng.randint(0, 9)}", mod, ""))
+    with sqlite3.connect(path) as con:
+        con.execute("CREATE TABLE dict(id INTEGER PRIMARY KEY, key TEXT, origin_name TEXT, trans_name TEXT, version TEXT, modid TEXT, curseforge TEXT)")
+        con.executemany("INSERT INTO dict(key, origin_name, trans_name, version, modid, curseforge) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return rows
+
+
+def best_ms(func, repeat=3):
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    logging.info("=== 社区词典搜索基准 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        config_manager.APP_DATA_PATH = Path(tmp)
+        db_path = Path(tmp) / "Dict-Sqlite.db"
+        rows = make_community_db(db_path, entries=500000)
+        logging.info(f"社区词典: {len(rows)} 条")
+
+        start = time.perf_counter()
+        assert dictionary_search_index.build_search_index(db_path), "索引生成失败"
+        index_file = dictionary_search_index.index_path(db_path)
+        logging.info(f"生成索引: {time.perf_counter() - start:.1f} 秒, {index_file.stat().st_size / (1024 * 1024):.0f} MB")
+
+        sample = rows[12345]
+        queries = [
+            ("en", "Iron"), ("en", "Dragon"), ("en", sample[1]), ("en", sample[0]), ("en", "x"), ("en", "zzz"),
+            ("zh", sample[2]), ("zh", sample[2][:1]), ("zh", sample[2][:2]),
+        ]
+        with DictionarySearcher(db_path) as searcher:
+            index = searcher.index
+            for mode, query in queries:
+                search = searcher.search_by_english if mode == "en" else searcher.search_by_chinese
+                searcher.index = index
+                indexed = best_ms(lambda: search(query))
+                first_page = search(query, limit=50)
+                second_page = search(query, limit=50, offset=50)
+                assert first_page + second_page == search(query, limit=100), "分页结果不连续"
+                searcher.index = None
+                scanned = best_ms(lambda: search(query), repeat=1)
+                logging.info(f"{mode} {query[:30]!r:>34}: LIKE {scanned:7.1f} ms, 索引 {indexed:6.1f} ms")
+            searcher.index = index
+    logging.info("=== 基准完成 ===")
+
+
+if __name__ == "__main__":
+    main()
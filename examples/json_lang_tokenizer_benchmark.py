@@ -0,0 +1,86 @@
+import logging
+import random
+import re
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_lang_tokenizer import iter_json_lang_entries
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 旧实现：逐位置试配的键值对正则 + 多遍转义处理
+LEGACY_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL)
+LEGACY_UNICODE_RE = re.compile(r'\\u([0-9a-fA-F]{4})')
+LEGACY_PLACEHOLDERS = {'\\n': '\x00NL\x00', '\\t': '\x00TB\x00', '\\r': '\x00CR\x00'}
+LEGACY_RESTORE = {v: k for k, v in LEGACY_PLACEHOLDERS.items()}
+LEGACY_RESTORE_RE = re.compile(r'\x00(NL|TB|CR)\x00')
+
+
+def legacy_decode(value):
+    if not value:
+        return value
+    for escaped, placeholder in LEGACY_PLACEHOLDERS.items():
+        value = value.replace(escaped, placeholder)
+    value = LEGACY_UNICODE_RE.sub(lambda m: chr(int(m.group(1), 16)), value)
+    value = LEGACY_RESTORE_RE.sub(lambda m: LEGACY_RESTORE[m.group(0)], value)
+    return value.replace('\\"', '"')
+
+
+def legacy_extract(content):
+    return {m.group(1): legacy_decode(m.group(2)) for m in LEGACY_PATTERN.finditer(content)}
+
+
+def tokenizer_extract(content):
+    return {entry.key: entry.value for entry in iter_json_lang_entries(content)}
+
+
+def make_lang_file(entries, seed=0):
+    """生成接近真实模组的 en_us.json：长短不一的文本、格式代码、转义与 Unicode。"""
+    rng = random.Random(seed)
+    words = ["Iron", "Gear", "Energy", "Flux", "Machine", "Pipe", "Block", "Item", "Storage", "Upgrade"]
+    lines = []
+    for i in range(entries):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 24)))
+        kind = i % 10
+        if kind == 0:
+            text += "\\n§7Hold \\\"Shift\\\" for details"
+        elif kind == 1:
+            text += " \\u00a7a%s\\u00a7r"
+        elif kind == 2:
+            text += " 50%% \\u2192 100%%"
+        lines.append(f'    "item.examplemod.entry_{i}.desc": "{text}"')
+    return "{\n" + ",\n".join(lines) + "\n}\n"
+
+
+def benchmark(func, content, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    logging.info("=== JSON 语言文件解析基准 ===")
+    for entries in (1000, 10000, 50000):
+        content = make_lang_file(entries)
+        size_mb = len(content.encode("utf-8")) / (1024 * 1024)
+        assert legacy_extract(content) == tokenizer_extract(content), "两种实现结果不一致"
+
+        legacy_time = benchmark(legacy_extract, content, 5)
+        tokenizer_time = benchmark(tokenizer_extract, content, 5)
+        logging.info(
+            f"{entries:>6} 条 ({size_mb:.2f} MB): 正则 {size_mb / legacy_time:7.1f} MB/s, "
+            f"分词器 {size_mb / tokenizer_time:7.1f} MB/s, 提速 {legacy_time / tokenizer_time:.2f}x"
+        )
+    logging.info("=== 基准完成 ===")
+
+
+if __name__ == "__main__":
+    main()
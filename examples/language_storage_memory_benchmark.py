@@ -0,0 +1,110 @@
+import copy
+import gc
+import json
+import logging
+import pickle
+import random
+import sys
+import os
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.models import CompressedTextDict, LanguageTable
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# 旧表示：每个条目一个带 __dict__ 的 LanguageEntry，命名空间字符串逐条保存，原文常驻内存
+@dataclass
+class LegacyLanguageEntry:
+    key: str
+    en: str
+    zh: str | None = None
+    source: str | None = None
+    namespace: str = "minecraft"
+
+
+def make_namespaces(namespace_count, keys_per_namespace, seed=0):
+    """生成接近真实整合包的数据：(命名空间, 原始 en_us.json 文本, {键: 英文})。"""
+    rng = random.Random(seed)
+    words = ["Iron", "Gear", "Energy", "Flux", "Machine", "Pipe", "Block", "Item", "Storage", "Upgrade"]
+    namespaces = []
+    for n in range(namespace_count):
+        namespace = f"examplemod{n}"
+        entries = {}
+        for i in range(keys_per_namespace):
+            key = f"item.{namespace}.entry_{i}" if i % 2 else f"block.{namespace}.entry_{i}.tooltip"
+            entries[key] = " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        raw = json.dumps(entries, ensure_ascii=False, indent=2)
+        namespaces.append((namespace, raw, entries))
+    return namespaces
+
+
+def build_legacy(namespaces):
+    master_english = defaultdict(dict)
+    raw_english_files = {}
+    for namespace, raw, entries in namespaces:
+        # 解析得到的字符串都是新对象，这里复制一份以模拟逐文件读取与解析
+        raw_english_files[namespace] = raw[:1] + raw[1:]
+        for key, value in entries.items():
+            key = "".join(key)
+            master_english[namespace][key] = LegacyLanguageEntry(key=key, en="".join(value), namespace="".join(namespace))
+    return master_english, raw_english_files
+
+
+def build_compact(namespaces):
+    master_english = {}
+    raw_english_files = CompressedTextDict()
+    for namespace, raw, entries in namespaces:
+        raw_english_files[namespace] = raw
+        table = master_english[namespace] = LanguageTable("".join(namespace))
+        for key, value in entries.items():
+            table.add("".join(key), "".join(value))
+    return master_english, raw_english_files
+
+
+def measure(builder, namespaces):
+    gc.collect()
+    tracemalloc.start()
+    result = builder(namespaces)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    logging.info("=== 语言条目存储内存基准 ===")
+    namespaces = make_namespaces(namespace_count=300, keys_per_namespace=1000)
+    total = sum(len(entries) for _, _, entries in namespaces)
+    # 生成的数据本身不计入，两种表示都从这份数据复制出自己的字符串
+    raw_texts = [raw for _, raw, _ in namespaces]
+
+    (legacy_en, legacy_raw), legacy_bytes = measure(build_legacy, namespaces)
+    (compact_en, compact_raw), compact_bytes = measure(build_compact, namespaces)
+    raw_bytes = sum(sys.getsizeof(raw) for raw in raw_texts)
+
+    # 两种表示对外行为一致
+    for namespace, _, entries in namespaces[:5]:
+        assert dict(compact_raw)[namespace] == legacy_raw[namespace]
+        for key, entry in compact_en[namespace].items():
+            legacy_entry = legacy_en[namespace][key]
+            assert (entry.key, entry.en, entry.zh, entry.namespace) == (
+                legacy_entry.key, legacy_entry.en, legacy_entry.zh, legacy_entry.namespace
+            )
+    assert pickle.loads(pickle.dumps(compact_en))[namespaces[0][0]].keys() == compact_en[namespaces[0][0]].keys()
+    assert copy.deepcopy(compact_raw) == legacy_raw
+
+    logging.info(f"{len(namespaces)} 个命名空间, {total} 条英文, 原始语言文件 {raw_bytes / (1024 * 1024):.1f} MB")
+    logging.info(f"旧表示: {legacy_bytes / (1024 * 1024):7.1f} MB, 每条 {legacy_bytes / total:6.1f} 字节")
+    logging.info(f"新表示: {compact_bytes / (1024 * 1024):7.1f} MB, 每条 {compact_bytes / total:6.1f} 字节")
+    logging.info(f"节省 {(1 - compact_bytes / legacy_bytes) * 100:.1f}%")
+    logging.info("=== 基准完成 ===")
+
+
+if __name__ == "__main__":
+    main()
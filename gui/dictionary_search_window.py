@@ -13,10 +13,20 @@ class DictionarySearchWindow(ttk.Toplevel):
         "原文查译文": "en",
         "译文查原文": "zh"
     }
+    PAGE_SIZE = 100
+    # 输入停顿多久后自动搜索（毫秒），仅在全文索引可用时启用
+    LIVE_SEARCH_DELAY = 250
+    # 生成全文索引期间检查是否已完成的间隔（毫秒）
+    INDEX_POLL_INTERVAL = 2000
     def __init__(self, parent, initial_query=""):
         super().__init__(parent)
         self.parent = parent
         self.initial_query = initial_query
+        self._query = ""
+        self._search_mode = "en"
+        self._offset = 0
+        self._live_search_job = None
+        self._index_poll_job = None
         logging.info("初始化词典查询窗口...")
         self.config = load_config()
         # 构建完整的文件路径
@@ -61,13 +71,14 @@ class DictionarySearchWindow(ttk.Toplevel):
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         self.search_entry.grid(row=0, column=0, sticky="ew", padx=(0,5))
         self.search_entry.bind("<Return>", lambda e: self._perform_search())
+        self.search_entry.bind("<KeyRelease>", self._schedule_live_search)
         self.mode_var = tk.StringVar(value="原文查译文")
         self.mode_combo = ttk.Combobox(search_frame, textvariable=self.mode_var,
                                        values=list(self.SEARCH_MODES.keys()),
                                        state="readonly", width=12)
         self.mode_combo.grid(row=0, column=1, padx=(0,5))
         self.mode_combo.bind('<MouseWheel>', lambda e: "break")
-        self.mode_combo.bind('<<ComboboxSelected>>', lambda e: self.mode_combo.selection_clear())
+        self.mode_combo.bind('<<ComboboxSelected>>', self._on_mode_selected)
         self.search_button = ttk.Button(search_frame, text="搜索", command=self._perform_search, bootstyle="primary")
         self.search_button.grid(row=0, column=2)
         table_frame = ttk.Frame(main_frame)
@@ -87,6 +98,80 @@ class DictionarySearchWindow(ttk.Toplevel):
         self.tree.configure(yscrollcommand=scrollbar.set)
         self.tree.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
+        footer_frame = ttk.Frame(main_frame)
+        footer_frame.grid(row=2, column=0, sticky="ew", pady=(10, 0))
+        footer_frame.columnconfigure(0, weight=1)
+        self.status_label = ttk.Label(footer_frame, text="")
+        self.status_label.grid(row=0, column=0, sticky="w")
+        self.more_button = ttk.Button(footer_frame, text="加载更多", command=self._load_more, bootstyle="secondary", state="disabled")
+        self.more_button.grid(row=0, column=1)
+        # 全文索引需要手动生成（约需数十秒、占用数百 MB 磁盘），生成后搜索更快并支持边输入边搜索
+        self.index_button = ttk.Button(footer_frame, text="生成搜索索引", command=self._build_index, bootstyle="secondary-outline")
+        if self.searcher.is_available() and self.searcher.index is None:
+            self.index_button.grid(row=0, column=2, padx=(5, 0))
+            if self.searcher.is_index_building():
+                self._wait_for_index()
+
+    def _build_index(self):
+        logging.info("开始生成社区词典搜索索引...")
+        self.searcher.build_index_in_background()
+        self._wait_for_index()
+
+    def _wait_for_index(self):
+        self._index_poll_job = None
+        if self.searcher.refresh_index():
+            logging.info("社区词典搜索索引已可用")
+            self.index_button.grid_remove()
+            return
+        if not self.searcher.is_index_building():
+            self.index_button.config(state="normal", text="生成搜索索引")
+            return
+        self.index_button.config(state="disabled", text="正在生成索引...")
+        self._index_poll_job = self.after(self.INDEX_POLL_INTERVAL, self._wait_for_index)
+
+    def _on_mode_selected(self, event=None):
+        self.mode_combo.selection_clear()
+        if self.search_var.get().strip():
+            self._perform_search()
+
+    def _schedule_live_search(self, event=None):
+        if self.searcher.index is None or event is None or event.keysym == "Return":
+            return
+        if self._live_search_job is not None:
+            self.after_cancel(self._live_search_job)
+        self._live_search_job = self.after(self.LIVE_SEARCH_DELAY, self._live_search)
+
+    def _live_search(self):
+        self._live_search_job = None
+        query = self.search_var.get()
+        if query.strip() and (query != self._query or self.SEARCH_MODES[self.mode_var.get()] != self._search_mode):
+            self._perform_search()
+
+    def _fetch_page(self) -> list[dict]:
+        if self._search_mode == "en":
+            return self.searcher.search_by_english(self._query, limit=self.PAGE_SIZE, offset=self._offset)
+        if self._search_mode == "zh":
+            return self.searcher.search_by_chinese(self._query, limit=self.PAGE_SIZE, offset=self._offset)
+        return []
+
+    def _insert_results(self, results: list[dict]):
+        for item in results:
+            self.tree.insert("", "end", values=(
+                item.get('KEY', ''),
+                item.get('ORIGIN_NAME', ''),
+                item.get('TRANS_NAME', ''),
+                item.get('VERSION', '')
+            ))
+        self._offset += len(results)
+        has_more = len(results) == self.PAGE_SIZE
+        self.more_button.config(state="normal" if has_more else "disabled")
+        self.status_label.config(text=f"已显示 {self._offset} 条" + ("，还有更多结果" if has_more else ""))
+
+    def _load_more(self):
+        if not self._query:
+            return
+        self.more_button.config(state="disabled")
+        self._insert_results(self._fetch_page())
 
     def _perform_search(self):
         logging.info("UI请求执行搜索...")
@@ -97,34 +182,37 @@ class DictionarySearchWindow(ttk.Toplevel):
         if not query.strip():
             logging.info("搜索请求被中止，因为查询内容为空。")
             return
+        if self._live_search_job is not None:
+            self.after_cancel(self._live_search_job)
+            self._live_search_job = None
         self.search_button.config(state="disabled", text="搜索中...")
+        self.more_button.config(state="disabled")
         self.tree.delete(*self.tree.get_children())
         self.update_idletasks()
-        search_mode = self.SEARCH_MODES[self.mode_var.get()]
-        logging.info(f"准备在 '{search_mode}' 模式下搜索 '{query}'")
-        results = []
-        if search_mode == "en":
-            results = self.searcher.search_by_english(query)
-        elif search_mode == "zh":
-            results = self.searcher.search_by_chinese(query)
+        self._query = query
+        self._search_mode = self.SEARCH_MODES[self.mode_var.get()]
+        self._offset = 0
+        logging.info(f"准备在 '{self._search_mode}' 模式下搜索 '{query}'")
+        results = self._fetch_page()
         logging.info(f"搜索操作完成，从 searcher 获得 {len(results)} 条结果。")
         self.search_button.config(state="normal", text="搜索")
         if not results:
             logging.info("结果为空，在表格中插入'无结果'提示。")
             self.tree.insert("", "end", values=("无结果", f"未能找到与 '{query}' 相关的条目", "", ""))
+            self.status_label.config(text="")
         else:
             logging.info(f"正在向表格中填充 {len(results)} 条结果...")
-            for item in results:
-                self.tree.insert("", "end", values=(
-                    item.get('KEY', ''),
-                    item.get('ORIGIN_NAME', ''),
-                    item.get('TRANS_NAME', ''),
-                    item.get('VERSION', '')
-                ))
+            self._insert_results(results)
             logging.info("结果填充完毕。")
 
     def on_close(self):
         logging.info("关闭词典查询窗口...")
+        if self._live_search_job is not None:
+            self.after_cancel(self._live_search_job)
+            self._live_search_job = None
+        if self._index_poll_job is not None:
+            self.after_cancel(self._index_poll_job)
+            self._index_poll_job = None
         if self.searcher:
             self.searcher.close()
         self.destroy()
\ No newline at end of file
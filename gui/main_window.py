@@ -1198,6 +1198,9 @@ class MainWindow:
 
         # 停止标签页的所有后台线程
         tab_to_close.stop_all_threads()
+        # 归还该标签页持有的共享词典引用
+        if tab_to_close.orchestrator is not None:
+            tab_to_close.orchestrator.workflow.dictionary_manager.release()
         
         if tab_to_close.workbench_instance:
             tab_to_close.workbench_instance._on_close_request(force_close=True)
@@ -168,7 +168,7 @@ class ModSearchMixin:
     def search_modrinth(self, query, game_version=None, mod_loader=None):
         """执行Modrinth搜索请求"""
         try:
-            import requests
+            from utils.http_client import http_client
             params = {
                 "query": query,
                 "limit": 50,
@@ -185,7 +185,7 @@ class ModSearchMixin:
                     params["filters"] = f"categories={mod_loader}"
             
             # 发送API请求
-            response = requests.get(f"{MODRINTH_API_BASE}/search", params=params, timeout=30)
+            response = http_client.get(f"{MODRINTH_API_BASE}/search", params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -217,7 +217,7 @@ class ModSearchMixin:
     def search_curseforge(self, query, game_version=None, mod_loader=None):
         """执行CurseForge搜索请求"""
         try:
-            import requests
+            from utils.http_client import http_client
             config = config_manager.load_config()
             api_key = config.get('curseforge_api_key', '')
 
@@ -272,7 +272,7 @@ class ModSearchMixin:
                     # 打印请求信息以便调试
                     self.log_message(f"尝试CurseForge API请求: {address}?{urllib.parse.urlencode(params)}", "INFO")
                     
-                    response = requests.get(address, params=params, headers=headers, timeout=15)
+                    response = http_client.get(address, params=params, headers=headers, timeout=15)
                     
                     # 打印响应状态码
                     self.log_message(f"CurseForge API响应状态: {response.status_code}", "INFO")
@@ -376,11 +376,11 @@ class ModSearchMixin:
     def get_mod_files(self, project_id):
         """获取Modrinth模组文件"""
         try:
-            import requests
+            from utils.http_client import http_client
             # 一次性获取所有文件，设置较大的limit值去除50个的上限
             url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
             params = {"limit": 10000, "offset": 0}
-            response = requests.get(url, params=params, timeout=30)
+            response = http_client.get(url, params=params, timeout=30)
             response.raise_for_status()
             files = response.json()
             
@@ -409,7 +409,7 @@ class ModSearchMixin:
     def get_curseforge_files(self, project_id):
         """获取CurseForge模组文件"""
         try:
-            import requests
+            from utils.http_client import http_client
             import threading
             config = config_manager.load_config()
             api_key = config.get('curseforge_api_key', '')
@@ -433,7 +433,7 @@ class ModSearchMixin:
             total_files = None
             base_url = base_urls[0]
             address = f"{base_url}/v1/mods/{project_id}/files?index=0&limit=1"
-            response = requests.get(address, headers=headers, timeout=15)
+            response = http_client.get(address, headers=headers, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -454,7 +454,7 @@ class ModSearchMixin:
                 offset = page * limit
                 try:
                     page_address = f"{base_url}/v1/mods/{project_id}/files?index={offset}&limit={limit}"
-                    page_response = requests.get(page_address, headers=headers, timeout=15)
+                    page_response = http_client.get(page_address, headers=headers, timeout=15)
                     if page_response.status_code == 200:
                         page_data = page_response.json()
                         page_files = page_data.get("data", [])
@@ -652,6 +652,7 @@ class ModSearchMixin:
         """下载文件"""
         try:
             import requests
+            from utils.http_client import http_client
             import os
             from pathlib import Path
             
@@ -687,7 +688,7 @@ class ModSearchMixin:
             for download_url in download_urls:
                 try:
                     self.log_message(f"尝试从: {download_url} 下载", "INFO")
-                    response = requests.get(download_url, stream=True, timeout=30)
+                    response = http_client.get(download_url, stream=True, timeout=30)
                     response.raise_for_status()
                     
                     # 获取文件大小
@@ -5,9 +5,9 @@ from gui import ui_utils, custom_widgets
 import threading
 import re
 import logging
-import requests
 from pathlib import Path
 from utils import config_manager
+from utils.http_client import http_client
 from utils.api_urls import GITHUB_API_BASE, DICT_RELEASE_API_URL
 GITHUB_REPO_URL_PATTERN = re.compile(r'https?://github\.com/([^/]+)/([^/]+)(?:\.git)?/?$')
 OWNER_REPO_PATTERN = re.compile(r'^([^/]+)/([^/]+)$')
@@ -78,7 +78,7 @@ def test_github_authentication(repo: str, token: str) -> tuple[bool, str]:
     }
 
     try:
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = http_client.get(api_url, headers=headers, timeout=10)
         if response.status_code == 200:
             repo_data = response.json()
             return True, f"认证成功！仓库: {repo_data['name']}"
@@ -101,7 +101,7 @@ def apply_github_acceleration(url: str) -> str:
 
 def get_remote_dict_info() -> dict | None:
     try:
-        response = requests.get(DICT_RELEASE_API_URL, timeout=15)
+        response = http_client.get(DICT_RELEASE_API_URL, timeout=15)
         response.raise_for_status()
         data = response.json()
         version = data.get("tag_name", "")
@@ -129,7 +129,7 @@ def download_dict_file(remote_info: dict, local_path: Path, progress_callback=No
         logging.info(f"应用GitHub加速，使用链接: {accelerated_url}")
 
     try:
-        response = requests.get(accelerated_url, stream=True, timeout=120, headers={"User-Agent": "Mozilla/5.0"})
+        response = http_client.get(accelerated_url, stream=True, timeout=120, headers={"User-Agent": "Mozilla/5.0"})
         response.raise_for_status()
         total_size = int(response.headers.get("content-length", 0))
 
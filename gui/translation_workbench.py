@@ -21,6 +21,7 @@ from gui import ui_utils
 from gui.custom_widgets import ToolTip
 from gui.find_replace_dialog import FindReplaceDialog
 from core.term_database import TermDatabase
+from core.term_annotator import TermAnnotator
 from gui.workbench_find_replace_mixin import WorkbenchFindReplaceMixin
 from gui.workbench_ai_mixin import WorkbenchAIMixin
 
@@ -44,6 +45,8 @@ class TranslationWorkbench(WorkbenchAIMixin, WorkbenchFindReplaceMixin, ttk.Fram
 
         # 初始化术语库
         self.term_db = TermDatabase()
+        # 项目级术语标注：后台预先计算全部条目的术语命中，供术语提示直接读取
+        self.term_annotator = TermAnnotator(self.term_db)
         
         # 术语提示优化：防抖机制
         self._term_update_id = None
@@ -138,6 +141,7 @@ class TranslationWorkbench(WorkbenchAIMixin, WorkbenchFindReplaceMixin, ttk.Fram
         self._update_history_buttons()
         self.bind_all("<Control-z>", self.undo)
         self.bind_all("<Control-y>", self.redo)
+        self._start_term_annotation()
         if self.type_config.enable_save_project:
             self.bind_all("<Control-s>", lambda e: self._save_project())
 
@@ -1296,8 +1300,8 @@ class TranslationWorkbench(WorkbenchAIMixin, WorkbenchFindReplaceMixin, ttk.Fram
         
         if item_selected and interactive and self.current_selection_info:
             # 检查当前条目是否已存在于个人词典中
-            from utils import config_manager
-            user_dict = config_manager.load_user_dict()
+            from core.dictionary_service import dictionary_service
+            user_dict = dictionary_service.user_dictionary()
             info = self.current_selection_info
             item_data = self.translation_data[info['ns']]['items'][info['idx']]
             key, origin_name = item_data['key'], item_data['en']
@@ -1591,6 +1595,10 @@ class TranslationWorkbench(WorkbenchAIMixin, WorkbenchFindReplaceMixin, ttk.Fram
             except:
                 pass
         
+        # 停止项目术语标注
+        if hasattr(self, 'term_annotator'):
+            self.term_annotator.cancel()
+        
         # 关闭线程池
         if hasattr(self, '_thread_pool') and self._thread_pool:
             try:
@@ -13,6 +13,8 @@ class UserDictionaryEditor(ttk.Toplevel):
         self.parent = parent
         self._setup_window()
         self.user_dict = config_manager.load_user_dict()
+        # 打开时的内容，保存时与之比对，只提交本窗口内的改动
+        self._saved_dict = {name: dict(items) for name, items in self.user_dict.items()}
         self.is_dirty = False
         self.current_selection_id = None
         self._create_widgets()
@@ -148,7 +150,12 @@ class UserDictionaryEditor(ttk.Toplevel):
                 self.current_selection_id = None
 
     def _on_save_and_close(self):
-        config_manager.save_user_dict(self.user_dict)
+        upserts, deletes = {}, {}
+        for dict_key, saved_items in self._saved_dict.items():
+            current_items = self.user_dict.get(dict_key, {})
+            upserts[dict_key] = {name: trans for name, trans in current_items.items() if saved_items.get(name) != trans}
+            deletes[dict_key] = [name for name in saved_items if name not in current_items]
+        config_manager.update_user_dict(upserts, deletes)
         self.is_dirty = False
         self.destroy()
 
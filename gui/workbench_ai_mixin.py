@@ -236,7 +236,8 @@ class WorkbenchAIMixin:
         self._current_search_id = current_search_id
         
         # 2. 检查缓存，避免重复计算
-        cache_key = en_text
+        # 个人词典或术语库变化后修订号改变，旧修订的匹配结果自然失效
+        cache_key = (en_text, self.term_annotator.revision())
         if cache_key in self._term_match_cache:
             # 从缓存中获取术语并更新访问顺序
             self._term_match_cache.move_to_end(cache_key)
@@ -315,30 +316,17 @@ class WorkbenchAIMixin:
                             pass
                     return
                 
-                # 1. 处理个人词典中的术语
-                user_dict = config_manager.load_user_dict()
-                user_dict_origin_terms = user_dict.get("by_origin_name", {})
-                
-                for original, translation in user_dict_origin_terms.items():
+                # 1. 个人词典与术语库中的术语：优先读取项目术语标注的结果，未标注时当场计算
+                for term in self.term_annotator.hits_for(en_text):
                     # 检查是否已被取消
                     if self._term_search_cancelled:
                         return
                         
-                    original_lower = original.lower()
-                    if original_lower in text_words:
-                        # 检查是否在文本中完整匹配
-                        if re.search(rf'\b{re.escape(original)}\b', en_text, re.IGNORECASE):
-                            temp_term = {
-                                "id": f"user_dict_{original_lower}",
-                                "original": original,
-                                "translation": [translation],
-                                "comment": "",
-                                "domain": "",
-                                "created_at": "",
-                                "updated_at": ""
-                            }
-                            matching_terms.append(temp_term)
-                            matched_terms_set.add(original)
+                    if term['original'] in matched_terms_set:
+                        continue
+                    # 复制一份：后面合并社区词典译文时会修改译文列表，不能改到缓存与术语库中的数据
+                    matching_terms.append({**term, 'translation': list(term['translation'])})
+                    matched_terms_set.add(term['original'])
                 
                 # 2. 处理社区词典中的术语
                 config = config_manager.load_config()
@@ -585,6 +573,17 @@ class WorkbenchAIMixin:
         """
         self.term_db.reload()
         self._clear_term_cache()
+        self._start_term_annotation()
+
+    def _start_term_annotation(self):
+        """
+        在后台为项目全部英文条目计算术语命中
+        """
+        texts_by_namespace = {
+            ns: [item.get('en', '') for item in data.get('items', [])]
+            for ns, data in self.translation_data.items()
+        }
+        self.term_annotator.annotate_in_background(texts_by_namespace)
 
     def _add_to_user_dictionary(self):
         if not self.current_selection_info: return
@@ -594,11 +593,8 @@ class WorkbenchAIMixin:
         if not translation:
             messagebox.showwarning("操作无效", "译文不能为空！", parent=self); return
         
-        user_dict = config_manager.load_user_dict()
-        # 同时保存Key和原文到个人词典
-        user_dict["by_key"][key] = translation
-        user_dict["by_origin_name"][origin_name] = translation
-        config_manager.save_user_dict(user_dict)
+        # 同时保存Key和原文到个人词典（增量写入，不重写整个词典）
+        config_manager.update_user_dict(upserts={"by_key": {key: translation}, "by_origin_name": {origin_name: translation}})
         
         # 记录添加词典操作
         details = {
@@ -607,6 +603,8 @@ class WorkbenchAIMixin:
             'translation': translation
         }
         self.record_operation('DICTIONARY_ADD', details, target_iid=info['row_id'])
+        # 个人词典已变化，重新标注项目术语
+        self._start_term_annotation()
         
         self.status_label.config(text=f"成功！已将“{translation}”存入个人词典")
         self._set_dirty(True)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import ttkbootstrap as ttk
+import multiprocessing
 import sys
 import logging
 import os
@@ -71,4 +72,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -10,9 +10,9 @@ import re
 from pathlib import Path
 import logging
 import concurrent.futures
-from utils.file_utils import decode_json_value_with_unicode
-from core.models import JSON_KEY_VALUE_PATTERN
+from utils.json_lang_tokenizer import iter_json_lang_entries
 from core.exceptions import ServiceResult
+from utils.http_client import http_client
 
 _REPO_URL_PATTERN = re.compile(r'https?://github\.com/([^/]+)/([^/]+)(?:\.git)?/?$')
 _OWNER_REPO_PATTERN = re.compile(r'^([^/]+)/([^/]+)$')
@@ -39,17 +39,6 @@ class GitHubService:
         self.retry_delay = 2
         self._builder = None
         
-        # 创建会话对象，启用连接池
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,  # 连接池大小
-            pool_maxsize=10,      # 最大连接数
-            max_retries=3,        # 最大重试次数
-            pool_block=False      # 不阻塞
-        )
-        self.session.mount('https://', adapter)
-        self.session.headers.update(self.headers)
-        
         # 记录初始化参数
         logging.info(f'初始化GitHub服务: 仓库={self.repo}, 分支={self.branch}, 推送到源仓库={self.push_to_upstream}, 上游分支={self.upstream_branch}, 上游仓库={self.upstream_repo}, 推送前删除分支={self.delete_branch_before_push}')
     
@@ -74,19 +63,13 @@ class GitHubService:
             endpoint = endpoint.replace(f'/repos/{self.repo}/', f'/repos/{target_repo}/', 1)
         url = f'{self.api_base}{endpoint}'
         
+        if method not in ('GET', 'PUT', 'POST', 'PATCH', 'DELETE'):
+            raise ValueError(f'不支持的请求方法: {method}')
+        # 使用进程级共享会话（连接池），认证头按请求附加，不写入共享会话
+        headers = {**self.headers, **kwargs.pop('headers', {})}
+
         try:
-            if method == 'GET':
-                response = self.session.get(url, **kwargs)
-            elif method == 'PUT':
-                response = self.session.put(url, **kwargs)
-            elif method == 'POST':
-                response = self.session.post(url, **kwargs)
-            elif method == 'PATCH':
-                response = self.session.patch(url, **kwargs)
-            elif method == 'DELETE':
-                response = self.session.delete(url, **kwargs)
-            else:
-                raise ValueError(f'不支持的请求方法: {method}')
+            response = http_client.request(method, url, headers=headers, **kwargs)
             
             # 检查响应状态
             if response.status_code >= 200 and response.status_code < 300:
@@ -235,13 +218,10 @@ class GitHubService:
     
     def _parse_json_with_unicode_only(self, content):
         result = {}
-        for match in JSON_KEY_VALUE_PATTERN.finditer(content):
-            key = match.group(1)
-            value = match.group(2)
-            temp_value = decode_json_value_with_unicode(value)
+        for key, value, _, _ in iter_json_lang_entries(content):
             if key == '_comment':
                 continue
-            result[key] = temp_value
+            result[key] = value
         return result
 
     def build_resource_pack_structure(self, translations, version='1.21', project_name=None, namespace=None, file_format='both', raw_english_files=None):
@@ -0,0 +1,119 @@
+"""测试公用的本地 HTTP 桩服务与固定的 HTTP 配置。"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import config_manager, retry_logic
+from utils.http_client import http_client
+
+MAX_PER_HOST = 2
+SLOW_SECONDS = 0.3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _TestServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        path = self.path.split("?", 1)[0]
+        host = self.headers.get("Host", "")
+        with self.server.lock:
+            self.server.requests[path] += 1
+            count = self.server.requests[path]
+            self.server.in_flight[host] += 1
+            self.server.max_in_flight[host] = max(self.server.max_in_flight[host], self.server.in_flight[host])
+            total = sum(self.server.in_flight.values())
+            self.server.max_total = max(self.server.max_total, total)
+        try:
+            if path == "/slow":
+                time.sleep(SLOW_SECONDS)
+                self._send_json(200, {"ok": True})
+            elif path.startswith("/broken/"):
+                self._send_json(500, {"error": "boom"})
+            elif path.startswith("/empty/"):
+                self._send_json(200, {})
+            elif path.startswith("/flaky/") and count <= 2:
+                # 前两次返回 503，之后按正常接口应答
+                self._send_json(503, {"error": "unavailable"})
+            elif path.endswith("/v1/fingerprints/432"):
+                self._send_json(200, {"data": {"exactMatches": [
+                    {"id": 7, "file": {"fileFingerprint": 123, "gameVersions": ["1.20.1", "Forge"]}},
+                ]}})
+            elif path.endswith("/v1/mods"):
+                self._send_json(200, {"data": [{"id": 7, "name": "CF Mod", "slug": "cf-mod"}]})
+            elif path.endswith("/version_files"):
+                self._send_json(200, {"abc": {"project_id": "P1", "game_versions": ["1.20.1"], "loaders": ["forge"]}})
+            elif path.endswith("/projects"):
+                self._send_json(200, [{"id": "P1", "title": "Test Mod", "slug": "test-mod", "game_versions": ["1.20.1"]}])
+            else:
+                self._send_json(404, {"error": "not found"})
+        finally:
+            with self.server.lock:
+                self.server.in_flight[host] -= 1
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class _TestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.in_flight: Counter[str] = Counter()
+        self.max_in_flight: Counter[str] = Counter()
+        self.max_total = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+@pytest.fixture
+def server():
+    srv = _TestServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def http_settings(monkeypatch):
+    """使用固定的 HTTP 配置、跳过重试等待；前后各重建一次共享会话。"""
+    config = dict(
+        config_manager.DEFAULT_CONFIG,
+        http_pool_maxsize=8,
+        http_max_per_host=MAX_PER_HOST,
+        http_connect_timeout=2,
+        http_read_timeout=5,
+        http_max_retries=0,
+        curseforge_api_key="",
+    )
+    monkeypatch.setattr(config_manager, "load_config", lambda: config)
+    monkeypatch.setattr(retry_logic, "_calculate_delay", lambda *args, **kwargs: 0)
+    http_client.close()
+    yield config
+    http_client.close()
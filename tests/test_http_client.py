@@ -0,0 +1,79 @@
+"""共享 HTTP 会话与模组信息查询：用本地 http.server 验证每主机并发上限、重试与失败时返回 None。"""
+from __future__ import annotations
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.mod_repository import CurseForgeClient, ModrinthClient
+from tests.conftest import MAX_PER_HOST
+from utils.http_client import http_client
+
+pytestmark = pytest.mark.usefixtures("http_settings")
+
+
+def _free_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_concurrent_requests_are_limited_per_host(server):
+    hosts = [server.url, server.url.replace("127.0.0.1", "localhost")]
+    urls = [f"{host}/slow" for host in hosts for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        statuses = list(executor.map(lambda url: http_client.get(url).status_code, urls))
+    assert statuses == [200] * len(urls)
+    assert max(server.max_in_flight.values()) == MAX_PER_HOST
+    # 上限按主机分别计算，两个主机的请求可以同时进行
+    assert server.max_total > MAX_PER_HOST
+
+
+def test_session_is_reused_and_rebuilt_on_config_change(server, http_settings):
+    session = http_client.get_session()
+    assert http_client.get(f"{server.url}/slow").status_code == 200
+    assert http_client.get_session() is session
+    http_settings["http_max_per_host"] = MAX_PER_HOST + 1
+    assert http_client.get_session() is not session
+
+
+def test_server_errors_are_retried(server):
+    client = ModrinthClient(base_url=f"{server.url}/flaky")
+    assert client.fetch_version_files(["abc"]) == {
+        "abc": {"project_id": "P1", "game_versions": ["1.20.1"], "loaders": ["forge"]}
+    }
+    assert server.requests["/flaky/version_files"] == 3
+
+
+def test_modrinth_query_mod_info(server):
+    result = ModrinthClient(base_url=f"{server.url}/v2").query_mod_info(["abc"])
+    assert result == {
+        "abc": {
+            "name": "Test Mod",
+            "slug": "test-mod",
+            "url": "https://modrinth.com/mod/test-mod",
+            "game_versions": ["1.20.1"],
+            "game_version": "1.20.1",
+            "loaders": "forge",
+        }
+    }
+
+
+def test_modrinth_query_mod_info_distinguishes_no_match_from_failure(server):
+    assert ModrinthClient(base_url=f"{server.url}/empty").query_mod_info(["abc"]) == {}
+    assert ModrinthClient(base_url=f"{server.url}/broken").query_mod_info(["abc"]) is None
+    # 5xx 按 api_retry 的次数重试后放弃
+    assert server.requests["/broken/version_files"] == 4
+    assert ModrinthClient(base_url=_free_port_url()).query_mod_info(["abc"]) is None
+    assert ModrinthClient(base_url=f"{server.url}/broken").get_mod_info(["abc"]) == {}
+
+
+def test_curseforge_query_mod_info_returns_none_on_failure(server):
+    assert CurseForgeClient(base_url=f"{server.url}/broken", api_key="key").query_mod_info(["123"]) is None
+    assert server.requests["/broken/v1/fingerprints/432"] == 4
+    assert CurseForgeClient(base_url=_free_port_url(), api_key="key").query_mod_info(["123"]) is None
+    # 未配置密钥时不发请求，同样返回 None
+    assert CurseForgeClient(base_url=f"{server.url}/broken").query_mod_info(["123"]) is None
+    assert server.requests["/broken/v1/fingerprints/432"] == 4
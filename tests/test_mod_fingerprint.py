@@ -0,0 +1,172 @@
+"""CurseForge 指纹（MurmurHash2）分块/mmap 实现与原逐字节实现的一致性测试。"""
+from __future__ import annotations
+
+import io
+import random
+import zipfile
+
+import pytest
+
+from core import mod_fingerprint
+from core.mod_fingerprint import (
+    JarFileFingerprinter,
+    Murmur2Stream,
+    curseforge_fingerprint_from_jar_bytes,
+    murmurhash2,
+)
+
+_WHITESPACE = frozenset({9, 10, 13, 32})
+
+
+def reference_fingerprint(file_data: bytes) -> str:
+    """改写前的逐字节实现，作为对照。"""
+    filtered_data = bytes(b for b in file_data if b not in _WHITESPACE)
+    length = len(filtered_data)
+    if length == 0:
+        return "0"
+
+    m = 0x5BD1E995
+    r = 24
+    h = 1 ^ length
+
+    for i in range(0, length - (length % 4), 4):
+        k = filtered_data[i] | (filtered_data[i + 1] << 8) | (filtered_data[i + 2] << 16) | (filtered_data[i + 3] << 24)
+        k = (k * m) & 0xFFFFFFFF
+        k = (k ^ (k >> r)) & 0xFFFFFFFF
+        k = (k * m) & 0xFFFFFFFF
+        h = (h * m) & 0xFFFFFFFF
+        h = (h ^ k) & 0xFFFFFFFF
+
+    remaining = length % 4
+    if remaining > 0:
+        pos = length - remaining
+        if remaining >= 3:
+            h = (h ^ (filtered_data[pos + 2] << 16)) & 0xFFFFFFFF
+        if remaining >= 2:
+            h = (h ^ (filtered_data[pos + 1] << 8)) & 0xFFFFFFFF
+        if remaining >= 1:
+            h = (h ^ filtered_data[pos]) & 0xFFFFFFFF
+            h = (h * m) & 0xFFFFFFFF
+
+    h = (h ^ (h >> 13)) & 0xFFFFFFFF
+    h = (h * m) & 0xFFFFFFFF
+    h = (h ^ (h >> 15)) & 0xFFFFFFFF
+    return str(h)
+
+
+def _random_bytes(seed: int, size: int) -> bytes:
+    rng = random.Random(seed)
+    # 混入较多空白字节，覆盖去空白后长度与原长度不同的情况
+    alphabet = bytes(range(256)) + b" \t\r\n" * 16
+    return bytes(rng.choice(alphabet) for _ in range(size))
+
+
+def _make_jar(seed: int, entries: int) -> bytes:
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for i in range(entries):
+            compression = zipfile.ZIP_DEFLATED if i % 2 else zipfile.ZIP_STORED
+            text = "\n".join(f"item.mod.k{i}_{j}=Value {rng.random()}" for j in range(rng.randint(1, 400)))
+            zf.writestr(f"assets/mod/lang/part{i}.lang", text, compress_type=compression)
+        zf.writestr("META-INF/MANIFEST.MF", "Manifest-Version: 1.0\r\n\r\n")
+    return buffer.getvalue()
+
+
+EDGE_CASES = {
+    "empty": b"",
+    "whitespace_only": b" \t\r\n" * 37,
+    "tail_1": b"abcde",
+    "tail_2": b"abcdef",
+    "tail_3": b"abcdefg",
+    "tail_1_after_whitespace": b"a b\tc\nd\re  ",
+    "tail_3_only": b"\x00\xff\x80",
+    "block_aligned": b"abcdefgh",
+    "high_bytes": bytes(range(128, 256)),
+}
+
+
+@pytest.fixture(params=["native", "python"])
+def murmur_impl(request, monkeypatch):
+    """分别以 C 扩展与纯 Python 实现运行；未安装 C 扩展时跳过前者。"""
+    if request.param == "native":
+        if mod_fingerprint._native_murmurhash2 is None:
+            pytest.skip("未安装 murmurhash2 扩展")
+    else:
+        monkeypatch.setattr(mod_fingerprint, "_native_murmurhash2", None)
+    return request.param
+
+
+def _fingerprint_file(path, chunk_size: int) -> str:
+    with JarFileFingerprinter(path, chunk_size) as fingerprinter:
+        fingerprinter.modrinth_hash()
+        return fingerprinter.curseforge_hash()
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_edge_cases_match_reference(name, murmur_impl, tmp_path):
+    data = EDGE_CASES[name]
+    expected = reference_fingerprint(data)
+    assert curseforge_fingerprint_from_jar_bytes(data) == expected
+
+    path = tmp_path / f"{name}.jar"
+    path.write_bytes(data)
+    for chunk_size in (4, 8, 12, 1 << 16):
+        assert _fingerprint_file(path, chunk_size) == expected
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_fixed_jars_match_reference(seed, murmur_impl, tmp_path):
+    data = _make_jar(seed, entries=12)
+    expected = reference_fingerprint(data)
+    assert curseforge_fingerprint_from_jar_bytes(data) == expected
+
+    path = tmp_path / f"mod{seed}.jar"
+    path.write_bytes(data)
+    # 块大小不是 4 的倍数时按 4 对齐；较小的块让去空白后的尾部字节频繁跨块
+    for chunk_size in (4, 28, 4093, 1 << 16):
+        assert _fingerprint_file(path, chunk_size) == expected
+
+
+def test_read_fallback_matches_mmap(monkeypatch, tmp_path):
+    data = _make_jar(7, entries=6)
+    path = tmp_path / "mod.jar"
+    path.write_bytes(data)
+    expected = reference_fingerprint(data)
+
+    def _refuse_mmap(*args, **kwargs):
+        raise OSError("mmap 不可用")
+
+    monkeypatch.setattr(mod_fingerprint.mmap, "mmap", _refuse_mmap)
+    assert _fingerprint_file(path, 64) == expected
+
+
+@pytest.mark.parametrize("size", range(0, 24))
+def test_stream_split_points_match_one_shot(size, murmur_impl):
+    data = bytes(random.Random(size).randrange(256) for _ in range(size))
+    expected = murmurhash2(data, 1)
+    for split in range(len(data) + 1):
+        stream = Murmur2Stream(len(data), 1)
+        stream.update(data[:split])
+        stream.update(data[split:])
+        assert stream.digest() == expected
+
+
+def test_stream_rejects_wrong_length():
+    stream = Murmur2Stream(8, 1)
+    stream.update(b"abc")
+    with pytest.raises(ValueError):
+        stream.digest()
+
+
+def test_random_data_matches_reference(murmur_impl):
+    for seed in range(20):
+        data = _random_bytes(seed, random.Random(seed).randint(0, 3000))
+        assert curseforge_fingerprint_from_jar_bytes(data) == reference_fingerprint(data)
+
+
+def test_known_values(murmur_impl):
+    # 由改写前的实现算出的固定值，防止对照实现与新实现一起改错
+    assert curseforge_fingerprint_from_jar_bytes(b"") == "0"
+    assert curseforge_fingerprint_from_jar_bytes(b"hello world") == "2824650221"
+    assert curseforge_fingerprint_from_jar_bytes(b"abc\ndefg") == "184182053"
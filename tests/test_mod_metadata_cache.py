@@ -0,0 +1,109 @@
+"""模组元数据缓存：经 Extractor._resolve_mod_names 对本地桩服务查询，验证命中、负向结果与有效期。"""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.extractor import Extractor
+from core.mod_repository import CurseForgeClient, ModrinthClient
+from utils import config_manager, mod_metadata_cache
+from utils.mod_metadata_cache import PROVIDER_CURSEFORGE, PROVIDER_MODRINTH
+
+TTL_HOURS = 10
+NEGATIVE_TTL_HOURS = 1
+
+# cf.jar 由 CurseForge 匹配；mr.jar 在 CurseForge 未收录，由 Modrinth 匹配
+MOD_INFO_BY_JAR = {
+    "cf.jar": {"curseforge_hash": "123", "modrinth_hash": "def"},
+    "mr.jar": {"curseforge_hash": "456", "modrinth_hash": "abc"},
+}
+
+
+@pytest.fixture(autouse=True)
+def metadata_settings(http_settings, monkeypatch, tmp_path):
+    http_settings.update(mod_metadata_cache_ttl_hours=TTL_HOURS, mod_metadata_negative_ttl_hours=NEGATIVE_TTL_HOURS)
+    monkeypatch.setattr(config_manager, "APP_DATA_PATH", tmp_path)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可拨动的缓存时钟（只替换 mod_metadata_cache 模块看到的 time）。"""
+    now = [time.time()]
+    monkeypatch.setattr(mod_metadata_cache, "time", SimpleNamespace(time=lambda: now[0]))
+
+    def advance(hours: float) -> None:
+        now[0] += hours * 3600
+
+    return advance
+
+
+def _extractor(server, curseforge_prefix: str = "", modrinth_prefix: str = "/v2") -> Extractor:
+    return Extractor(
+        modrinth_client=ModrinthClient(base_url=f"{server.url}{modrinth_prefix}"),
+        curseforge_client=CurseForgeClient(base_url=f"{server.url}{curseforge_prefix}", api_key="key"),
+    )
+
+
+def _resolve(extractor: Extractor) -> dict[str, str]:
+    module_names, _, _ = extractor._resolve_mod_names(
+        MOD_INFO_BY_JAR, ["123", "456"], ["def", "abc"], extraction_progress_callback=None
+    )
+    return {entry["source"]: entry["name"] for entry in module_names}
+
+
+def _lookup(provider: str, hashes: list[str]) -> tuple[dict, set]:
+    cache = mod_metadata_cache.ModMetadataCache.from_config()
+    cache.load()
+    try:
+        return cache.lookup(provider, hashes)
+    finally:
+        cache.close()
+
+
+def test_second_resolve_is_served_from_cache(server):
+    extractor = _extractor(server)
+    names = _resolve(extractor)
+    assert names == {"cf.jar": "CF Mod", "mr.jar": "Test Mod"}
+    assert sum(server.requests.values()) > 0
+
+    server.requests.clear()
+    assert _resolve(_extractor(server)) == names
+    assert sum(server.requests.values()) == 0
+
+
+def test_negative_results_are_cached_but_failures_are_not(server):
+    extractor = _extractor(server, curseforge_prefix="/broken", modrinth_prefix="/empty")
+    assert _resolve(extractor) == {"cf.jar": "cf", "mr.jar": "mr"}
+    assert server.requests["/empty/version_files"] == 1
+    assert server.requests["/broken/v1/fingerprints/432"] == 4
+
+    # 平台确认未收录的哈希记为负向结果；请求失败的哈希不写入缓存
+    assert _lookup(PROVIDER_MODRINTH, ["def", "abc"]) == ({}, {"def", "abc"})
+    assert _lookup(PROVIDER_CURSEFORGE, ["123", "456"]) == ({}, set())
+
+    _resolve(extractor)
+    assert server.requests["/empty/version_files"] == 1
+    assert server.requests["/broken/v1/fingerprints/432"] == 8
+
+
+def test_expired_entries_are_fetched_again(server, clock):
+    _resolve(_extractor(server))
+    assert server.requests["/v1/fingerprints/432"] == 1
+    assert server.requests["/v2/version_files"] == 1
+
+    # 超过负向结果有效期：CurseForge 未收录的 456 重新查询，已匹配的 123 仍取自缓存
+    clock(NEGATIVE_TTL_HOURS + 0.5)
+    server.requests.clear()
+    assert _resolve(_extractor(server)) == {"cf.jar": "CF Mod", "mr.jar": "Test Mod"}
+    assert server.requests["/v1/fingerprints/432"] == 1
+    cached, negative = _lookup(PROVIDER_CURSEFORGE, ["123", "456"])
+    assert set(cached) == {"123"} and negative == {"456"}
+
+    # 超过正向结果有效期：全部重新查询
+    clock(TTL_HOURS)
+    server.requests.clear()
+    assert _resolve(_extractor(server)) == {"cf.jar": "CF Mod", "mr.jar": "Test Mod"}
+    assert server.requests["/v1/fingerprints/432"] == 1
+    assert server.requests["/v2/version_files"] == 1
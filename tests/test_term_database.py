@@ -0,0 +1,176 @@
+"""术语库的 SQLite 存储：旧版 JSON 迁移、导入、删除与写入失败后的重试。"""
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from core import term_database
+from core.term_database import ImportMode, TermDatabase
+
+_BROKEN_UPSERT_SQL = "INSERT INTO no_such_table VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+@pytest.fixture
+def paths(monkeypatch, tmp_path):
+    db_path = tmp_path / "term_database.db"
+    json_path = tmp_path / "term_database.json"
+    monkeypatch.setattr(term_database, "TERM_DATABASE_DB_PATH", db_path)
+    monkeypatch.setattr(term_database, "TERM_DATABASE_PATH", json_path)
+    monkeypatch.setattr(TermDatabase, "_instance", None)
+    yield db_path, json_path
+    _close(TermDatabase._instance)
+
+
+def _close(db: TermDatabase | None) -> None:
+    if db is not None and db._conn is not None:
+        db._conn.close()
+        db._conn = None
+
+
+def _reopen() -> TermDatabase:
+    """丢弃单例，按磁盘上的数据库重新创建，相当于重启程序。"""
+    _close(TermDatabase._instance)
+    TermDatabase._instance = None
+    return TermDatabase()
+
+
+def _stored(db_path) -> dict[str, list[str]]:
+    with sqlite3.connect(db_path) as conn:
+        return {original: json.loads(translation) for original, translation in conn.execute("SELECT original, translation FROM terms")}
+
+
+def _in_memory(db: TermDatabase) -> dict[str, list[str]]:
+    return {term["original"]: term["translation"] for term in db.terms}
+
+
+def _write_import_file(tmp_path, terms: list[dict]) -> str:
+    path = tmp_path / "import.json"
+    path.write_text(json.dumps(terms, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def break_writes(monkeypatch):
+    """返回开关：break_writes(True) 后写入语句失败，模拟磁盘或数据库错误。"""
+    original_sql = term_database._UPSERT_SQL
+
+    def toggle(broken: bool) -> None:
+        monkeypatch.setattr(term_database, "_UPSERT_SQL", _BROKEN_UPSERT_SQL if broken else original_sql)
+
+    return toggle
+
+
+def test_legacy_json_is_migrated_once(paths):
+    db_path, json_path = paths
+    json_path.write_text(json.dumps([
+        {"id": "legacy01", "original": "Iron", "translation": "铁", "comment": "旧格式"},
+        {"original": "Gear", "translation": ["齿轮", "齿"]},
+        {"original": "", "translation": "空"},
+        "not a term",
+    ], ensure_ascii=False), encoding="utf-8")
+
+    db = TermDatabase()
+    assert _in_memory(db) == {"Iron": ["铁"], "Gear": ["齿轮", "齿"]}
+    assert db.get_term_by_id("legacy01")["comment"] == "旧格式"
+    assert _stored(db_path) == {"Iron": ["铁"], "Gear": ["齿轮", "齿"]}
+
+    # 数据库已存在时不再读取 JSON
+    json_path.write_text(json.dumps([{"original": "Pipe", "translation": "管道"}]), encoding="utf-8")
+    assert _in_memory(_reopen()) == {"Iron": ["铁"], "Gear": ["齿轮", "齿"]}
+
+
+def test_full_import_replaces_table_in_one_commit(paths, tmp_path):
+    db_path, _ = paths
+    db = TermDatabase()
+    db.add_terms_batch([{"original": "Iron", "translation": "铁"}, {"original": "Gear", "translation": "齿轮"}])
+
+    statements: list[str] = []
+    db._conn.set_trace_callback(statements.append)
+    import_file = _write_import_file(tmp_path, [
+        {"original": "Gear", "translation": ["齿轮组"]},
+        {"original": "Pipe", "translation": "管道"},
+    ])
+    result = db.import_terms(import_file, ImportMode.FULL)
+    db._conn.set_trace_callback(None)
+
+    assert (result.success_count, result.failure_count) == (2, 0)
+    assert statements.count("COMMIT") == 1
+    assert _in_memory(db) == _stored(db_path) == {"Gear": ["齿轮组"], "Pipe": ["管道"]}
+    assert _in_memory(_reopen()) == {"Gear": ["齿轮组"], "Pipe": ["管道"]}
+
+
+def test_incremental_import_merges_translations(paths, tmp_path):
+    db_path, _ = paths
+    db = TermDatabase()
+    db.add_term("Iron", "铁")
+    db.add_term("Gear", "齿轮")
+
+    import_file = _write_import_file(tmp_path, [
+        {"original": "iron", "translation": ["铁", "铁锭"], "comment": "金属"},
+        {"original": "Gear", "translation": "齿轮"},
+        {"original": "Pipe", "translation": "管道"},
+        {"original": "Broken"},
+    ])
+    result = db.import_terms(import_file, ImportMode.INCREMENTAL)
+
+    assert (result.success_count, result.updated_count, result.skipped_count, result.failure_count) == (1, 1, 1, 1)
+    expected = {"Iron": ["铁", "铁锭"], "Gear": ["齿轮"], "Pipe": ["管道"]}
+    assert _in_memory(db) == _stored(db_path) == expected
+    reopened = _reopen()
+    assert _in_memory(reopened) == expected
+    assert reopened._find_term_by_original("IRON")["comment"] == "金属"
+
+
+def test_delete_then_reload(paths):
+    db_path, _ = paths
+    db = TermDatabase()
+    iron = db.add_term("Iron", "铁")
+    db.add_term("Gear", "齿轮")
+
+    assert db.delete_term(iron["id"])
+    assert not db.delete_term(iron["id"])
+    db.reload()
+    assert _in_memory(db) == _stored(db_path) == {"Gear": ["齿轮"]}
+    assert db._find_term_by_original("Iron") is None
+    assert _in_memory(_reopen()) == {"Gear": ["齿轮"]}
+
+
+def test_failed_save_keeps_pending_edits(paths, break_writes):
+    db_path, _ = paths
+    db = TermDatabase()
+    iron = db.add_term("Iron", "铁")
+
+    break_writes(True)
+    db.add_term("Gear", "齿轮")
+    db.update_term(iron["id"], translation=["铁锭"])
+    assert not db.save_terms()
+    assert _stored(db_path) == {"Iron": ["铁"]}
+
+    # 重新加载会丢弃未写入的改动，应拒绝并保留内存中的术语
+    db.reload()
+    assert _in_memory(db) == {"Iron": ["铁锭"], "Gear": ["齿轮"]}
+
+    break_writes(False)
+    assert db.save_terms()
+    assert _stored(db_path) == {"Iron": ["铁锭"], "Gear": ["齿轮"]}
+    assert _in_memory(_reopen()) == {"Iron": ["铁锭"], "Gear": ["齿轮"]}
+
+
+def test_failed_full_import_leaves_table_untouched(paths, tmp_path, break_writes):
+    db_path, _ = paths
+    db = TermDatabase()
+    db.add_term("Iron", "铁")
+
+    break_writes(True)
+    db.import_terms(_write_import_file(tmp_path, [{"original": "Pipe", "translation": "管道"}]), ImportMode.FULL)
+    # 清空与写入在同一事务中，写入失败时旧术语仍在
+    assert _stored(db_path) == {"Iron": ["铁"]}
+    db.reload()
+    assert _in_memory(db) == {"Pipe": ["管道"]}
+
+    break_writes(False)
+    assert db.save_terms()
+    assert _stored(db_path) == {"Pipe": ["管道"]}
+    assert _in_memory(_reopen()) == {"Pipe": ["管道"]}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import json
-import sqlite3
 from pathlib import Path
 import logging
 import os
@@ -20,28 +19,6 @@ USER_DICT_PATH = APP_DATA_PATH / "Dict-User.db"
 
 _config_cache: dict | None = None
 _config_cache_mtime: float = 0.0
-
-def _init_user_dict_db():
-    conn = sqlite3.connect(USER_DICT_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS by_key (
-        key TEXT PRIMARY KEY,
-        translation TEXT NOT NULL
-    )
-    ''')
-
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS by_origin_name (
-        origin_name TEXT PRIMARY KEY,
-        translation TEXT NOT NULL
-    )
-    ''')
-
-    conn.commit()
-    conn.close()
-
 DEFAULT_PROMPT = """
 你是 Minecraft（我的世界）本地化专家，只输出 JSON。
 任务：将输入 JSON 对象中每个数字键对应的英文文本翻译为简体中文。
@@ -128,6 +105,18 @@ DEFAULT_CONFIG = {
     "ai_batch_items": 200,
     "ai_batch_words": 2000,
     "curseforge_api_key": "",
+    "extractor_scan_mode": "auto",
+    "translator_decision_mode": "auto",
+    "translator_incremental": True,
+    "community_dict_load_mode": "auto",
+    "dictionary_prefetch": True,
+    "mod_metadata_cache_ttl_hours": 168,
+    "mod_metadata_negative_ttl_hours": 24,
+    "http_pool_maxsize": 16,
+    "http_max_per_host": 8,
+    "http_connect_timeout": 10,
+    "http_read_timeout": 30,
+    "http_max_retries": 3,
 }
 
 def _get_builtin_curseforge_key() -> str | None:
@@ -315,51 +304,25 @@ def update_config_batch(updates: dict) -> dict:
     return config
 
 def load_user_dict() -> dict:
-    _init_user_dict_db()
-
-    conn = sqlite3.connect(USER_DICT_PATH)
-    cursor = conn.cursor()
+    from utils.user_dict_store import user_dict_store
+    return user_dict_store.load_all()
 
-    cursor.execute("SELECT key, translation FROM by_key")
-    by_key = {row[0]: row[1] for row in cursor.fetchall()}
+def user_dict_generation() -> int:
+    from utils.user_dict_store import user_dict_store
+    return user_dict_store.generation
 
-    cursor.execute("SELECT origin_name, translation FROM by_origin_name")
-    by_origin_name = {row[0]: row[1] for row in cursor.fetchall()}
-
-    conn.close()
-
-    return {"by_key": by_key, "by_origin_name": by_origin_name}
+def update_user_dict(upserts: dict | None = None, deletes: dict | None = None):
+    """增量保存个人词典：upserts 为 {'by_key': {...}, 'by_origin_name': {...}}，deletes 为同结构的名称列表。"""
+    from utils.user_dict_store import user_dict_store
+    try:
+        return user_dict_store.apply_changes(upserts, deletes)
+    except Exception as e:
+        logging.error(f"保存用户个人词典时出错：{e}")
+        return None
 
 def save_user_dict(dict_data: dict):
+    from utils.user_dict_store import user_dict_store
     try:
-        _init_user_dict_db()
-
-        conn = sqlite3.connect(USER_DICT_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT key FROM by_key")
-        existing_keys = set(row[0] for row in cursor.fetchall())
-
-        cursor.execute("SELECT origin_name FROM by_origin_name")
-        existing_origins = set(row[0] for row in cursor.fetchall())
-
-        new_keys = set(dict_data.get("by_key", {}).keys())
-
-        for key in existing_keys - new_keys:
-            cursor.execute("DELETE FROM by_key WHERE key = ?", (key,))
-
-        for key, translation in dict_data.get("by_key", {}).items():
-            cursor.execute("INSERT OR REPLACE INTO by_key (key, translation) VALUES (?, ?)", (key, translation))
-
-        new_origins = set(dict_data.get("by_origin_name", {}).keys())
-
-        for origin_name in existing_origins - new_origins:
-            cursor.execute("DELETE FROM by_origin_name WHERE origin_name = ?", (origin_name,))
-
-        for origin_name, translation in dict_data.get("by_origin_name", {}).items():
-            cursor.execute("INSERT OR REPLACE INTO by_origin_name (origin_name, translation) VALUES (?, ?)", (origin_name, translation))
-
-        conn.commit()
-        conn.close()
+        user_dict_store.replace_all(dict_data)
     except Exception as e:
         logging.error(f"保存用户个人词典时出错：{e}")
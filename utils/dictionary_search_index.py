@@ -0,0 +1,361 @@
+"""
+社区词典搜索索引：由 Dict-Sqlite.db 派生的 SQLite FTS5 (trigram) 索引库，存放在应用数据目录。
+
+- entries 按原文长度（相同时按原库顺序）排序存放，rank 即排序位置；zh_order 给出按译文长度的排序。
+- en_fts / zh_fts 是无内容 (contentless) 的 trigram 索引，rowid 分别取两种排序下的位置，
+  MATCH ... ORDER BY rowid LIMIT k 直接得到最短的 k 条，命中再多也不需要排序。
+- 结果分层：完全匹配 > 前缀匹配 > 包含，同层内按长度排列，与 LIKE 查询的排序一致。
+- 少于 3 个字符的查询用不上 trigram，改为在内存中按排序顺序查找小写文本（首次使用时载入，各实例共用）。
+
+索引文件名包含源数据库版本 (路径, mtime_ns, 大小) 与格式版本的摘要，数据库更新后对应新文件。
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any
+
+from utils import config_manager
+
+SEARCH_INDEX_DIRNAME = "dict_search_index"
+SEARCH_INDEX_FORMAT_VERSION = 1
+# trigram 分词器要求查询至少 3 个字符
+_TRIGRAM_MIN_CHARS = 3
+# 长查询只取这么多个 trigram 检索候选，其余交给逐条核对
+_MAX_MATCH_TERMS = 4
+
+_build_lock = threading.Lock()
+_builds_lock = threading.Lock()
+_builds_running: set[str] = set()
+_short_text_lock = threading.Lock()
+_short_text_cache: dict[str, dict[str, tuple[str, array]]] = {}
+
+_SCHEMA = """
+CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE entries (rank INTEGER PRIMARY KEY, source_id INTEGER, key TEXT, origin_name TEXT, trans_name TEXT, version TEXT);
+INSERT INTO entries (source_id, key, origin_name, trans_name, version)
+    SELECT rowid, key, origin_name, trans_name, version FROM src.dict
+    ORDER BY length(coalesce(origin_name, '')), rowid;
+CREATE INDEX entries_key ON entries (key);
+CREATE TABLE zh_order (rank INTEGER PRIMARY KEY, entry_rank INTEGER NOT NULL);
+INSERT INTO zh_order (entry_rank)
+    SELECT rank FROM entries WHERE trans_name IS NOT NULL AND trans_name != ''
+    ORDER BY length(trans_name), source_id;
+CREATE VIRTUAL TABLE en_fts USING fts5 (origin_name, key, content='', tokenize='trigram');
+CREATE VIRTUAL TABLE zh_fts USING fts5 (trans_name, content='', tokenize='trigram');
+INSERT INTO en_fts (rowid, origin_name, key) SELECT rank, origin_name, key FROM entries;
+INSERT INTO zh_fts (rowid, trans_name)
+    SELECT z.rank, e.trans_name FROM zh_order z JOIN entries e ON e.rank = z.entry_rank;
+INSERT INTO en_fts (en_fts) VALUES ('optimize');
+INSERT INTO zh_fts (zh_fts) VALUES ('optimize');
+"""
+
+
+def index_dir() -> Path:
+    return config_manager.APP_DATA_PATH / SEARCH_INDEX_DIRNAME
+
+
+def _db_revision(db_path: Path) -> tuple:
+    st = db_path.stat()
+    return (str(db_path), st.st_mtime_ns, st.st_size)
+
+
+def index_path(db_path: str | Path) -> Path:
+    revision = _db_revision(Path(db_path))
+    digest = hashlib.sha1(f"{SEARCH_INDEX_FORMAT_VERSION}|{revision!r}".encode("utf-8")).hexdigest()[:16]
+    return index_dir() / f"community_search_{digest}.db"
+
+
+def _text_contains(text: str | None, needle: str) -> bool:
+    return text is not None and needle in text.lower()
+
+
+def _text_startswith(text: str | None, needle: str) -> bool:
+    return text is not None and text.lower().startswith(needle)
+
+
+def _phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+class DictionarySearchIndex:
+    """打开的搜索索引；查询结果为 {KEY, ORIGIN_NAME, TRANS_NAME, VERSION} 字典，与 DictionarySearcher 一致。"""
+
+    def __init__(self, path: Path, conn: sqlite3.Connection):
+        self.path = path
+        self.conn = conn
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, db_path: str | Path) -> DictionarySearchIndex | None:
+        """打开与 db_path 当前版本对应的索引；索引不存在或格式不符时返回 None。"""
+        try:
+            path = index_path(db_path)
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            row = conn.execute("SELECT value FROM meta WHERE name = 'format_version'").fetchone()
+            if not row or row[0] != str(SEARCH_INDEX_FORMAT_VERSION):
+                conn.close()
+                return None
+        except sqlite3.Error as e:
+            logging.debug(f"社区词典搜索索引不可用: {path} - {e}")
+            return None
+        # trigram 只负责筛出候选，是否真正包含查询串由这两个函数核对（与短查询一样按 str.lower 比较）
+        conn.create_function("text_contains", 2, _text_contains, deterministic=True)
+        conn.create_function("text_startswith", 2, _text_startswith, deterministic=True)
+        return cls(path, conn)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def search_english(self, query: str, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """按原文或 Key 搜索：原文完全匹配 > Key 完全匹配 > 原文前缀 > 原文或 Key 包含。"""
+        query = query.strip()
+        if not query:
+            return []
+        need = offset + limit
+        with self._lock:
+            if len(query) >= _TRIGRAM_MIN_CHARS:
+                needle = query.lower()
+                prefix = self._match_ranks("en", needle, need, prefix=True)
+                contains = self._match_ranks("en", needle, need, prefix=False)
+            else:
+                prefix, contains = self._short_ranks("en", query.lower(), need)
+            ranks = self._rank_tiers(query, prefix, need)
+            ranks.extend(contains)
+            return self._fetch(_unique(ranks)[offset:need])
+
+    def search_chinese(self, query: str, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """按译文搜索：完全匹配 > 前缀 > 包含。"""
+        query = query.strip()
+        if not query:
+            return []
+        need = offset + limit
+        with self._lock:
+            if len(query) >= _TRIGRAM_MIN_CHARS:
+                needle = query.lower()
+                prefix = self._match_ranks("zh", needle, need, prefix=True)
+                contains = self._match_ranks("zh", needle, need, prefix=False)
+            else:
+                prefix, contains = self._short_ranks("zh", query.lower(), need)
+            ranks = _unique(prefix + contains)[offset:need]
+            if not ranks:
+                return []
+            placeholders = ",".join("?" * len(ranks))
+            mapping = dict(self.conn.execute(
+                f"SELECT rank, entry_rank FROM zh_order WHERE rank IN ({placeholders})", ranks
+            ).fetchall())
+            return self._fetch([mapping[rank] for rank in ranks if rank in mapping])
+
+    def _match_ranks(self, column: str, needle: str, need: int, prefix: bool) -> list[int]:
+        """
+        取包含 needle（prefix=True 时为以 needle 开头）的前 need 个位置。
+
+        查询串中每隔 3 个字符取一个 trigram（再加上末尾的一个，最多 _MAX_MATCH_TERMS 个）做 AND 检索，
+        候选按 rowid 顺序在 SQLite 内逐条核对原文，凑够 need 条即停止。
+        与逐个 trigram 的短语查询相比，长查询需要合并的倒排列表少得多。
+        """
+        grams = [needle[i:i + 3] for i in range(0, len(needle) - 2, 3)]
+        if (len(needle) - 3) % 3:
+            grams.append(needle[-3:])
+        if len(grams) > _MAX_MATCH_TERMS:
+            step = (len(grams) - 1) / (_MAX_MATCH_TERMS - 1)
+            grams = [grams[round(i * step)] for i in range(_MAX_MATCH_TERMS)]
+        terms = [_phrase(gram) for gram in grams]
+        if prefix:
+            terms[0] = "^" + terms[0]
+
+        if column == "en":
+            table, source = "en_fts", "en_fts f JOIN entries e ON e.rank = f.rowid"
+            if prefix:
+                columns, condition, params = "{origin_name}", "text_startswith(e.origin_name, ?)", (needle,)
+            else:
+                columns, condition, params = "{origin_name key}", "(text_contains(e.origin_name, ?) OR text_contains(e.key, ?))", (needle, needle)
+        else:
+            table = "zh_fts"
+            source = "zh_fts f JOIN zh_order z ON z.rank = f.rowid JOIN entries e ON e.rank = z.entry_rank"
+            columns = "{trans_name}"
+            condition = "text_startswith(e.trans_name, ?)" if prefix else "text_contains(e.trans_name, ?)"
+            params = (needle,)
+        expression = f"{columns}: ({' AND '.join(terms)})"
+        try:
+            rows = self.conn.execute(
+                f"SELECT f.rowid FROM {source} WHERE {table} MATCH ? AND {condition} ORDER BY f.rowid LIMIT ?",
+                (expression, *params, need),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logging.debug(f"搜索索引查询失败: {expression} - {e}")
+            return []
+        return [row[0] for row in rows]
+
+    def _rank_tiers(self, query: str, prefix: list[int], need: int) -> list[int]:
+        """前缀结果中长度与查询相同的即完全匹配；Key 完全匹配插在两者之间。"""
+        exact_key = [row[0] for row in self.conn.execute(
+            "SELECT rank FROM entries WHERE key = ? ORDER BY rank LIMIT ?", (query, need)
+        ).fetchall()]
+        if not prefix:
+            return exact_key
+        placeholders = ",".join("?" * len(prefix))
+        lengths = dict(self.conn.execute(
+            f"SELECT rank, length(origin_name) FROM entries WHERE rank IN ({placeholders})", prefix
+        ).fetchall())
+        exact = [rank for rank in prefix if lengths.get(rank) == len(query)]
+        rest = [rank for rank in prefix if lengths.get(rank) != len(query)]
+        return exact + exact_key + rest
+
+    def _short_ranks(self, column: str, needle: str, need: int) -> tuple[list[int], list[int]]:
+        """短查询：在按排序顺序拼接的小写文本中查找，返回 (前缀命中, 包含命中) 的位置。"""
+        if "\n" in needle:
+            return [], []
+        # 英文按原文与 Key 两段文本分别查找后合并；各段结果都按位置有序，合并后取前 need 个即可
+        fields = ("origin_name", "key") if column == "en" else ("trans_name",)
+        texts = [self._short_text(field) for field in fields]
+        prefix = _find_lines(*texts[0], "\n" + needle, need)
+        contains = sorted(set().union(*(_find_lines(text, starts, needle, need) for text, starts in texts)))[:need]
+        return prefix, contains
+
+    def _short_text(self, field: str) -> tuple[str, array]:
+        cache_key = str(self.path)
+        with _short_text_lock:
+            cached = _short_text_cache.get(cache_key)
+            if cached is None:
+                _short_text_cache.clear()
+                cached = _short_text_cache[cache_key] = {}
+            if field not in cached:
+                if field == "trans_name":
+                    rows = self.conn.execute(
+                        "SELECT e.trans_name FROM zh_order z JOIN entries e ON e.rank = z.entry_rank ORDER BY z.rank"
+                    )
+                else:
+                    rows = self.conn.execute(f"SELECT {field} FROM entries ORDER BY rank")
+                cached[field] = _join_lines(row[0] for row in rows)
+            return cached[field]
+
+    def _fetch(self, ranks: list[int]) -> list[dict[str, Any]]:
+        if not ranks:
+            return []
+        placeholders = ",".join("?" * len(ranks))
+        rows = {row[0]: row for row in self.conn.execute(
+            f"SELECT rank, key, origin_name, trans_name, version FROM entries WHERE rank IN ({placeholders})", ranks
+        ).fetchall()}
+        return [
+            {"KEY": row[1], "ORIGIN_NAME": row[2], "TRANS_NAME": row[3], "VERSION": row[4]}
+            for row in (rows.get(rank) for rank in ranks) if row is not None
+        ]
+
+
+def _unique(ranks: list[int]) -> list[int]:
+    return list(dict.fromkeys(ranks))
+
+
+def _find_lines(text: str, starts: array, pattern: str, need: int) -> list[int]:
+    """按顺序返回含 pattern 的前 need 行的 rank，每行只计一次。"""
+    found: list[int] = []
+    position = 0
+    while len(found) < need:
+        position = text.find(pattern, position)
+        if position < 0:
+            break
+        line = bisect_right(starts, position)
+        found.append(line)
+        position = starts[line] if line < len(starts) else len(text)
+    return found
+
+
+def _join_lines(lines) -> tuple[str, array]:
+    """
+    拼接为 "\\n行1\\n行2..." 的小写文本；starts[i] 为第 i+1 行（rank = i+1）开头换行符的位置，
+    因此 bisect_right(starts, pos) 即为 pos 所在行的 rank。
+    """
+    parts: list[str] = []
+    starts = array("q")
+    position = 0
+    for line in lines:
+        line = (line or "").lower().replace("\n", " ")
+        starts.append(position)
+        parts.append("\n" + line)
+        position += len(line) + 1
+    return "".join(parts), starts
+
+
+def build_search_index(db_path: str | Path) -> bool:
+    """为 db_path 的当前版本生成搜索索引；同一索引不会被并发重复生成。"""
+    db_path = Path(db_path)
+    if not db_path.is_file():
+        return False
+    try:
+        revision = _db_revision(db_path)
+        path = index_path(db_path)
+        with _build_lock:
+            if path.is_file():
+                return True
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.unlink(missing_ok=True)
+            conn = sqlite3.connect(f"file:{tmp_path}", uri=True)
+            try:
+                conn.execute("PRAGMA journal_mode = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                conn.execute("ATTACH DATABASE ? AS src", (f"file:{db_path}?mode=ro",))
+                conn.executescript(_SCHEMA)
+                conn.execute("INSERT INTO meta (name, value) VALUES ('format_version', ?)", (str(SEARCH_INDEX_FORMAT_VERSION),))
+                conn.commit()
+                conn.execute("DETACH DATABASE src")
+            finally:
+                conn.close()
+            os.replace(tmp_path, path)
+        if _db_revision(db_path) != revision:
+            logging.info("生成搜索索引期间社区词典已变化，索引将在下次使用时重新生成")
+            return False
+        remove_stale_indexes(keep=path)
+        logging.info(f"社区词典搜索索引已生成: {path}")
+        return True
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"生成社区词典搜索索引失败: {e}")
+        return False
+
+
+def search_index_building(db_path: str | Path) -> bool:
+    with _builds_lock:
+        return str(db_path) in _builds_running
+
+
+def build_search_index_in_background(db_path: str | Path) -> None:
+    key = str(db_path)
+    with _builds_lock:
+        if key in _builds_running:
+            return
+        _builds_running.add(key)
+
+    def _build():
+        try:
+            build_search_index(db_path)
+        finally:
+            with _builds_lock:
+                _builds_running.discard(key)
+
+    threading.Thread(target=_build, name="community-dict-search-index", daemon=True).start()
+
+
+def remove_stale_indexes(keep: Path) -> None:
+    for candidate in index_dir().glob("community_search_*"):
+        if candidate == keep:
+            continue
+        try:
+            candidate.unlink()
+        except OSError:
+            # Windows 上仍被打开的旧索引无法删除，下次再清理
+            pass
@@ -3,11 +3,15 @@ import sqlite3
 import logging
 from pathlib import Path
 from typing import Any
+from utils.dictionary_search_index import DictionarySearchIndex, build_search_index_in_background, search_index_building
 
 class DictionarySearcher:
     def __init__(self, db_path: str | Path):
         self.db_path = Path(db_path) if db_path else None
         self.conn = None
+        # 全文索引可用时查询走索引；尚未生成时退回 LIKE 查询。
+        # 生成索引耗时较长、占用较多磁盘，只在调用 build_index_in_background 时进行，打开查询器本身不会触发
+        self.index: DictionarySearchIndex | None = None
         if self.db_path and self.db_path.exists():
             try:
                 self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
@@ -16,12 +20,25 @@ class DictionarySearcher:
             except sqlite3.Error as e:
                 logging.error(f"无法以只读模式连接到词典数据库: {self.db_path}. 错误: {e}")
                 self.conn = None
+            if self.conn is not None:
+                self.index = DictionarySearchIndex.open(self.db_path)
         elif not self.db_path:
             logging.warning("词典路径未配置，查询功能将不可用。")
         else:
             logging.warning(f"提供的词典路径不存在: {self.db_path}，查询功能将不可用。")
     def is_available(self) -> bool:
         return self.conn is not None
+    def build_index_in_background(self) -> None:
+        """在后台生成全文索引；完成后调用 refresh_index 切换到索引查询。"""
+        if self.is_available() and self.index is None:
+            build_search_index_in_background(self.db_path)
+    def is_index_building(self) -> bool:
+        return self.db_path is not None and search_index_building(self.db_path)
+    def refresh_index(self) -> bool:
+        """索引已生成时打开它，返回索引是否可用。"""
+        if self.index is None and self.is_available():
+            self.index = DictionarySearchIndex.open(self.db_path)
+        return self.index is not None
     def _execute_query(self, sql: str, params: tuple) -> list[dict[str, Any]]:
         if not self.is_available():
             return []
@@ -33,8 +50,10 @@ class DictionarySearcher:
         except sqlite3.Error as e:
             logging.error(f"执行词典查询时发生致命错误: {e}", exc_info=True)
         return []
-    def search_by_english(self, query: str, limit: int = 100) -> list[dict[str, Any]]:
+    def search_by_english(self, query: str, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
         if not query.strip(): return []
+        if self.index is not None:
+            return self.index.search_english(query, limit, offset)
         search_term = f"%{query.strip()}%"
         sql = """
         SELECT KEY, ORIGIN_NAME, TRANS_NAME, VERSION
@@ -45,12 +64,14 @@ class DictionarySearcher:
             CASE WHEN KEY = ? THEN 2 ELSE 3 END,
             CASE WHEN ORIGIN_NAME LIKE ? THEN 4 ELSE 5 END,
             LENGTH(ORIGIN_NAME)
-        LIMIT ?
+        LIMIT ? OFFSET ?
         """
-        params = (search_term, search_term, query, query, f"{query}%", limit)
+        params = (search_term, search_term, query, query, f"{query}%", limit, offset)
         return self._execute_query(sql, params)
-    def search_by_chinese(self, query: str, limit: int = 100) -> list[dict[str, Any]]:
+    def search_by_chinese(self, query: str, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
         if not query.strip(): return []
+        if self.index is not None:
+            return self.index.search_chinese(query, limit, offset)
         search_term = f"%{query.strip()}%"
         sql = """
         SELECT KEY, ORIGIN_NAME, TRANS_NAME, VERSION
@@ -60,11 +81,14 @@ class DictionarySearcher:
             CASE WHEN TRANS_NAME = ? THEN 0 ELSE 1 END,
             CASE WHEN TRANS_NAME LIKE ? THEN 2 ELSE 3 END,
             LENGTH(TRANS_NAME)
-        LIMIT ?
+        LIMIT ? OFFSET ?
         """
-        params = (search_term, query, f"{query}%", limit)
+        params = (search_term, query, f"{query}%", limit, offset)
         return self._execute_query(sql, params)
     def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
         if self.conn:
             self.conn.close()
             self.conn = None
@@ -1,34 +1,43 @@
 from __future__ import annotations
 import json
+import os
 import re
 import sys
 from pathlib import Path
 import logging
 
-_UNICODE_ESCAPE_RE = re.compile(r'\\u([0-9a-fA-F]{4})')
-_ESCAPE_PLACEHOLDER_MAP = {
-    '\\n': '\x00NL\x00',
-    '\\t': '\x00TB\x00',
-    '\\r': '\x00CR\x00',
-}
-_ESCAPE_RESTORE_MAP = {v: k for k, v in _ESCAPE_PLACEHOLDER_MAP.items()}
-_ESCAPE_PLACEHOLDER_RE = re.compile(r'\x00(NL|TB|CR)\x00')
+# 单遍处理 JSON 字符串转义：\uXXXX（含代理对）解码，\" 还原为引号，其余转义（\n、\t、\\ 等）保持原样
+_JSON_ESCAPE_RE = re.compile(r'\\(?:u([0-9a-fA-F]{4})(?:\\u([dD][c-fC-F][0-9a-fA-F]{2}))?|(.))', re.DOTALL)
+
+
+def normalize_path_key(path: Path | str) -> str:
+    """缓存用的路径主键：规范化后的绝对路径（Windows 下不区分大小写）。"""
+    return os.path.normcase(os.path.abspath(str(path)))
 
 
 def is_frozen() -> bool:
     return getattr(sys, 'frozen', False) or getattr(sys, 'nuitka', False)
 
 
+def _decode_json_escape(match: re.Match) -> str:
+    high = match.group(1)
+    if high is not None:
+        code = int(high, 16)
+        low = match.group(2)
+        if low is None:
+            return chr(code)
+        if 0xD800 <= code <= 0xDBFF:
+            return chr(0x10000 + ((code - 0xD800) << 10) + (int(low, 16) - 0xDC00))
+        return chr(code) + chr(int(low, 16))
+    if match.group(3) == '"':
+        return '"'
+    return match.group(0)
+
+
 def decode_json_value_with_unicode(value: str) -> str:
-    if not value:
+    if not value or '\\' not in value:
         return value
-    # 用单次 re.sub 替代多次 str.replace
-    for escaped, placeholder in _ESCAPE_PLACEHOLDER_MAP.items():
-        value = value.replace(escaped, placeholder)
-    value = _UNICODE_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), value)
-    value = _ESCAPE_PLACEHOLDER_RE.sub(lambda m: _ESCAPE_RESTORE_MAP[m.group(0)], value)
-    value = value.replace('\\"', '"')
-    return value
+    return _JSON_ESCAPE_RE.sub(_decode_json_escape, value)
 
 
 def load_json(file_path: Path) -> dict | None:
@@ -0,0 +1,117 @@
+"""
+进程级共享 HTTP 会话。
+
+所有对外请求（Modrinth / CurseForge / GitHub / 更新检查 / 模组搜索与下载）共用一个 requests.Session，
+按主机复用 keep-alive 连接，避免每次请求重新握手 TCP 与 TLS。
+
+可配置项（config.json）：
+- http_pool_maxsize：每个主机保留的最大连接数；
+- http_max_per_host：每个主机同时进行中的请求数上限（流式响应只计到响应头返回为止）；
+- http_connect_timeout / http_read_timeout：调用方未指定 timeout 时使用的默认超时（秒）；
+- http_max_retries：连接阶段失败时由适配器自动重试的次数。
+配置变化后，下一次请求会重建会话。
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import config_manager
+
+USER_AGENT = "Modpack-Localizer"
+
+
+class HttpClient:
+
+    _instance: HttpClient | None = None
+    _creation_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._creation_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._session: requests.Session | None = None
+        self._settings: tuple | None = None
+        self._session_lock = threading.Lock()
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+
+    @staticmethod
+    def _load_settings() -> tuple[int, int, float, float, int]:
+        config = config_manager.load_config()
+        return (
+            max(1, int(config.get("http_pool_maxsize", 16))),
+            max(1, int(config.get("http_max_per_host", 8))),
+            float(config.get("http_connect_timeout", 10)),
+            float(config.get("http_read_timeout", 30)),
+            max(0, int(config.get("http_max_retries", 3))),
+        )
+
+    def get_session(self) -> requests.Session:
+        return self._session_and_settings()[0]
+
+    def _session_and_settings(self) -> tuple[requests.Session, tuple[int, int, float, float, int]]:
+        settings = self._load_settings()
+        with self._session_lock:
+            if self._session is None or settings != self._settings:
+                if self._session is not None:
+                    self._session.close()
+                pool_maxsize, max_per_host, _, _, max_retries = settings
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=pool_maxsize,
+                    pool_maxsize=pool_maxsize,
+                    max_retries=max_retries,
+                    pool_block=False,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = f"{USER_AGENT} {session.headers.get('User-Agent', '')}".strip()
+                self._session = session
+                self._settings = settings
+                self._host_limits = {}
+                logging.debug(
+                    "HTTP 会话已创建：每主机连接数 %d，每主机并发上限 %d", pool_maxsize, max_per_host
+                )
+            return self._session, settings
+
+    def _host_limit(self, url: str, max_per_host: int) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._session_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(max_per_host)
+                self._host_limits[host] = limit
+            return limit
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        session, (_, max_per_host, connect_timeout, read_timeout, _) = self._session_and_settings()
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (connect_timeout, read_timeout)
+        with self._host_limit(url, max_per_host):
+            return session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._settings = None
+                self._host_limits = {}
+
+
+http_client = HttpClient()
@@ -0,0 +1,46 @@
+"""
+JSON 语言文件的单遍分词器。
+
+一次从左到右的扫描中，每个字符串和注释都被整体消费，不会像逐位置试配的正则那样从字符串内部重新开始匹配：
+- 只产出值为字符串的 "键": "值" 对；嵌套对象中的键值对同样产出；
+- // 行注释与 /* */ 块注释被跳过，其中的内容不会成为条目；
+- 重复键按出现顺序全部产出，由调用方决定取舍；
+- 尾随逗号、非字符串值等非标准或无关内容不影响扫描。
+
+键保持原始转义形式；值默认经 decode_json_value_with_unicode 解码，decode=False 时为原文。
+start / end 为整段 "键": "值" 在原文中的区间，Builder 按区间直接替换，无需再次匹配。
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterator, NamedTuple
+
+from utils.file_utils import decode_json_value_with_unicode
+
+_STRING = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_TOKEN_RE = re.compile(
+    _STRING + r'(?:\s*:\s*' + _STRING + r')?'
+    r'|//[^\n]*'
+    r'|/\*.*?(?:\*/|\Z)',
+    re.DOTALL,
+)
+
+
+class JsonLangEntry(NamedTuple):
+    key: str
+    value: str
+    start: int
+    end: int
+
+
+def iter_json_lang_entries(content: str, decode: bool = True) -> Iterator[JsonLangEntry]:
+    for match in _TOKEN_RE.finditer(content):
+        raw_value = match.group(2)
+        if raw_value is None:
+            continue
+        yield JsonLangEntry(
+            match.group(1),
+            decode_json_value_with_unicode(raw_value) if decode else raw_value,
+            match.start(),
+            match.end(),
+        )
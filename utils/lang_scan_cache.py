@@ -0,0 +1,191 @@
+"""
+持久化缓存：按 JAR 身份保存已解析的语言文件（ZipFileResult.to_row() 行列表）。
+
+身份分两级：
+- stat 快速路径：(绝对路径, 大小, mtime_ns) 与记录一致时直接命中，完全不打开 JAR；
+- 内容摘要：stat 不一致时只读取 ZIP 中央目录，按各条目 (文件名, CRC32, 大小) 计算摘要，
+  摘要一致（如 JAR 被复制、改名或仅 touch）时复用解析结果，跳过解压与文本解析。
+
+存储为 SQLite（lang_scan_cache.db），每个 JAR 一行，载荷为 zlib 压缩的 JSON。
+第三方汉化包使用同一结构的独立库（pack_scan_cache.db），行内容为 (命名空间, 键值字典)；
+汉化包可能来自任意目录，按文件是否仍存在清理（prune_missing），模组则按所在目录清理（prune）。
+解析规则变更时提升 CACHE_SCHEMA_VERSION，旧缓存会被整体丢弃。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zipfile
+import zlib
+from pathlib import Path
+
+from utils import config_manager
+from utils.file_utils import normalize_path_key
+
+CACHE_FILENAME = "lang_scan_cache.db"
+PACK_CACHE_FILENAME = "pack_scan_cache.db"
+CACHE_SCHEMA_VERSION = 2
+
+
+def cache_path(filename: str = CACHE_FILENAME) -> Path:
+    return config_manager.APP_DATA_PATH / filename
+
+
+def archive_digest(zf: zipfile.ZipFile) -> str:
+    """以中央目录中的 (文件名, CRC32, 大小) 计算内容摘要，无需解压任何条目。"""
+    h = hashlib.sha1()
+    for info in zf.infolist():
+        h.update(f"{info.filename}\0{info.CRC:08x}\0{info.file_size}\n".encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def _encode_rows(rows: list[tuple]) -> bytes:
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _decode_rows(payload: bytes) -> list[tuple]:
+    return [tuple(row) for row in json.loads(zlib.decompress(payload).decode("utf-8"))]
+
+
+class LangScanCache:
+    """线程安全：查询在锁内完成，写入先缓冲在内存中，由 save_if_dirty 一次性提交。"""
+
+    def __init__(self, filename: str = CACHE_FILENAME):
+        self.filename = filename
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[int, int, str, bytes]] = {}
+        self.hits = 0
+        self.digest_hits = 0
+
+    def load(self) -> None:
+        path = cache_path(self.filename)
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                if version:
+                    logging.info("语言扫描缓存版本已变化 (%s -> %s)，将重新建立", version, CACHE_SCHEMA_VERSION)
+                conn.execute("DROP TABLE IF EXISTS jars")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jars ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " payload BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jars_digest ON jars(digest)")
+            conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            logging.warning("打开语言扫描缓存失败，本次将不使用缓存: %s — %s", path, e)
+            self._conn = None
+
+    def _fetch_payload(self, sql: str, params: tuple) -> bytes | None:
+        if self._conn is None:
+            return None
+        with self._lock:
+            try:
+                row = self._conn.execute(sql, params).fetchone()
+            except sqlite3.Error as e:
+                logging.debug("查询语言扫描缓存失败: %s", e)
+                return None
+        return row[0] if row else None
+
+    def _decode_or_none(self, payload: bytes | None) -> list[tuple] | None:
+        if payload is None:
+            return None
+        try:
+            return _decode_rows(payload)
+        except Exception as e:
+            logging.debug("语言扫描缓存条目损坏，忽略: %s", e)
+            return None
+
+    def get_by_stat(self, path: Path, st: os.stat_result) -> list[tuple] | None:
+        rows = self._decode_or_none(self._fetch_payload(
+            "SELECT payload FROM jars WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (normalize_path_key(path), st.st_size, st.st_mtime_ns),
+        ))
+        if rows is not None:
+            with self._lock:
+                self.hits += 1
+        return rows
+
+    def get_by_digest(self, digest: str) -> list[tuple] | None:
+        rows = self._decode_or_none(self._fetch_payload(
+            "SELECT payload FROM jars WHERE digest = ? LIMIT 1", (digest,)
+        ))
+        if rows is not None:
+            with self._lock:
+                self.digest_hits += 1
+        return rows
+
+    def put(self, path: Path, st: os.stat_result, digest: str, rows: list[tuple]) -> None:
+        payload = _encode_rows(rows)
+        with self._lock:
+            self._pending[normalize_path_key(path)] = (st.st_size, st.st_mtime_ns, digest, payload)
+
+    def prune(self, directory: Path, keep_paths: list[Path]) -> None:
+        """删除 directory 下已不存在于本次扫描列表中的记录。"""
+        if self._conn is None:
+            return
+        prefix = normalize_path_key(directory).rstrip(os.sep) + os.sep
+        keep = {normalize_path_key(p) for p in keep_paths}
+        with self._lock:
+            try:
+                stale = [
+                    (p,) for (p,) in self._conn.execute(
+                        "SELECT path FROM jars WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                    )
+                    if p not in keep
+                ]
+                if stale:
+                    self._conn.executemany("DELETE FROM jars WHERE path = ?", stale)
+                    self._conn.commit()
+                    logging.debug("已清理 %d 条过期语言扫描缓存", len(stale))
+            except sqlite3.Error as e:
+                logging.debug("清理语言扫描缓存失败: %s", e)
+
+    def prune_missing(self) -> None:
+        """删除文件已不存在的记录；用于汉化包这类不在同一目录下、无法按目录清理的缓存。"""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                stale = [(p,) for (p,) in self._conn.execute("SELECT path FROM jars") if not os.path.isfile(p)]
+                if stale:
+                    self._conn.executemany("DELETE FROM jars WHERE path = ?", stale)
+                    self._conn.commit()
+                    logging.debug("已清理 %d 条过期扫描缓存: %s", len(stale), cache_path(self.filename))
+            except sqlite3.Error as e:
+                logging.debug("清理扫描缓存失败: %s", e)
+
+    def save_if_dirty(self) -> None:
+        with self._lock:
+            if not self._pending or self._conn is None:
+                self._pending.clear()
+                return
+            rows = [(p, size, mtime_ns, digest, payload) for p, (size, mtime_ns, digest, payload) in self._pending.items()]
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO jars (path, size, mtime_ns, digest, payload) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+                logging.debug("已写入语言扫描缓存: %s (%d 条)", cache_path(self.filename), len(rows))
+            except sqlite3.Error as e:
+                logging.warning("写入语言扫描缓存失败: %s — %s", cache_path(self.filename), e)
+            self._pending.clear()
+
+    def close(self) -> None:
+        self.save_if_dirty()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,173 @@
+"""
+持久化缓存：CurseForge / Modrinth 按指纹查询到的模组元数据。
+
+每行以 (来源, 哈希) 为主键：
+- 正向结果：保存客户端返回的元数据（name、slug、url、game_version、loaders 等）；
+- 负向结果：本次已查询但平台未收录的哈希，载荷为 NULL，避免每次扫描都重新询问。
+两者各有独立的有效期（小时，见配置 mod_metadata_cache_ttl_hours /
+mod_metadata_negative_ttl_hours），过期条目在加载时清理。请求失败不会写入负向结果。
+
+存储为 SQLite（mod_metadata_cache.db）。
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from utils import config_manager
+
+CACHE_FILENAME = "mod_metadata_cache.db"
+CACHE_SCHEMA_VERSION = 1
+
+PROVIDER_CURSEFORGE = "curseforge"
+PROVIDER_MODRINTH = "modrinth"
+
+_QUERY_CHUNK_SIZE = 500  # 单条 IN 查询的参数个数，低于 SQLite 旧版本的 999 上限
+
+
+def cache_path() -> Path:
+    return config_manager.APP_DATA_PATH / CACHE_FILENAME
+
+
+class ModMetadataCache:
+    """线程安全：读写均在锁内完成，写入先缓冲在内存中，由 save_if_dirty 一次性提交。"""
+
+    def __init__(self, ttl_seconds: float, negative_ttl_seconds: float, path: Path | None = None):
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.negative_ttl_seconds = max(0.0, float(negative_ttl_seconds))
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], tuple[str | None, float]] = {}
+        self.hits = 0
+        self.negative_hits = 0
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> ModMetadataCache:
+        if config is None:
+            config = config_manager.load_config()
+        return cls(
+            ttl_seconds=float(config.get("mod_metadata_cache_ttl_hours", 168)) * 3600,
+            negative_ttl_seconds=float(config.get("mod_metadata_negative_ttl_hours", 24)) * 3600,
+        )
+
+    @property
+    def path(self) -> Path:
+        return self._path or cache_path()
+
+    def load(self) -> None:
+        path = self.path
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_SCHEMA_VERSION:
+                if version:
+                    logging.info("模组元数据缓存版本已变化 (%s -> %s)，将重新建立", version, CACHE_SCHEMA_VERSION)
+                conn.execute("DROP TABLE IF EXISTS metadata")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                " provider TEXT NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " payload TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (provider, hash))"
+            )
+            conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+            now = time.time()
+            pruned = conn.execute(
+                "DELETE FROM metadata WHERE (payload IS NOT NULL AND fetched_at < ?)"
+                " OR (payload IS NULL AND fetched_at < ?)",
+                (now - self.ttl_seconds, now - self.negative_ttl_seconds),
+            ).rowcount
+            conn.commit()
+            if pruned:
+                logging.debug("已清理 %d 条过期模组元数据缓存", pruned)
+            self._conn = conn
+        except sqlite3.Error as e:
+            logging.warning("打开模组元数据缓存失败，本次将不使用缓存: %s — %s", path, e)
+            self._conn = None
+
+    def _is_fresh(self, payload: str | None, fetched_at: float, now: float) -> bool:
+        ttl = self.ttl_seconds if payload is not None else self.negative_ttl_seconds
+        return now - fetched_at < ttl
+
+    def lookup(self, provider: str, hashes: list[str]) -> tuple[dict[str, dict], set[str]]:
+        """返回 (未过期的元数据, 未过期的「平台无此文件」哈希集合)；其余哈希需要联网查询。"""
+        found: dict[str, dict] = {}
+        negative: set[str] = set()
+        if self._conn is None or not hashes:
+            return found, negative
+        unique = list(dict.fromkeys(hashes))
+        now = time.time()
+        with self._lock:
+            rows: list[tuple[str, str | None, float]] = []
+            try:
+                for start in range(0, len(unique), _QUERY_CHUNK_SIZE):
+                    chunk = unique[start:start + _QUERY_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(self._conn.execute(
+                        f"SELECT hash, payload, fetched_at FROM metadata WHERE provider = ? AND hash IN ({placeholders})",
+                        (provider, *chunk),
+                    ))
+            except sqlite3.Error as e:
+                logging.debug("查询模组元数据缓存失败: %s", e)
+                return found, negative
+            for key in unique:
+                pending = self._pending.get((provider, key))
+                if pending is not None:
+                    rows.append((key, *pending))
+            for key, payload, fetched_at in rows:
+                if not self._is_fresh(payload, fetched_at, now):
+                    continue
+                if payload is None:
+                    negative.add(key)
+                    found.pop(key, None)
+                    continue
+                try:
+                    found[key] = json.loads(payload)
+                    negative.discard(key)
+                except ValueError:
+                    logging.debug("模组元数据缓存条目损坏，忽略: %s/%s", provider, key)
+            self.hits += len(found)
+            self.negative_hits += len(negative)
+        return found, negative
+
+    def store(self, provider: str, queried_hashes: list[str], results: dict[str, dict]) -> None:
+        """记录一次成功查询：results 中的哈希写入元数据，其余已查询哈希记为负向结果。"""
+        now = time.time()
+        with self._lock:
+            for key in queried_hashes:
+                info = results.get(key)
+                payload = json.dumps(info, ensure_ascii=False) if info is not None else None
+                self._pending[(provider, key)] = (payload, now)
+
+    def save_if_dirty(self) -> None:
+        with self._lock:
+            if not self._pending or self._conn is None:
+                self._pending.clear()
+                return
+            rows = [
+                (provider, key, payload, fetched_at)
+                for (provider, key), (payload, fetched_at) in self._pending.items()
+            ]
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO metadata (provider, hash, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+                logging.debug("已写入模组元数据缓存: %s (%d 条)", self.path, len(rows))
+            except sqlite3.Error as e:
+                logging.warning("写入模组元数据缓存失败: %s — %s", self.path, e)
+            self._pending.clear()
+
+    def close(self) -> None:
+        self.save_if_dirty()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,7 +3,9 @@
 
 对象键即 Modrinth 整包 SHA1，条目中不再重复写入 modrinth_hash。
 
-读盘后仍需算 SHA1 才能查表；命中时可跳过 Murmur 与 ZIP 元数据解析。
+另有 stat 索引（mod_fingerprint_stat_index.json）：「绝对路径 → [大小, mtime_ns, SHA1]」。
+stat 完全一致时直接取回 SHA1 与 curseforge_hash，无需读取 JAR 内容；
+不一致时仍需算 SHA1 查主表，命中可跳过 Murmur 与 ZIP 元数据解析。
 
 与仅内存的 Extractor._mod_info_cache、会话 tab 缓存等无关。
 """
@@ -16,14 +18,20 @@ from pathlib import Path
 from typing import Any
 
 from utils import config_manager
+from utils.file_utils import normalize_path_key
 
 CACHE_FILENAME = "mod_fingerprint_cache.json"
+STAT_INDEX_FILENAME = "mod_fingerprint_stat_index.json"
 
 
 def cache_path() -> Path:
     return config_manager.APP_DATA_PATH / CACHE_FILENAME
 
 
+def stat_index_path() -> Path:
+    return config_manager.APP_DATA_PATH / STAT_INDEX_FILENAME
+
+
 def cache_key_sha1(modrinth_sha1_hex: str) -> str:
     """缓存主键：40 位小写十六进制 SHA1（与 hashlib.sha1(...).hexdigest() 一致）。"""
     return modrinth_sha1_hex.lower()
@@ -46,10 +54,30 @@ def _disk_value_needs_compact(v: Any) -> bool:
     return set(v.keys()) != {"curseforge_hash"}
 
 
+def _write_json_atomic(path: Path, data: Any) -> bool:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=0)
+            f.write("\n")
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        logging.warning("写入模组指纹缓存失败: %s — %s", path, e)
+        try:
+            if tmp.is_file():
+                tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
 class ModFingerprintDiskCache:
     def __init__(self):
         self._entries: dict[str, dict[str, str]] = {}
+        self._stat_index: dict[str, list] = {}
         self._dirty = False
+        self._stat_dirty = False
 
     def load(self) -> None:
         path = cache_path()
@@ -92,6 +120,55 @@ class ModFingerprintDiskCache:
         except Exception as e:
             logging.warning("读取模组指纹缓存失败，将重新建立: %s — %s", path, e)
             self._entries = {}
+        self._load_stat_index()
+
+    def _load_stat_index(self) -> None:
+        path = stat_index_path()
+        self._stat_index = {}
+        if not path.is_file():
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError("root must be object")
+            for p, v in data.items():
+                if (
+                    isinstance(v, list) and len(v) == 3
+                    and isinstance(v[0], int) and isinstance(v[1], int)
+                    and isinstance(v[2], str) and cache_key_sha1(v[2]) in self._entries
+                ):
+                    self._stat_index[p] = v
+                else:
+                    self._stat_dirty = True
+        except Exception as e:
+            logging.warning("读取模组指纹 stat 索引失败，将重新建立: %s — %s", path, e)
+            self._stat_index = {}
+
+    def get_by_stat(self, jar_path: Path, st: os.stat_result) -> dict[str, str] | None:
+        """(路径, 大小, mtime_ns) 与记录一致时返回缓存条目，无需读取 JAR。"""
+        rec = self._stat_index.get(normalize_path_key(jar_path))
+        if not rec or rec[0] != st.st_size or rec[1] != st.st_mtime_ns:
+            return None
+        return self.get(rec[2])
+
+    def put_stat(self, jar_path: Path, st: os.stat_result, sha1: str) -> None:
+        key = normalize_path_key(jar_path)
+        value = [st.st_size, st.st_mtime_ns, cache_key_sha1(sha1)]
+        if self._stat_index.get(key) != value:
+            self._stat_index[key] = value
+            self._stat_dirty = True
+
+    def prune(self, directory: Path, keep_paths: list[Path]) -> None:
+        """删除 stat 索引中 directory 下已不存在于本次扫描列表中的记录（主表按 SHA1 保留）。"""
+        prefix = normalize_path_key(directory).rstrip(os.sep) + os.sep
+        keep = {normalize_path_key(p) for p in keep_paths}
+        stale = [p for p in self._stat_index if p.startswith(prefix) and p not in keep]
+        for p in stale:
+            del self._stat_index[p]
+        if stale:
+            self._stat_dirty = True
+            logging.debug("已清理 %d 条过期模组指纹 stat 索引", len(stale))
 
     def get(self, key: str) -> dict[str, str] | None:
         key_norm = cache_key_sha1(key)
@@ -114,21 +191,13 @@ class ModFingerprintDiskCache:
         self._dirty = True
 
     def save_if_dirty(self) -> None:
-        if not self._dirty:
-            return
-        path = cache_path()
-        tmp = path.with_suffix(path.suffix + ".tmp")
-        try:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(self._entries, f, ensure_ascii=False, indent=0)
-                f.write("\n")
-            os.replace(tmp, path)
-            self._dirty = False
-            logging.debug("已写入模组指纹缓存: %s (%d 条)", path, len(self._entries))
-        except Exception as e:
-            logging.warning("写入模组指纹缓存失败: %s — %s", path, e)
-            try:
-                if tmp.is_file():
-                    tmp.unlink()
-            except OSError:
-                pass
+        if self._dirty:
+            path = cache_path()
+            if _write_json_atomic(path, self._entries):
+                self._dirty = False
+                logging.debug("已写入模组指纹缓存: %s (%d 条)", path, len(self._entries))
+        if self._stat_dirty:
+            path = stat_index_path()
+            if _write_json_atomic(path, self._stat_index):
+                self._stat_dirty = False
+                logging.debug("已写入模组指纹 stat 索引: %s (%d 条)", path, len(self._stat_index))
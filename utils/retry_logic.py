@@ -71,7 +71,7 @@ def api_retry(max_retries=3, initial_delay=1.0, max_delay=30.0, backoff_factor=2
 
                 except requests.exceptions.HTTPError as e:
                     last_exception = e
-                    status_code = e.response.status_code if hasattr(e, 'response') and e.response else None
+                    status_code = e.response.status_code if getattr(e, 'response', None) is not None else None
 
                     if status_code == 429:
                         delay = _handle_retryable_exception(
@@ -138,7 +138,7 @@ def async_api_retry(max_retries=3, initial_delay=1.0, max_delay=30.0, backoff_fa
 
                 except requests.exceptions.HTTPError as e:
                     last_exception = e
-                    status_code = e.response.status_code if hasattr(e, 'response') and e.response else None
+                    status_code = e.response.status_code if getattr(e, 'response', None) is not None else None
 
                     if status_code == 429:
                         delay = _handle_retryable_exception(
@@ -1,6 +1,5 @@
 # 工具模块/更新检查器
 
-import requests
 import logging
 import os
 import time
@@ -9,6 +8,7 @@ from packaging.version import parse as parse_version
 
 STABLE_PROXY_URL = "https://lucky-moth-20.deno.dev/"
 from utils.api_urls import LATEST_RELEASE_API_URL
+from utils.http_client import http_client
 
 def _format_speed(speed_bps: float) -> str:
     if speed_bps > 1024 * 1024:
@@ -21,7 +21,7 @@ def check_for_updates(current_version_str: str) -> dict | None:
     logging.info(f"正在直接请求GitHub API: {LATEST_RELEASE_API_URL}")
     
     try:
-        response = requests.get(LATEST_RELEASE_API_URL, timeout=15)
+        response = http_client.get(LATEST_RELEASE_API_URL, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -60,7 +60,7 @@ def download_update(url: str, save_path: Path, progress_callback=None) -> bool:
     logging.info(f"开始下载文件... URL: {url}")
     
     try:
-        with requests.get(url, stream=True, timeout=180) as r:
+        with http_client.get(url, stream=True, timeout=180) as r:
             r.raise_for_status()
             total_size = int(r.headers.get('content-length', 0))
             bytes_downloaded = 0
@@ -0,0 +1,188 @@
+"""
+个人词典存储：进程内共用一个长连接（WAL 模式）的 Dict-User.db。
+
+写入以「变更批次」为单位：一批内的新增/修改与删除各用一次 executemany 在同一事务中提交，
+添加一个词条只是一次按主键的写入，不再读取并比对整个词典。
+每次提交后保存计数加一，并把本批变更通知给已订阅的回调（在提交线程中同步调用，
+回调内不要做耗时操作；需要更新界面时自行转交主线程）。
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+from utils import config_manager
+
+# 表名 → 主键列名；变更批次与 load_all 的结果都以表名为键
+TABLES = {"by_key": "key", "by_origin_name": "origin_name"}
+
+
+@dataclass(frozen=True)
+class UserDictChange:
+    """一次已提交的变更批次；upserts 为 表名 → {名称: 译文}，deletes 为 表名 → 名称元组。"""
+    generation: int
+    upserts: dict[str, dict[str, str]] = field(default_factory=dict)
+    deletes: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+
+class UserDictStore:
+
+    _instance: UserDictStore | None = None
+    _creation_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._creation_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialize()
+        return cls._instance
+
+    def _initialize(self):
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._path: Path | None = None
+        self._generation = 0
+        self._listeners: list[Callable[[UserDictChange], None]] = []
+        self._listeners_lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """保存计数：每提交一个非空批次加一。"""
+        return self._generation
+
+    def _connection(self) -> sqlite3.Connection:
+        # 调用方需持有 self._lock；数据目录被切换时重新连接
+        path = config_manager.USER_DICT_PATH
+        if self._conn is not None and self._path == path:
+            return self._conn
+        self._close_connection()
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            for table, column in TABLES.items():
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column} TEXT PRIMARY KEY, translation TEXT NOT NULL)")
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn, self._path = conn, path
+        return conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logging.debug(f"关闭个人词典连接失败: {e}")
+            self._conn = None
+            self._path = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_connection()
+
+    def load_all(self) -> dict[str, dict[str, str]]:
+        """读取整个个人词典：{'by_key': {...}, 'by_origin_name': {...}}。"""
+        with self._lock:
+            conn = self._connection()
+            return {
+                table: dict(conn.execute(f"SELECT {column}, translation FROM {table}"))
+                for table, column in TABLES.items()
+            }
+
+    def get(self, table: str, name: str) -> str | None:
+        column = self._column(table)
+        with self._lock:
+            row = self._connection().execute(f"SELECT translation FROM {table} WHERE {column} = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _column(table: str) -> str:
+        try:
+            return TABLES[table]
+        except KeyError:
+            raise ValueError(f"未知的个人词典表: {table}") from None
+
+    def apply_changes(
+        self,
+        upserts: Mapping[str, Mapping[str, str]] | None = None,
+        deletes: Mapping[str, Iterable[str]] | None = None,
+    ) -> UserDictChange | None:
+        """
+        在一个事务中提交一批变更并通知订阅者，返回已提交的批次；批次为空时不写入，返回 None。
+
+        同一名称同时出现在删除与新增中时，以新增为准（先删后写）。
+        """
+        batch_upserts = {table: dict(items) for table, items in (upserts or {}).items() if items}
+        batch_deletes = {table: tuple(names) for table, names in (deletes or {}).items() if names}
+        for table in (*batch_upserts, *batch_deletes):
+            self._column(table)
+        if not batch_upserts and not batch_deletes:
+            return None
+
+        with self._lock:
+            change = self._commit(batch_upserts, batch_deletes)
+        self._notify(change)
+        return change
+
+    def _commit(self, upserts: dict[str, dict[str, str]], deletes: dict[str, tuple[str, ...]]) -> UserDictChange:
+        # 调用方需持有 self._lock
+        conn = self._connection()
+        with conn:
+            for table, names in deletes.items():
+                conn.executemany(f"DELETE FROM {table} WHERE {TABLES[table]} = ?", ((name,) for name in names))
+            for table, items in upserts.items():
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({TABLES[table]}, translation) VALUES (?, ?)",
+                    items.items(),
+                )
+        self._generation += 1
+        return UserDictChange(self._generation, upserts, deletes)
+
+    def replace_all(self, dict_data: Mapping[str, Mapping[str, str]]) -> UserDictChange | None:
+        """以 dict_data 整体替换个人词典：比对现有内容后只提交差异部分。"""
+        with self._lock:
+            current = self.load_all()
+            upserts, deletes = {}, {}
+            for table in TABLES:
+                new_items = dict_data.get(table, {})
+                old_items = current[table]
+                changed = {name: trans for name, trans in new_items.items() if old_items.get(name) != trans}
+                removed = tuple(name for name in old_items if name not in new_items)
+                if changed:
+                    upserts[table] = changed
+                if removed:
+                    deletes[table] = removed
+            if not upserts and not deletes:
+                return None
+            change = self._commit(upserts, deletes)
+        self._notify(change)
+        return change
+
+    def subscribe(self, callback: Callable[[UserDictChange], None]) -> None:
+        with self._listeners_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[UserDictChange], None]) -> None:
+        with self._listeners_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self, change: UserDictChange) -> None:
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(change)
+            except Exception as e:
+                logging.warning(f"个人词典变更通知处理失败: {e}")
+
+
+user_dict_store = UserDictStore()